@@ -1,22 +1,29 @@
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.decorators import api_view, permission_classes, authentication_classes, throttle_classes
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from django.contrib.auth.hashers import check_password
 from rest_framework_simplejwt.tokens import RefreshToken
 from .models import Account
+from .hashing import check_password
+from .throttling import LoginIPThrottle, LoginEmailThrottle
+from .principals import get_principal
+from .revocation import revocation_list
 import jwt
+import uuid
 from datetime import datetime, timedelta, timezone
 from django.conf import settings
 
 
-def generate_jwt_tokens_for_account(account):
+ACCESS_TOKEN_LIFETIME = timedelta(hours=1)
+REFRESH_TOKEN_LIFETIME = timedelta(days=7)
+
+
+def generate_access_token_for_account(account, now=None):
     """
-    Générer de vrais tokens JWT pour un compte Account
-    Compatible avec le format Bearer Token standard
+    Générer un token d'accès JWT pour un compte Account
     """
     # Utiliser timezone.utc au lieu de utcnow() (deprecated)
-    now = datetime.now(timezone.utc)
+    now = now or datetime.now(timezone.utc)
 
     # Créer le payload pour le token
     access_payload = {
@@ -26,29 +33,41 @@ def generate_jwt_tokens_for_account(account):
         'last_name': account.last_name,
         'role': account.role,
         'type': 'access',
-        'exp': now + timedelta(hours=1),  # Expire dans 1 heure
+        'jti': uuid.uuid4().hex,  # Identifiant unique (révocation)
+        'exp': now + ACCESS_TOKEN_LIFETIME,  # Expire dans 1 heure
         'iat': now
     }
 
+    return jwt.encode(access_payload, settings.SECRET_KEY, algorithm='HS256')
+
+
+def generate_jwt_tokens_for_account(account):
+    """
+    Générer de vrais tokens JWT pour un compte Account
+    Compatible avec le format Bearer Token standard
+    """
+    # Utiliser timezone.utc au lieu de utcnow() (deprecated)
+    now = datetime.now(timezone.utc)
+
     refresh_payload = {
         'account_id': account.id,
         'email': account.email,
         'role': account.role,
         'type': 'refresh',
-        'exp': now + timedelta(days=7),  # Expire dans 7 jours
+        'jti': uuid.uuid4().hex,
+        'exp': now + REFRESH_TOKEN_LIFETIME,  # Expire dans 7 jours
         'iat': now
     }
 
     # Générer les tokens JWT
-    secret_key = settings.SECRET_KEY
-    access_token = jwt.encode(access_payload, secret_key, algorithm='HS256')
-    refresh_token = jwt.encode(refresh_payload, secret_key, algorithm='HS256')
+    access_token = generate_access_token_for_account(account, now)
+    refresh_token = jwt.encode(refresh_payload, settings.SECRET_KEY, algorithm='HS256')
 
     return {
         'access': access_token,
         'refresh': refresh_token,
         'token_type': 'Bearer',
-        'expires_in': 3600,  # 1 heure en secondes
+        'expires_in': int(ACCESS_TOKEN_LIFETIME.total_seconds()),  # 1 heure en secondes
         'account': {
             'id': account.id,
             'email': account.email,
@@ -61,6 +80,7 @@ def generate_jwt_tokens_for_account(account):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([LoginIPThrottle, LoginEmailThrottle])
 def login_with_email(request):
     """
     Endpoint pour se connecter avec email et mot de passe
@@ -95,7 +115,7 @@ def login_with_email(request):
 
     # Chercher le compte
     try:
-        account = Account.objects.get(email=email, is_active=True)
+        account = Account.objects.filter_by_email(email).get(is_active=True)
     except Account.DoesNotExist:
         return Response({
             'error': 'Email ou mot de passe incorrect'
@@ -111,3 +131,113 @@ def login_with_email(request):
     tokens = generate_jwt_tokens_for_account(account)
 
     return Response(tokens, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def refresh_access_token(request):
+    """
+    Endpoint pour obtenir un nouveau token d'accès à partir du token de
+    rafraîchissement, sans repasser par la vérification du mot de passe
+
+    POST /api/accounts/refresh/
+    Body:
+    {
+        "refresh": "token..."
+    }
+
+    Réponse:
+    {
+        "access": "token...",
+        "token_type": "Bearer",
+        "expires_in": 3600
+    }
+    """
+    refresh_token = request.data.get('refresh')
+
+    if not refresh_token:
+        return Response({
+            'error': 'Token de rafraîchissement requis'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    # Vérifier le token de rafraîchissement
+    try:
+        payload = jwt.decode(refresh_token, settings.SECRET_KEY, algorithms=['HS256'])
+    except jwt.ExpiredSignatureError:
+        return Response({
+            'error': 'Token de rafraîchissement expiré'
+        }, status=status.HTTP_401_UNAUTHORIZED)
+    except jwt.InvalidTokenError:
+        return Response({
+            'error': 'Token de rafraîchissement invalide'
+        }, status=status.HTTP_401_UNAUTHORIZED)
+
+    if payload.get('type') != 'refresh' or not payload.get('account_id'):
+        return Response({
+            'error': 'Token de rafraîchissement invalide'
+        }, status=status.HTTP_401_UNAUTHORIZED)
+
+    if revocation_list.is_revoked(payload.get('jti')):
+        return Response({
+            'error': 'Token de rafraîchissement révoqué'
+        }, status=status.HTTP_401_UNAUTHORIZED)
+
+    # Vérifier que le compte est toujours actif
+    account = get_principal(payload['account_id'])
+    if account is None:
+        return Response({
+            'error': 'Compte introuvable ou inactif'
+        }, status=status.HTTP_401_UNAUTHORIZED)
+
+    return Response({
+        'access': generate_access_token_for_account(account),
+        'token_type': 'Bearer',
+        'expires_in': int(ACCESS_TOKEN_LIFETIME.total_seconds()),
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def logout(request):
+    """
+    Endpoint pour se déconnecter: révoque le token d'accès utilisé et, s'il
+    est fourni, le token de rafraîchissement
+
+    POST /api/accounts/logout/
+    Header: Authorization: Bearer <access>
+    Body (optionnel):
+    {
+        "refresh": "token..."
+    }
+    """
+    # Payload déjà vérifié par l'authentification (JWTAuthentication)
+    access_payload = getattr(request, 'auth_payload', None)
+    if access_payload is None:
+        return Response({
+            'error': 'Token invalide'
+        }, status=status.HTTP_401_UNAUTHORIZED)
+
+    refresh_payload = None
+    refresh_token = request.data.get('refresh')
+    if refresh_token:
+        try:
+            refresh_payload = jwt.decode(refresh_token, settings.SECRET_KEY, algorithms=['HS256'])
+        except jwt.InvalidTokenError:
+            return Response({
+                'error': 'Token de rafraîchissement invalide'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # Seul un token de rafraîchissement du compte connecté est accepté
+        if refresh_payload.get('type') != 'refresh' or refresh_payload.get('account_id') != request.user.id:
+            return Response({
+                'error': 'Token de rafraîchissement invalide'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+    revocation_list.revoke(access_payload, account=request.user)
+    if refresh_payload is not None:
+        revocation_list.revoke(refresh_payload, account=request.user)
+
+    return Response({
+        'message': 'Déconnexion réussie'
+    }, status=status.HTTP_200_OK)
@@ -0,0 +1,26 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.views import exception_handler as drf_exception_handler
+from .hashing import HashingUnavailable
+
+
+class ServiceOverloaded(APIException):
+    """Réponse HTTP d'un pool de hachage saturé"""
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Service momentanément surchargé, veuillez réessayer."
+    default_code = 'hashing_unavailable'
+
+    def __init__(self, wait, detail=None):
+        super().__init__(detail)
+        # Utilisé par le gestionnaire d'exceptions DRF pour le header Retry-After
+        self.wait = wait
+
+
+def exception_handler(exc, context):
+    """
+    Gestionnaire d'exceptions DRF: HashingUnavailable (exception du domaine,
+    levée aussi hors HTTP) devient une 503 avec Retry-After
+    """
+    if isinstance(exc, HashingUnavailable):
+        exc = ServiceOverloaded(wait=exc.wait)
+    return drf_exception_handler(exc, context)
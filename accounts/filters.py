@@ -0,0 +1,40 @@
+from django_filters import rest_framework as filters
+from .models import Account
+
+
+# Champs de la recherche approximative des comptes (?fuzzy=)
+FUZZY_GROUPS = (('first_name', 'last_name'),)
+
+
+class AccountFilter(filters.FilterSet):
+    """
+    Filtres pour les comptes
+    """
+    # Filtre par rôle
+    role = filters.ChoiceFilter(field_name='role', choices=Account.ROLE_CHOICES)
+
+    # Filtre par statut (actif / désactivé)
+    is_active = filters.BooleanFilter(field_name='is_active')
+
+    # Filtre par email (insensible à la casse)
+    email = filters.CharFilter(field_name='email', lookup_expr='icontains')
+
+    # Filtre par date de création
+    created_after = filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='gte')
+    created_before = filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='lt')
+
+    # Comptes ne s'étant jamais connectés, ou pas depuis une date donnée
+    never_logged_in = filters.BooleanFilter(field_name='last_login', lookup_expr='isnull')
+    last_login_before = filters.IsoDateTimeFilter(field_name='last_login', lookup_expr='lt')
+
+    class Meta:
+        model = Account
+        fields = [
+            'role',
+            'is_active',
+            'email',
+            'created_after',
+            'created_before',
+            'never_logged_in',
+            'last_login_before',
+        ]
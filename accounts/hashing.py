@@ -0,0 +1,174 @@
+"""
+Pool borné pour le hachage et la vérification des mots de passe
+
+PBKDF2 est volontairement coûteux: lors d'un pic de connexions, les hachages
+exécutés directement sur les workers occupent tout le serveur. Ici, ils
+passent par un pool de threads à concurrence limitée. Au-delà de la file
+d'attente autorisée, ou si la tâche attend trop longtemps, l'appel lève
+HashingUnavailable au lieu de bloquer le worker; l'API la convertit en 503
+(header Retry-After, voir accounts.exceptions).
+
+La limite s'applique par processus: elle est effective avec des workers
+multi-threads (gunicorn --threads).
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from collections import deque
+from django.conf import settings
+from django.contrib.auth import hashers
+import os
+import threading
+import time
+
+
+class HashingUnavailable(Exception):
+    """
+    Le pool de hachage est saturé
+
+    Exception du domaine (commandes, admin, shell): seules les vues la
+    convertissent en 503.
+    """
+
+    def __init__(self, wait):
+        super().__init__(f"Pool de hachage saturé, réessayer dans {wait} s")
+        # Délai conseillé avant une nouvelle tentative (header Retry-After)
+        self.wait = wait
+
+
+def _percentile(values, q):
+    """Percentile (0-100) d'une liste de valeurs, None si vide"""
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))
+    return values[index]
+
+
+class PasswordHasherPool:
+    """
+    Exécuteur borné: au plus `max_workers` hachages simultanés et
+    `max_queue` tâches en attente, chacune attendant au plus `queue_timeout`
+    secondes avant de démarrer.
+    """
+
+    def __init__(self, max_workers, max_queue, queue_timeout):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='password-hasher')
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self._wait_times = deque(maxlen=1024)
+        self._hash_times = deque(maxlen=1024)
+
+    def run(self, func, *args, **kwargs):
+        """Exécuter func dans le pool et retourner son résultat"""
+        # Compté dès l'attente d'une place: la profondeur de file inclut les
+        # appelants bloqués sur le sémaphore
+        with self._lock:
+            self._queued += 1
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self._queued -= 1
+                self.rejected += 1
+            raise HashingUnavailable(wait=self.queue_timeout)
+
+        try:
+            future = self._executor.submit(self._execute, time.monotonic(), func, args, kwargs)
+            return future.result()
+        finally:
+            self._slots.release()
+
+    def _execute(self, enqueued_at, func, args, kwargs):
+        started_at = time.monotonic()
+        waited = started_at - enqueued_at
+        with self._lock:
+            self._queued -= 1
+            if waited > self.queue_timeout:
+                self.timeouts += 1
+                raise HashingUnavailable(wait=self.queue_timeout)
+            self._running += 1
+            self._wait_times.append(waited)
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.monotonic() - started_at
+            with self._lock:
+                self._running -= 1
+                self.completed += 1
+                self._hash_times.append(elapsed)
+
+    def stats(self):
+        """Métriques: profondeur de file, latences (en millisecondes)"""
+        with self._lock:
+            wait_times = list(self._wait_times)
+            hash_times = list(self._hash_times)
+            stats = {
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'queue_timeout': self.queue_timeout,
+                'queue_depth': self._queued,
+                'running': self._running,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'timeouts': self.timeouts,
+            }
+
+        for name, values in (('wait_ms', wait_times), ('hash_ms', hash_times)):
+            stats[name] = {
+                'p50': _percentile([v * 1000 for v in values], 50),
+                'p99': _percentile([v * 1000 for v in values], 99),
+            }
+        return stats
+
+
+hasher_pool = PasswordHasherPool(
+    max_workers=getattr(settings, 'PASSWORD_HASHING_MAX_WORKERS', os.cpu_count() or 1),
+    max_queue=getattr(settings, 'PASSWORD_HASHING_MAX_QUEUE', 32),
+    queue_timeout=getattr(settings, 'PASSWORD_HASHING_QUEUE_TIMEOUT', 5),
+)
+
+
+def check_password(password, encoded, setter=None):
+    """Équivalent de django.contrib.auth.hashers.check_password via le pool"""
+    return hasher_pool.run(hashers.check_password, password, encoded, setter)
+
+
+def make_password(password):
+    """Équivalent de django.contrib.auth.hashers.make_password via le pool"""
+    return hasher_pool.run(hashers.make_password, password)
+
+
+def _init_hashing_process():
+    """Configurer Django dans un processus du pool (démarrage par spawn)"""
+    import django
+    django.setup()
+
+
+def hashing_process_pool(processes=None):
+    """
+    Pool de processus pour hasher des lots de mots de passe en parallèle,
+    None si un seul processus est configuré
+
+    Utilisé par la commande import_accounts, jamais dans une requête HTTP
+    (voir AccountImporter.in_process).
+    """
+    if processes is None:
+        processes = getattr(settings, 'ACCOUNT_IMPORT_PROCESSES', os.cpu_count() or 1)
+    if processes <= 1:
+        return None
+    return ProcessPoolExecutor(max_workers=processes, initializer=_init_hashing_process)
+
+
+def make_passwords(passwords, executor=None, chunksize=8):
+    """Hasher une liste de mots de passe, en parallèle si un pool est fourni"""
+    passwords = list(passwords)
+    if executor is None or len(passwords) <= 1:
+        return [hashers.make_password(password) for password in passwords]
+    return list(executor.map(hashers.make_password, passwords, chunksize=chunksize))
@@ -0,0 +1,179 @@
+"""
+Import en masse de comptes depuis un flux CSV ou NDJSON
+
+Le fichier est lu ligne par ligne et traité par lots: une seule requête
+`LOWER(email) IN (...)` vérifie les doublons d'un lot, les mots de passe sont hachés
+en parallèle sur un pool de processus et les comptes sont insérés avec
+`bulk_create`. Le rapport indique, ligne par ligne, les comptes refusés.
+
+Chaque lot est validé dès qu'il est inséré: un fichier illisible (encodage,
+CSV mal formé) ou un pool de hachage saturé arrête l'import, mais le rapport
+des lots déjà traités est toujours retourné (clé `aborted`).
+
+Le pool de processus est réservé à la commande import_accounts: un import
+lancé depuis une requête HTTP (in_process=True) hache sur le pool partagé
+du processus web (hashing.hasher_pool), borné et partagé avec les connexions.
+"""
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+import csv
+import json
+from .hashing import HashingUnavailable, hashing_process_pool, make_password, make_passwords
+from .models import Account
+from .serializers import AccountImportSerializer, EMAIL_TAKEN_MESSAGE
+
+
+FORMATS = ('csv', 'ndjson')
+
+HASHING_UNAVAILABLE_MESSAGE = "Service de hachage saturé, ligne non importée."
+
+
+def iter_rows(stream, file_format):
+    """
+    Itérer sur (numéro de ligne, données) d'un flux texte CSV ou NDJSON
+    """
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            # Cellules vides: valeur par défaut du champ (ou champ manquant)
+            yield reader.line_num, {
+                key: value for key, value in row.items()
+                if key is not None and value not in ('', None)
+            }
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_number, row if isinstance(row, dict) else {'__invalid__': line}
+
+
+class AccountImporter:
+    """
+    Import en masse de comptes, par lots de `chunk_size` lignes
+
+    in_process: hacher sur le pool partagé du processus (hasher_pool) plutôt
+    que sur un pool de processus dédié (imports depuis une requête HTTP)
+    """
+
+    def __init__(self, chunk_size=None, processes=None, allowed_roles=None, in_process=False):
+        self.chunk_size = chunk_size or getattr(settings, 'ACCOUNT_IMPORT_CHUNK_SIZE', 500)
+        self.processes = processes
+        self.in_process = in_process
+        self.allowed_roles = allowed_roles
+        self.seen_emails = set()
+        self.executor = None
+        self.report = {'total': 0, 'created': 0, 'failed': 0, 'errors': [], 'aborted': None}
+
+    def run(self, rows):
+        """Importer les lignes et retourner le rapport"""
+        if not self.in_process:
+            self.executor = hashing_process_pool(self.processes)
+        try:
+            for chunk in self.read_chunks(rows):
+                self.import_chunk(chunk)
+                if self.report['aborted']:
+                    break
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.executor = None
+
+        self.report['errors'].sort(key=lambda error: error['line'])
+        return self.report
+
+    def read_chunks(self, rows):
+        """
+        Lots de `chunk_size` lignes; une erreur de lecture arrête l'import
+        après le lot des lignes déjà lues
+        """
+        chunk = []
+        last_line = 0
+        try:
+            for line_number, data in rows:
+                last_line = line_number
+                chunk.append((line_number, data))
+                if len(chunk) >= self.chunk_size:
+                    yield chunk
+                    chunk = []
+        except (UnicodeDecodeError, csv.Error) as exc:
+            self.abort('invalid_file', f"Fichier illisible après la ligne {last_line}: {exc}")
+        if chunk:
+            yield chunk
+
+    def abort(self, reason, detail):
+        self.report['aborted'] = {'reason': reason, 'detail': detail}
+
+    def add_error(self, line_number, email, errors):
+        self.report['failed'] += 1
+        self.report['errors'].append({'line': line_number, 'email': email, 'errors': errors})
+
+    def import_chunk(self, chunk):
+        self.report['total'] += len(chunk)
+
+        # Validation des lignes, sans requête SQL
+        valid = []
+        for line_number, data in chunk:
+            if '__invalid__' in data:
+                self.add_error(line_number, None, {'non_field_errors': ["Ligne JSON invalide."]})
+                continue
+            serializer = AccountImportSerializer(data=data, context={'allowed_roles': self.allowed_roles})
+            if not serializer.is_valid():
+                self.add_error(line_number, data.get('email'), serializer.errors)
+                continue
+            valid.append((line_number, serializer.validated_data))
+
+        # Doublons: dans le fichier, puis en base (une requête pour le lot)
+        existing = set(Account.objects.alias(email_lower=Lower('email')).filter(
+            email_lower__in=[data['email'] for _, data in valid]
+        ).values_list('email', flat=True))
+
+        pending = []
+        for line_number, data in valid:
+            email = data['email']
+            if email in existing or email in self.seen_emails:
+                self.add_error(line_number, email, {'email': [EMAIL_TAKEN_MESSAGE]})
+                continue
+            self.seen_emails.add(email)
+            pending.append((line_number, data))
+
+        if not pending:
+            return
+
+        passwords = [data['password'] for _, data in pending]
+        try:
+            if self.in_process:
+                hashes = [make_password(password) for password in passwords]
+            else:
+                hashes = make_passwords(passwords, self.executor)
+        except HashingUnavailable as exc:
+            # Les lots précédents sont déjà enregistrés: on s'arrête ici
+            for line_number, data in pending:
+                self.add_error(line_number, data['email'], {'non_field_errors': [HASHING_UNAVAILABLE_MESSAGE]})
+            self.abort('hashing_unavailable', str(exc))
+            return
+        accounts = []
+        for (line_number, data), encoded in zip(pending, hashes):
+            fields = {key: value for key, value in data.items() if key != 'password'}
+            accounts.append(Account(password=encoded, **fields))
+
+        try:
+            with transaction.atomic():
+                Account.objects.bulk_create(accounts)
+            self.report['created'] += len(accounts)
+        except IntegrityError:
+            # Compte créé entre la vérification et l'insertion: ligne par ligne
+            for (line_number, data), account in zip(pending, accounts):
+                try:
+                    with transaction.atomic():
+                        account.save()
+                    self.report['created'] += 1
+                except IntegrityError:
+                    self.add_error(line_number, data['email'], {'email': [EMAIL_TAKEN_MESSAGE]})
@@ -4,16 +4,135 @@ Backend d'authentification JWT personnalisé pour les comptes Account
 
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication as SimpleJWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as simplejwt_settings
 from django.conf import settings
+from collections import OrderedDict
+import hashlib
+import threading
+import time
 import jwt
-from .models import Account
+from .principals import get_principal, principal_from_claims
+from .revocation import revocation_list
+
+
+class TokenCache:
+    """
+    Cache LRU borné (par processus) des tokens déjà vérifiés
+
+    Les entrées sont indexées par l'empreinte SHA-256 du token et contiennent
+    le payload vérifié. Une entrée expire à l'`exp` du token. Le compte n'est
+    pas conservé ici: il est résolu par le cache partagé de `principals`,
+    invalidé dès qu'un compte est modifié ou désactivé.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def digest(token):
+        """Empreinte du token utilisée comme clé (le token brut n'est jamais stocké)"""
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token):
+        """Retourner le payload si le token est en cache et non expiré"""
+        key = self.digest(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, token, payload):
+        """Mettre en cache un token vérifié jusqu'à son expiration"""
+        if self.max_entries <= 0:
+            return
+        key = self.digest(token)
+        with self._lock:
+            self._entries[key] = (payload, payload['exp'])
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Vider le cache et remettre les compteurs à zéro"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Compteurs exposés pour dimensionner le cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+            }
+
+
+token_cache = TokenCache(max_entries=getattr(settings, 'JWT_TOKEN_CACHE_SIZE', 1024))
+
+
+class DispatchStats:
+    """
+    Compteurs du chemin suivi par chaque requête authentifiée
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def record(self, path, outcome):
+        with self._lock:
+            counts = self._counts.setdefault(path, {})
+            counts[outcome] = counts.get(outcome, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+
+    def stats(self):
+        with self._lock:
+            return {path: dict(counts) for path, counts in self._counts.items()}
+
+
+dispatch_stats = DispatchStats()
 
 
 class JWTAuthentication(BaseAuthentication):
     """
     Authentification personnalisée pour vérifier les tokens JWT Bearer
+
+    Point d'entrée unique pour les deux formats de tokens:
+    - tokens Account (`type`, `account_id`) émis par /api/accounts/login/
+    - tokens simplejwt (`token_type`, `user_id`) émis par /api/auth/login/
+    Les claims non vérifiés sont lus une seule fois pour choisir le
+    vérificateur: chaque token n'est vérifié qu'une fois.
     """
 
+    ACCOUNT_PATH = 'account'
+    SIMPLEJWT_PATH = 'simplejwt'
+
+    def __init__(self):
+        self.simplejwt = SimpleJWTAuthentication()
+
     def authenticate(self, request):
         """
         Vérifier le token JWT dans le header Authorization
@@ -35,6 +154,94 @@ class JWTAuthentication(BaseAuthentication):
 
         token = parts[1]
 
+        # Token déjà vérifié récemment: pas de nouveau décodage
+        payload = token_cache.get(token)
+        if payload is not None:
+            path, outcome = self.get_token_path(payload), 'cached'
+        else:
+            path, outcome = self.get_token_path(self.read_unverified_claims(token)), 'verified'
+            try:
+                payload = self.verify_token(token, path)
+            except AuthenticationFailed:
+                dispatch_stats.record(path, 'rejected')
+                raise
+            token_cache.set(token, payload)
+
+        request.auth_path = path
+        # Payload vérifié, réutilisé par les vues (ex: logout) sans nouveau décodage
+        request.auth_payload = payload
+
+        # Filtre de Bloom en mémoire: pas de requête SQL si non révoqué
+        if revocation_list.is_revoked(payload.get(self.get_jti_claim(path))):
+            dispatch_stats.record(path, 'revoked')
+            raise AuthenticationFailed('Token révoqué')
+
+        dispatch_stats.record(path, outcome)
+
+        if path == self.SIMPLEJWT_PATH:
+            account = self.get_simplejwt_account(payload)
+        else:
+            account = self.get_account(request, payload)
+
+        # Retourner (user, auth) - user sera l'account dans ce cas
+        return (account, token)
+
+    def get_token_path(self, claims):
+        """
+        Identifier le format du token à partir de ses claims
+        """
+        if 'token_type' in claims and simplejwt_settings.USER_ID_CLAIM in claims:
+            return self.SIMPLEJWT_PATH
+        return self.ACCOUNT_PATH
+
+    def get_jti_claim(self, path):
+        """
+        Nom du claim identifiant le token selon son format
+        """
+        if path == self.SIMPLEJWT_PATH:
+            return simplejwt_settings.JTI_CLAIM
+        return 'jti'
+
+    def read_unverified_claims(self, token):
+        """
+        Lire les claims sans vérifier la signature (aiguillage uniquement)
+        """
+        try:
+            return jwt.decode(token, options={'verify_signature': False})
+        except jwt.InvalidTokenError:
+            dispatch_stats.record('unknown', 'rejected')
+            raise AuthenticationFailed('Token invalide')
+
+    def verify_token(self, token, path):
+        """
+        Vérifier le token avec le seul vérificateur correspondant à son format
+        """
+        if path == self.SIMPLEJWT_PATH:
+            return self.simplejwt.get_validated_token(token).payload
+        return self.decode_access_token(token)
+
+    def get_account(self, request, payload):
+        """
+        Récupérer le compte (cache partagé, sans requête SQL si présent)
+        """
+        account = get_principal(payload['account_id'])
+        if account is None:
+            raise AuthenticationFailed('Compte introuvable ou inactif')
+        return account
+
+    def get_simplejwt_account(self, payload):
+        """
+        Récupérer le compte d'un token simplejwt via le même cache partagé
+        """
+        account = get_principal(payload[simplejwt_settings.USER_ID_CLAIM])
+        if account is None:
+            raise AuthenticationFailed('Compte introuvable ou inactif')
+        return account
+
+    def decode_access_token(self, token):
+        """
+        Décoder et vérifier un token d'accès, retourner son payload
+        """
         try:
             # Décoder le token JWT
             payload = jwt.decode(
@@ -42,29 +249,20 @@ class JWTAuthentication(BaseAuthentication):
                 settings.SECRET_KEY,
                 algorithms=['HS256']
             )
-
-            # Vérifier le type de token
-            if payload.get('type') != 'access':
-                raise AuthenticationFailed('Type de token invalide')
-
-            # Récupérer le compte
-            account_id = payload.get('account_id')
-            if not account_id:
-                raise AuthenticationFailed('Token invalide')
-
-            try:
-                account = Account.objects.get(id=account_id, is_active=True)
-            except Account.DoesNotExist:
-                raise AuthenticationFailed('Compte introuvable ou inactif')
-
-            # Retourner (user, auth) - user sera l'account dans ce cas
-            return (account, token)
-
         except jwt.ExpiredSignatureError:
             raise AuthenticationFailed('Token expiré')
         except jwt.InvalidTokenError:
             raise AuthenticationFailed('Token invalide')
 
+        # Vérifier le type de token
+        if payload.get('type') != 'access':
+            raise AuthenticationFailed('Type de token invalide')
+
+        if not payload.get('account_id'):
+            raise AuthenticationFailed('Token invalide')
+
+        return payload
+
     def authenticate_header(self, request):
         """
         Retourner le format attendu pour le header WWW-Authenticate
@@ -72,6 +270,25 @@ class JWTAuthentication(BaseAuthentication):
         return 'Bearer realm="api"'
 
 
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Authentification JWT sans lecture du compte pour les requêtes en lecture
+
+    Pour les méthodes sûres (GET, HEAD, OPTIONS), request.user est un
+    TokenAccount construit à partir des claims du token: aucune requête SQL.
+    Les autres méthodes chargent le compte complet comme JWTAuthentication.
+
+    À activer explicitement via `authentication_classes` sur les vues en
+    lecture intensive. Un compte désactivé garde l'accès en lecture à ces
+    vues jusqu'à l'expiration de son token d'accès (1 heure).
+    """
+
+    def get_account(self, request, payload):
+        if request.method in SAFE_METHODS:
+            return principal_from_claims(payload)
+        return super().get_account(request, payload)
+
+
 def decode_jwt_token(token):
     """
     Fonction utilitaire pour décoder un token JWT
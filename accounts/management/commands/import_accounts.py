@@ -0,0 +1,53 @@
+"""
+Import en masse de comptes depuis un fichier CSV ou NDJSON
+
+Usage:
+    python manage.py import_accounts candidats.csv
+    python manage.py import_accounts candidats.ndjson --report rapport.json
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+import json
+import sys
+from accounts.importer import AccountImporter, FORMATS, iter_rows
+
+
+class Command(BaseCommand):
+    help = "Importer des comptes en masse depuis un fichier CSV ou NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Fichier à importer ('-' pour l'entrée standard)")
+        parser.add_argument('--file-format', choices=FORMATS, help="Format du fichier (déduit de l'extension par défaut)")
+        parser.add_argument('--chunk-size', type=int, help="Nombre de lignes par lot")
+        parser.add_argument('--processes', type=int, help="Nombre de processus de hachage")
+        parser.add_argument('--report', help="Fichier JSON où écrire le rapport complet")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['file_format']
+        if not file_format:
+            file_format = 'ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv'
+
+        importer = AccountImporter(chunk_size=options['chunk_size'], processes=options['processes'])
+        try:
+            if path == '-':
+                report = importer.run(iter_rows(sys.stdin, file_format))
+            else:
+                with open(path, encoding='utf-8-sig', newline='') as stream:
+                    report = importer.run(iter_rows(stream, file_format))
+        except OSError as exc:
+            raise CommandError(f"Impossible de lire {path}: {exc}")
+
+        if options['report']:
+            with open(options['report'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+
+        for error in report['errors'][:20]:
+            self.stderr.write(f"Ligne {error['line']} ({error['email']}): {json.dumps(error['errors'], ensure_ascii=False)}")
+        if len(report['errors']) > 20:
+            self.stderr.write(f"... {len(report['errors']) - 20} autres erreurs")
+
+        summary = f"{report['created']} comptes créés, {report['failed']} lignes refusées sur {report['total']}"
+        if report['aborted']:
+            raise CommandError(f"Import interrompu ({report['aborted']['detail']}): {summary}")
+        self.stdout.write(self.style.SUCCESS(f"[OK] {summary}"))
@@ -0,0 +1,48 @@
+# Generated by Django 6.0 on 2026-10-18 12:37
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower, Trim
+
+
+def normalize_emails(apps, schema_editor):
+    """
+    Emails existants en minuscules
+
+    Échoue, en listant les comptes concernés, si plusieurs comptes ne
+    diffèrent que par la casse (ou les espaces) de leur email: ils doivent
+    être fusionnés ou renommés avant d'appliquer la contrainte.
+    """
+    Account = apps.get_model('accounts', 'Account')
+    accounts = Account.objects.using(schema_editor.connection.alias)
+    duplicates = list(
+        accounts.annotate(normalized=Lower(Trim('email')))
+        .values('normalized').annotate(count=Count('id')).filter(count__gt=1)
+        .values_list('normalized', flat=True).order_by('normalized')
+    )
+    if duplicates:
+        conflicts = accounts.annotate(normalized=Lower(Trim('email'))).filter(
+            normalized__in=duplicates,
+        ).order_by('normalized', 'id').values_list('normalized', 'id', 'email')
+        lines = "\n".join(f"  {normalized}: compte {pk} ({email!r})" for normalized, pk, email in conflicts)
+        raise RuntimeError(
+            f"{len(duplicates)} email(s) utilisé(s) par plusieurs comptes à la casse près; "
+            f"fusionnez ou renommez ces comptes avant de migrer:\n{lines}"
+        )
+    accounts.update(email=Lower(Trim('email')))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_revokedtoken'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='account',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), name='accounts_account_email_ci_unique', violation_error_message='Un compte avec cet email existe déjà.'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0 on 2026-10-18 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_account_email_ci_unique'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at', '-id'], name='accounts_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['role', '-created_at', '-id'], name='accounts_active_role_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 6.0 on 2026-10-18 15:20
+
+from django.db import migrations
+
+
+# Groupes de accounts.filters.FUZZY_GROUPS: expressions de
+# common.fuzzy.group_sql, recopiées (les requêtes doivent utiliser la même
+# expression pour que l'index serve)
+INDEXES = {
+    'accounts_fuzzy_name_trgm_idx': (
+        "translate(lower(\"first_name\" || ' ' || \"last_name\"), "
+        "'àáâãäåāăąçćčďèéêëēėęěìíîïīįłñńňòóôõöøōőŕřśšşťţùúûüūůűųýÿźżž"
+        "ÀÁÂÃÄÅĀĂĄÇĆČĎÈÉÊËĒĖĘĚÌÍÎÏĪĮŁÑŃŇÒÓÔÕÖØŌŐŔŘŚŠŞŤŢÙÚÛÜŪŮŰŲÝŸŹŻŽ''’', "
+        "'aaaaaaaaacccdeeeeeeeeiiiiiilnnnoooooooorrsssttuuuuuuuuyyzzzaaaaaaaaacccdeeeeeeeeiiiiiilnnnoooooooorrsssttuuuuuuuuyyzzz')"
+    ),
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """Index GIN gin_trgm_ops sur les expressions normalisées (PostgreSQL uniquement)"""
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+    table = connection.ops.quote_name(apps.get_model('accounts', 'Account')._meta.db_table)
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, expression in INDEXES.items():
+        schema_editor.execute(f"CREATE INDEX {name} ON {table} USING GIN (({expression}) gin_trgm_ops)")
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_account_active_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -1,10 +1,20 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 
 
 class AccountManager(BaseUserManager):
     """Manager personnalisé pour le modèle Account"""
 
+    @classmethod
+    def normalize_email(cls, email):
+        """Normaliser l'email: la casse n'est pas significative"""
+        return super().normalize_email(email or '').strip().lower()
+
+    def filter_by_email(self, email):
+        """Filtrer par email via l'index unique sur LOWER(email)"""
+        return self.alias(email_lower=Lower('email')).filter(email_lower=self.normalize_email(email))
+
     def create_user(self, email, password=None, **extra_fields):
         """Créer et retourner un utilisateur normal"""
         if not email:
@@ -55,10 +65,42 @@ class Account(AbstractBaseUser, PermissionsMixin):
         ordering = ['-created_at']
         verbose_name = "Compte"
         verbose_name_plural = "Comptes"
+        constraints = [
+            models.UniqueConstraint(
+                Lower('email'),
+                name='accounts_account_email_ci_unique',
+                violation_error_message="Un compte avec cet email existe déjà.",
+            ),
+        ]
+        indexes = [
+            # Listes admin (pagination keyset sur created_at, id)
+            models.Index(
+                fields=['-created_at', '-id'],
+                condition=models.Q(is_active=True),
+                name='accounts_active_created_idx',
+            ),
+            # Listes filtrées par rôle
+            models.Index(
+                fields=['role', '-created_at', '-id'],
+                condition=models.Q(is_active=True),
+                name='accounts_active_role_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.email})"
 
+    def save(self, *args, **kwargs):
+        self.email = Account.objects.normalize_email(self.email)
+        super().save(*args, **kwargs)
+
+    def set_password(self, raw_password):
+        """Hasher le mot de passe via le pool borné de accounts.hashing"""
+        from .hashing import make_password
+
+        self.password = make_password(raw_password)
+        self._password = raw_password
+
     def get_full_name(self):
         """Retourner le nom complet"""
         return f"{self.first_name} {self.last_name}"
@@ -81,3 +123,38 @@ class Account(AbstractBaseUser, PermissionsMixin):
     def is_candidate(self):
         """Vérifier si l'utilisateur est un candidat"""
         return self.role == "candidate"
+
+
+class TokenAccount(Account):
+    """
+    Compte en lecture seule construit à partir des claims d'un token d'accès
+
+    Seuls les champs présents dans le token sont renseignés; les autres sont
+    différés et chargés depuis la base au premier accès.
+    """
+
+    class Meta:
+        proxy = True
+
+    def save(self, *args, **kwargs):
+        raise TypeError("Un TokenAccount est en lecture seule")
+
+    def delete(self, *args, **kwargs):
+        raise TypeError("Un TokenAccount est en lecture seule")
+
+
+class RevokedToken(models.Model):
+    """
+    Token JWT révoqué (déconnexion), identifié par son claim `jti`
+    """
+    jti = models.CharField(max_length=64, unique=True)
+    account = models.ForeignKey(Account, on_delete=models.CASCADE, related_name="revoked_tokens", null=True, blank=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Token révoqué"
+        verbose_name_plural = "Tokens révoqués"
+
+    def __str__(self):
+        return self.jti
@@ -0,0 +1,123 @@
+"""
+Pagination par curseur (keyset) pour la liste des comptes
+"""
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+import json
+
+
+class AccountCursorPagination(BasePagination):
+    """
+    Pagination keyset sur (created_at, id), dans l'ordre de Account.Meta.ordering
+
+    Chaque page est lue avec `WHERE (created_at, id) < curseur LIMIT n`,
+    borné par `created_at <= curseur` (voir cursor_filter): l'index partiel
+    accounts_active_created_idx est parcouru à partir du curseur, le coût ne
+    dépend donc pas de la position dans la liste. Aucun COUNT(*) n'est
+    exécuté par défaut.
+
+    Paramètres:
+    - cursor: curseur opaque renvoyé dans `next`
+    - page_size: taille de page (bornée par ACCOUNT_MAX_PAGE_SIZE)
+    - total: `exact` (COUNT) ou `estimate` (estimation du planificateur
+      PostgreSQL, COUNT sur les autres bases)
+    """
+
+    ordering = ('-created_at', '-id')
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    total_query_param = 'total'
+
+    def __init__(self):
+        self.page_size = getattr(settings, 'ACCOUNT_PAGE_SIZE', 50)
+        self.max_page_size = getattr(settings, 'ACCOUNT_MAX_PAGE_SIZE', 500)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+
+        self.total, self.total_is_estimate = self.get_total(queryset, request)
+
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            queryset = queryset.filter(self.cursor_filter(*cursor))
+
+        # Une ligne de plus pour savoir s'il existe une page suivante
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        self.next_cursor = self.encode_cursor(rows[-1]) if self.has_next else None
+        return rows
+
+    @staticmethod
+    def cursor_filter(created_at, pk):
+        """
+        Lignes situées après le curseur (created_at, pk)
+
+        Le OU seul n'est pas une borne d'index: sans `created_at <= curseur`,
+        la base parcourt l'index depuis le début et filtre chaque ligne.
+        """
+        return Q(created_at__lte=created_at) & (
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        )
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_total(self, queryset, request):
+        """Retourner (total, est_une_estimation) ou (None, False)"""
+        mode = request.query_params.get(self.total_query_param)
+        if mode == 'estimate' and connections[queryset.db].vendor == 'postgresql':
+            plan = json.loads(queryset.explain(format='json'))
+            return int(plan[0]['Plan']['Plan Rows']), True
+        if mode in ('exact', 'estimate'):
+            return queryset.count(), False
+        return None, False
+
+    def encode_cursor(self, account):
+        position = json.dumps([account.created_at.isoformat(), account.pk])
+        return urlsafe_b64encode(position.encode()).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            created_at, pk = json.loads(urlsafe_b64decode(encoded.encode()))
+            return datetime.fromisoformat(created_at), int(pk)
+        except (TypeError, ValueError):
+            raise NotFound('Curseur invalide')
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        payload = {
+            "next": self.get_next_link(),
+            "accounts": data,
+        }
+        if self.total is not None:
+            payload = {
+                "count": self.total,
+                "count_is_estimate": self.total_is_estimate,
+                **payload,
+            }
+        return Response(payload)
@@ -0,0 +1,74 @@
+"""
+Cache partagé des comptes authentifiés (principals)
+
+Les comptes actifs sont mis en cache via le framework de cache Django, indexés
+par leur id. Les entrées sont invalidées par les signaux de `accounts.signals`
+à la validation de chaque sauvegarde ou suppression d'un compte.
+
+`principal_from_claims` construit un compte sans aucune requête SQL à partir
+des claims d'un token d'accès déjà vérifié.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router
+from .models import Account, TokenAccount
+
+
+PRINCIPAL_CACHE_TIMEOUT = getattr(settings, 'ACCOUNT_PRINCIPAL_CACHE_TIMEOUT', 300)
+
+
+def principal_cache_key(account_id):
+    """Clé de cache d'un compte"""
+    return f'accounts:principal:{account_id}'
+
+
+def get_principal(account_id):
+    """
+    Retourner le compte actif correspondant à l'id, ou None
+
+    Aucune requête SQL n'est faite si le compte est en cache.
+    """
+    key = principal_cache_key(account_id)
+    account = cache.get(key)
+    if account is not None:
+        return account
+
+    account = Account.objects.filter(id=account_id, is_active=True).first()
+    if account is not None:
+        cache.set(key, account, PRINCIPAL_CACHE_TIMEOUT)
+    return account
+
+
+def invalidate_principal(account_id):
+    """Retirer un compte du cache"""
+    cache.delete(principal_cache_key(account_id))
+
+
+def invalidate_principals(account_ids):
+    """Retirer plusieurs comptes du cache en un seul appel"""
+    cache.delete_many([principal_cache_key(account_id) for account_id in account_ids])
+
+
+def principal_from_claims(payload):
+    """
+    Construire un TokenAccount (lecture seule) à partir d'un payload vérifié
+
+    Les champs absents du token sont différés: ils sont chargés depuis la base
+    uniquement si la vue y accède.
+    """
+    values = {
+        'id': payload['account_id'],
+        'email': payload.get('email'),
+        'first_name': payload.get('first_name'),
+        'last_name': payload.get('last_name'),
+        'role': payload.get('role'),
+        'is_active': True,
+    }
+    values = {name: value for name, value in values.items() if value is not None}
+    field_names = [f.attname for f in TokenAccount._meta.concrete_fields if f.attname in values]
+    return TokenAccount.from_db(
+        router.db_for_read(TokenAccount),
+        field_names,
+        [values[name] for name in field_names],
+    )
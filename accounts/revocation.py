@@ -0,0 +1,132 @@
+"""
+Liste de révocation des tokens JWT
+
+Les `jti` révoqués sont stockés dans la table RevokedToken. Chaque processus
+garde un filtre de Bloom de ces `jti`, reconstruit périodiquement depuis la
+base: un token absent du filtre n'est certainement pas révoqué, et seul un
+résultat positif (révoqué ou faux positif) est confirmé par une requête SQL.
+"""
+
+from datetime import datetime, timezone
+from django.conf import settings
+from django.db import IntegrityError, transaction
+import hashlib
+import math
+import threading
+import time
+from .models import RevokedToken
+
+
+class BloomFilter:
+    """
+    Filtre de Bloom à taille fixe (faux positifs possibles, jamais de faux
+    négatifs)
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        # Double hachage: les positions sont dérivées de deux entiers 64 bits
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, value):
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class RevocationList:
+    """
+    Vérification des tokens révoqués avec un filtre de Bloom en mémoire
+    reconstruit toutes les `refresh_interval` secondes
+    """
+
+    def __init__(self, refresh_interval=30, error_rate=0.01):
+        self.refresh_interval = refresh_interval
+        self.error_rate = error_rate
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._built_at = 0.0
+        self.rebuilds = 0
+        self.checks = 0
+        self.bloom_negatives = 0
+        self.db_checks = 0
+
+    def _maybe_rebuild(self):
+        if self._bloom is not None and time.monotonic() - self._built_at < self.refresh_interval:
+            return
+        with self._lock:
+            if self._bloom is not None and time.monotonic() - self._built_at < self.refresh_interval:
+                return
+            now = datetime.now(timezone.utc)
+            jtis = list(RevokedToken.objects.filter(expires_at__gt=now).values_list('jti', flat=True))
+            bloom = BloomFilter(max(1024, len(jtis) * 2), self.error_rate)
+            for jti in jtis:
+                bloom.add(jti)
+            self._bloom = bloom
+            self._built_at = time.monotonic()
+            self.rebuilds += 1
+
+    def is_revoked(self, jti):
+        """Vérifier si un token est révoqué (sans requête SQL s'il ne l'est pas)"""
+        if not jti:
+            return False
+        self._maybe_rebuild()
+        self.checks += 1
+        if jti not in self._bloom:
+            self.bloom_negatives += 1
+            return False
+        self.db_checks += 1
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    def revoke(self, payload, account=None):
+        """
+        Révoquer un token à partir de son payload vérifié
+
+        Les autres processus en tiennent compte à la prochaine reconstruction
+        de leur filtre (au plus `refresh_interval` secondes).
+        """
+        jti = payload.get('jti')
+        if not jti:
+            return False
+
+        now = datetime.now(timezone.utc)
+        expires_at = datetime.fromtimestamp(payload['exp'], timezone.utc)
+        try:
+            with transaction.atomic():
+                RevokedToken.objects.create(jti=jti, account=account, expires_at=expires_at)
+        except IntegrityError:
+            # Déjà révoqué
+            pass
+
+        # Les tokens expirés n'ont plus besoin d'être conservés
+        RevokedToken.objects.filter(expires_at__lte=now).delete()
+
+        self._maybe_rebuild()
+        self._bloom.add(jti)
+        return True
+
+    def stats(self):
+        """Métriques du filtre de révocation"""
+        return {
+            'refresh_interval': self.refresh_interval,
+            'bloom_size_bits': self._bloom.size if self._bloom is not None else 0,
+            'rebuilds': self.rebuilds,
+            'checks': self.checks,
+            'bloom_negatives': self.bloom_negatives,
+            'db_checks': self.db_checks,
+        }
+
+
+revocation_list = RevocationList(
+    refresh_interval=getattr(settings, 'JWT_REVOCATION_REFRESH_INTERVAL', 30),
+)
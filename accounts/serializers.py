@@ -1,6 +1,10 @@
 from rest_framework import serializers
+from django.db import IntegrityError, transaction
 from .models import Account
 
+
+EMAIL_TAKEN_MESSAGE = "Un compte avec cet email existe déjà."
+
 class AccountRegistrationSerializer(serializers.ModelSerializer):
     """
     Serializer pour l'inscription d'un nouveau compte
@@ -12,14 +16,14 @@ class AccountRegistrationSerializer(serializers.ModelSerializer):
         fields = ['first_name', 'last_name', 'email', 'phone', 'password', 'password_confirm', 'role']
         extra_kwargs = {
             'password': {'write_only': True},
-            'role': {'required': False}  # Le rôle est optionnel, par défaut "candidate"
+            'role': {'required': False},  # Le rôle est optionnel, par défaut "candidate"
+            # Unicité garantie par la contrainte LOWER(email), sans requête préalable
+            'email': {'validators': []},
         }
 
     def validate_email(self, value):
-        """Vérifier que l'email n'existe pas déjà"""
-        if Account.objects.filter(email=value).exists():
-            raise serializers.ValidationError("Un compte avec cet email existe déjà.")
-        return value
+        """Normaliser l'email (l'unicité est vérifiée à l'insertion)"""
+        return Account.objects.normalize_email(value)
 
     def validate(self, attrs):
         """Vérifier que les mots de passe correspondent"""
@@ -35,10 +39,14 @@ class AccountRegistrationSerializer(serializers.ModelSerializer):
         password = validated_data.pop('password')
 
         # Utiliser create_user pour hasher correctement le mot de passe
-        account = Account.objects.create_user(
-            password=password,
-            **validated_data
-        )
+        try:
+            with transaction.atomic():
+                account = Account.objects.create_user(
+                    password=password,
+                    **validated_data
+                )
+        except IntegrityError:
+            raise serializers.ValidationError({"email": [EMAIL_TAKEN_MESSAGE]})
         return account
 
 
@@ -64,17 +72,14 @@ class AccountUpdateSerializer(serializers.ModelSerializer):
         model = Account
         fields = ['first_name', 'last_name', 'email', 'phone', 'role', 'password']
         extra_kwargs = {
-            'email': {'required': False},
+            'email': {'required': False, 'validators': []},
             'first_name': {'required': False},
             'last_name': {'required': False},
         }
 
     def validate_email(self, value):
-        """Vérifier que l'email n'est pas déjà utilisé par un autre compte"""
-        instance = self.instance
-        if instance and Account.objects.filter(email=value).exclude(id=instance.id).exists():
-            raise serializers.ValidationError("Un compte avec cet email existe déjà.")
-        return value
+        """Normaliser l'email (l'unicité est vérifiée à l'enregistrement)"""
+        return Account.objects.normalize_email(value)
 
     def update(self, instance, validated_data):
         """Mettre à jour le compte"""
@@ -86,5 +91,47 @@ class AccountUpdateSerializer(serializers.ModelSerializer):
         if password:
             instance.set_password(password)
 
-        instance.save()
+        try:
+            with transaction.atomic():
+                instance.save()
+        except IntegrityError:
+            raise serializers.ValidationError({"email": [EMAIL_TAKEN_MESSAGE]})
         return instance
+
+
+class AccountImportSerializer(serializers.Serializer):
+    """
+    Validation d'une ligne d'import en masse
+
+    Aucune requête SQL: l'unicité des emails est vérifiée par lot dans
+    accounts.importer.
+    """
+    first_name = serializers.CharField(max_length=100)
+    last_name = serializers.CharField(max_length=100)
+    email = serializers.EmailField()
+    phone = serializers.CharField(max_length=20, required=False, allow_blank=True, default='')
+    role = serializers.ChoiceField(choices=Account.ROLE_CHOICES, required=False, default='candidate')
+    password = serializers.CharField(write_only=True)
+
+    def validate_email(self, value):
+        return Account.objects.normalize_email(value)
+
+    def validate_role(self, value):
+        allowed_roles = self.context.get('allowed_roles')
+        if allowed_roles is not None and value not in allowed_roles:
+            raise serializers.ValidationError("Vous ne pouvez pas importer de comptes avec ce rôle.")
+        return value
+
+
+class AccountBulkStatusSerializer(serializers.Serializer):
+    """
+    Cible d'une désactivation/réactivation en masse: liste d'ids ou filtre
+    (voir accounts.filters.AccountFilter)
+    """
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, allow_empty=False)
+    filter = serializers.DictField(required=False, allow_empty=False)
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError("Fournir soit 'ids', soit 'filter'.")
+        return attrs
@@ -0,0 +1,36 @@
+"""
+Signaux du modèle Account
+"""
+
+from django.db import router, transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from common import fuzzy
+from .models import Account
+from .principals import invalidate_principal
+
+
+@receiver(post_save, sender=Account)
+@receiver(post_delete, sender=Account)
+def invalidate_cached_principal(sender, instance, **kwargs):
+    """
+    Invalider le compte en cache (mise à jour, soft delete, suppression)
+
+    À la validation de la transaction: invalidé plus tôt, le compte pourrait
+    être relu (ancienne ligne) et remis en cache par une requête concurrente.
+    """
+    pk = instance.pk
+    using = instance._state.db or router.db_for_write(sender, instance=instance)
+    transaction.on_commit(lambda: invalidate_principal(pk), using=using)
+
+
+@receiver(post_save, sender=Account)
+def update_fuzzy_index(sender, instance, raw=False, **kwargs):
+    """Mettre à jour l'index de recherche approximative en mémoire (hors PostgreSQL)"""
+    if not raw:
+        fuzzy.record_save(instance)
+
+
+@receiver(post_delete, sender=Account)
+def remove_from_fuzzy_index(sender, instance, **kwargs):
+    fuzzy.record_delete(instance)
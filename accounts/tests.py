@@ -1,3 +1,580 @@
-from django.test import TestCase
+from unittest import mock
+import csv
+import gzip
+import io
+import json
+import threading
+import time
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+from .authentication import generate_jwt_tokens_for_account
+from .hashing import HashingUnavailable, PasswordHasherPool
+from .jwt_auth import ClaimsJWTAuthentication, JWTAuthentication, TokenCache, dispatch_stats, token_cache
+from .models import Account, RevokedToken, TokenAccount
+from .principals import get_principal, principal_cache_key
 
-# Create your tests here.
+
+class LogoutTests(TestCase):
+    """Déconnexion: révocation des tokens d'accès et de rafraîchissement"""
+
+    def setUp(self):
+        self.account = Account.objects.create_user(
+            email='candidat@example.com', password='motdepasse', first_name='Jean', last_name='Dupont',
+        )
+        self.tokens = generate_jwt_tokens_for_account(self.account)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.tokens['access']}")
+
+    def test_logout_revokes_access_and_refresh(self):
+        response = self.client.post('/api/accounts/logout/', {'refresh': self.tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(RevokedToken.objects.filter(account=self.account).count(), 2)
+
+        # Le token d'accès n'est plus accepté
+        response = self.client.get('/api/accounts/logout/')
+        self.assertEqual(response.status_code, 401)
+
+        # Le token de rafraîchissement non plus
+        response = APIClient().post('/api/accounts/refresh/', {'refresh': self.tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+    def test_logout_rejects_access_token_as_refresh(self):
+        other = generate_jwt_tokens_for_account(self.account)
+        response = self.client.post('/api/accounts/logout/', {'refresh': other['access']}, format='json')
+        self.assertEqual(response.status_code, 400)
+        # Rien n'est révoqué: la déconnexion est refusée en entier
+        self.assertFalse(RevokedToken.objects.exists())
+
+    def test_logout_rejects_refresh_of_another_account(self):
+        other = Account.objects.create_user(
+            email='autre@example.com', password='motdepasse', first_name='Marie', last_name='Martin',
+        )
+        response = self.client.post(
+            '/api/accounts/logout/', {'refresh': generate_jwt_tokens_for_account(other)['refresh']}, format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_logout_with_invalid_refresh(self):
+        response = self.client.post('/api/accounts/logout/', {'refresh': 'invalide'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_logout_requires_authentication(self):
+        response = APIClient().post('/api/accounts/logout/', format='json')
+        self.assertEqual(response.status_code, 401)
+
+
+class BulkSetActiveTests(TestCase):
+    """Désactivation en masse: validation du filtre"""
+
+    def setUp(self):
+        self.admin = Account.objects.create_user(
+            email='admin@example.com', password='motdepasse', first_name='Anne', last_name='Admin', role='admin',
+        )
+        self.candidates = [
+            Account.objects.create_user(
+                email=f'candidat{i}@example.com', password='motdepasse', first_name='Jean', last_name=f'Dupont{i}',
+            )
+            for i in range(3)
+        ]
+        self.other_admin = Account.objects.create_user(
+            email='admin2@example.com', password='motdepasse', first_name='Paul', last_name='Admin', role='admin',
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {generate_jwt_tokens_for_account(self.admin)['access']}")
+
+    def deactivate(self, body):
+        return self.client.post('/api/accounts/bulk-deactivate/', body, format='json')
+
+    def active_count(self):
+        return Account.objects.filter(is_active=True).count()
+
+    def test_filter_by_role(self):
+        response = self.deactivate({'filter': {'role': 'candidate'}})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 3)
+        self.assertTrue(Account.objects.get(id=self.other_admin.id).is_active)
+
+    def test_unknown_filter_key_is_rejected(self):
+        response = self.deactivate({'filter': {'rol': 'candidate'}})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('rol', response.data['filter'])
+        self.assertEqual(self.active_count(), 5)
+
+    def test_unknown_key_next_to_a_valid_one_is_rejected(self):
+        response = self.deactivate({'filter': {'role': 'candidate', 'is_staf': True}})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.active_count(), 5)
+
+    def test_empty_filter_value_is_rejected(self):
+        response = self.deactivate({'filter': {'email': ''}})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.active_count(), 5)
+
+    def test_empty_filter_is_rejected(self):
+        response = self.deactivate({'filter': {}})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.active_count(), 5)
+
+    def test_ids_never_include_the_caller(self):
+        response = self.deactivate({'ids': [self.admin.id, self.candidates[0].id]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 1)
+        self.assertTrue(Account.objects.get(id=self.admin.id).is_active)
+
+
+class PrincipalCacheTests(TestCase):
+    """Cache des comptes authentifiés, invalidé à la validation des écritures"""
+
+    def setUp(self):
+        cache.clear()
+        self.account = Account.objects.create_user(
+            email='candidat@example.com', password='motdepasse', first_name='Jean', last_name='Dupont',
+        )
+
+    def test_cached_without_query(self):
+        get_principal(self.account.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_principal(self.account.id).email, 'candidat@example.com')
+
+    def test_deactivation_invalidates_on_commit(self):
+        get_principal(self.account.id)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.account.is_active = False
+            self.account.save()
+            # Transaction non validée: l'entrée est toujours là
+            self.assertIsNotNone(cache.get(principal_cache_key(self.account.id)))
+        for callback in callbacks:
+            callback()
+        self.assertIsNone(get_principal(self.account.id))
+
+    def test_demotion_is_visible_after_commit(self):
+        self.account.role = 'admin'
+        self.account.save()
+        get_principal(self.account.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.account.role = 'candidate'
+            self.account.save()
+        self.assertEqual(get_principal(self.account.id).role, 'candidate')
+
+
+class HashingPoolTests(TestCase):
+    """Pool de hachage saturé: exception du domaine, 503 dans l'API"""
+
+    def setUp(self):
+        # Une seule place, déjà occupée
+        self.pool = PasswordHasherPool(max_workers=1, max_queue=0, queue_timeout=0.01)
+        self.pool._slots.acquire()
+        patcher = mock.patch('accounts.hashing.hasher_pool', self.pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_set_password_raises_domain_exception(self):
+        account = Account(email='candidat@example.com', first_name='Jean', last_name='Dupont')
+        with self.assertRaises(HashingUnavailable):
+            account.set_password('motdepasse')
+        stats = self.pool.stats()
+        self.assertEqual(stats['rejected'], 1)
+        self.assertEqual(stats['queue_depth'], 0)
+
+    def test_queue_depth_counts_waiting_callers(self):
+        self.pool.queue_timeout = 5
+        waiter = threading.Thread(target=self.pool.run, args=(len, 'abc'))
+        waiter.start()
+        deadline = time.monotonic() + 5
+        while self.pool.stats()['queue_depth'] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.pool.stats()['queue_depth'], 1)
+        self.pool._slots.release()
+        waiter.join()
+        self.assertEqual(self.pool.stats()['queue_depth'], 0)
+        self.assertEqual(self.pool.stats()['completed'], 1)
+
+    def test_api_returns_503_with_retry_after(self):
+        response = APIClient().post('/api/accounts/register/', {
+            'email': 'candidat@example.com', 'first_name': 'Jean', 'last_name': 'Dupont',
+            'password': 'motdepasse', 'password_confirm': 'motdepasse',
+        }, format='json')
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('Retry-After', response)
+        self.assertFalse(Account.objects.exists())
+
+
+class AccountListTests(TestCase):
+    """Liste des comptes: pagination keyset sur (created_at, id)"""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = Account.objects.create_user(
+            email='admin@example.com', password='motdepasse', first_name='Anne', last_name='Admin', role='admin',
+        )
+        for i in range(6):
+            Account.objects.create_user(
+                email=f'candidat{i}@example.com', password='motdepasse', first_name='Jean', last_name=f'Dupont{i}',
+            )
+        # Comptes créés au même instant: départagés par l'id
+        Account.objects.filter(email__in=['candidat1@example.com', 'candidat2@example.com', 'candidat3@example.com']) \
+            .update(created_at=timezone.now())
+        Account.objects.filter(email='candidat5@example.com').update(is_active=False)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {generate_jwt_tokens_for_account(self.admin)['access']}")
+
+    def test_pages_follow_the_ordering(self):
+        expected = list(
+            Account.objects.filter(is_active=True).order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+        seen = []
+        url = '/api/accounts/?page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['accounts']), 2)
+            seen += [account['id'] for account in response.data['accounts']]
+            url = response.data['next']
+        self.assertEqual(seen, expected)
+
+    def test_exact_total(self):
+        response = self.client.get('/api/accounts/', {'page_size': 2, 'total': 'exact'})
+        self.assertEqual(response.data['count'], 6)
+        self.assertFalse(response.data['count_is_estimate'])
+
+    def test_no_count_by_default(self):
+        response = self.client.get('/api/accounts/')
+        self.assertNotIn('count', response.data)
+        self.assertIsNone(response.data['next'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/accounts/', {'cursor': 'invalide'})
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(ACCOUNT_IMPORT_CHUNK_SIZE=2)
+class AccountImportTests(TestCase):
+    """Import en masse: rapport ligne par ligne, y compris en cas d'arrêt"""
+
+    header = 'first_name,last_name,email,password,role\n'
+
+    def setUp(self):
+        cache.clear()
+        self.admin = Account.objects.create_user(
+            email='admin@example.com', password='motdepasse', first_name='Anne', last_name='Admin', role='admin',
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {generate_jwt_tokens_for_account(self.admin)['access']}")
+
+    def upload(self, content, name='comptes.csv'):
+        if isinstance(content, str):
+            content = content.encode()
+        return self.client.post('/api/accounts/import/', {'file': SimpleUploadedFile(name, content)}, format='multipart')
+
+    def rows(self, count):
+        return ''.join(f'Jean,Dupont{i},candidat{i}@example.com,motdepasse{i},\n' for i in range(count))
+
+    def test_report(self):
+        response = self.upload(
+            self.header + self.rows(2)
+            + 'Jean,Doublon,ADMIN@example.com,motdepasse,\n'
+            + 'Jean,Invalide,pas-un-email,motdepasse,\n'
+            + 'Jean,Admin,nouvel.admin@example.com,motdepasse,admin\n'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total'], 5)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual([error['line'] for error in response.data['errors']], [4, 5, 6])
+        self.assertIn('email', response.data['errors'][0]['errors'])
+        self.assertIsNone(response.data['aborted'])
+        self.assertTrue(Account.objects.filter(email='candidat1@example.com').exists())
+
+    def test_ndjson(self):
+        response = self.upload(
+            '{"first_name": "Jean", "last_name": "Dupont", "email": "candidat@example.com", "password": "x"}\n{bad\n',
+            name='comptes.ndjson',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['errors'][0]['line'], 2)
+
+    def test_non_utf8_file_is_rejected(self):
+        response = self.upload((self.header + 'Jérôme,Dupont,jerome@example.com,motdepasse,\n').encode('latin-1'))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['aborted']['reason'], 'invalid_file')
+
+    def test_malformed_csv_reports_the_imported_lines(self):
+        response = self.upload(self.header + self.rows(2) + 'Jean,' + 'x' * 200000 + ',a@example.com,m,\n')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['aborted']['reason'], 'invalid_file')
+        self.assertEqual(response.data['created'], 2)
+
+    def test_hashing_unavailable_reports_the_imported_lines(self):
+        hashes = ['!', '!', HashingUnavailable(wait=5)]
+        with mock.patch('accounts.importer.make_password', side_effect=hashes):
+            response = self.upload(self.header + self.rows(4))
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(response.data['aborted']['reason'], 'hashing_unavailable')
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual([error['line'] for error in response.data['errors']], [4, 5])
+        self.assertEqual(Account.objects.filter(role='candidate').count(), 2)
+
+
+class TokenCacheTests(TestCase):
+    """Cache des tokens vérifiés: le compte reste résolu à chaque requête"""
+
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        self.admin = Account.objects.create_user(
+            email='admin@example.com', password='motdepasse', first_name='Anne', last_name='Admin', role='admin',
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {generate_jwt_tokens_for_account(self.admin)['access']}")
+
+    def metrics(self):
+        return self.client.get('/api/accounts/auth-metrics/')
+
+    def test_second_request_hits_the_cache(self):
+        self.assertEqual(self.metrics().status_code, 200)
+        self.assertEqual(self.metrics().data['token_cache']['hits'], 1)
+
+    def test_deactivation_rejects_a_cached_token(self):
+        self.assertEqual(self.metrics().status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.admin.is_active = False
+            self.admin.save()
+        self.assertEqual(self.metrics().status_code, 401)
+
+    def test_demotion_applies_to_a_cached_token(self):
+        self.assertEqual(self.metrics().status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.admin.role = 'candidate'
+            self.admin.save()
+        self.assertEqual(self.metrics().status_code, 403)
+
+    def test_expired_entry_is_dropped(self):
+        tokens = TokenCache(max_entries=4)
+        tokens.set('expiré', {'exp': time.time() - 1})
+        self.assertIsNone(tokens.get('expiré'))
+        self.assertEqual(tokens.stats()['size'], 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        tokens = TokenCache(max_entries=2)
+        exp = time.time() + 60
+        tokens.set('a', {'exp': exp})
+        tokens.set('b', {'exp': exp})
+        tokens.get('a')
+        tokens.set('c', {'exp': exp})
+        self.assertIsNone(tokens.get('b'))
+        self.assertIsNotNone(tokens.get('a'))
+        self.assertEqual(tokens.stats()['evictions'], 1)
+
+
+class ClaimsAuthenticationTests(TestCase):
+    """Lectures authentifiées par les claims du token, sans lecture du compte"""
+
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        self.admin = Account.objects.create_user(
+            email='admin@example.com', password='motdepasse', first_name='Anne', last_name='Admin', role='admin',
+        )
+        self.token = generate_jwt_tokens_for_account(self.admin)['access']
+        self.factory = APIRequestFactory()
+
+    def authenticate(self, method):
+        request = getattr(self.factory, method)('/', HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        return ClaimsJWTAuthentication().authenticate(request)[0]
+
+    def test_read_builds_the_account_from_claims(self):
+        with self.assertNumQueries(0):
+            account = self.authenticate('get')
+            self.assertIsInstance(account, TokenAccount)
+            self.assertEqual((account.id, account.email, account.role), (self.admin.id, 'admin@example.com', 'admin'))
+            self.assertTrue(account.is_admin)
+
+    def test_write_loads_the_account(self):
+        with self.assertNumQueries(1):
+            account = self.authenticate('post')
+        self.assertNotIsInstance(account, TokenAccount)
+        self.assertEqual(account.phone, self.admin.phone)
+
+    def test_deactivated_account_keeps_read_access_only(self):
+        Account.objects.filter(id=self.admin.id).update(is_active=False)
+        self.assertEqual(self.authenticate('get').id, self.admin.id)
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate('post')
+
+    def test_token_account_is_read_only(self):
+        with self.assertRaises(TypeError):
+            self.authenticate('get').save()
+
+
+class RefreshTests(TestCase):
+    """Rafraîchissement du token d'accès d'un compte, sans mot de passe"""
+
+    def setUp(self):
+        cache.clear()
+        self.account = Account.objects.create_user(
+            email='candidat@example.com', password='motdepasse', first_name='Jean', last_name='Dupont',
+        )
+        self.tokens = generate_jwt_tokens_for_account(self.account)
+
+    def refresh(self, token):
+        return APIClient().post('/api/accounts/refresh/', {'refresh': token}, format='json')
+
+    def test_refresh_returns_a_usable_access_token(self):
+        response = self.refresh(self.tokens['refresh'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['token_type'], 'Bearer')
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        self.assertEqual(client.get(f'/api/accounts/{self.account.id}/').status_code, 200)
+
+    def test_access_token_is_rejected(self):
+        self.assertEqual(self.refresh(self.tokens['access']).status_code, 401)
+
+    def test_missing_token(self):
+        self.assertEqual(self.refresh('').status_code, 400)
+
+    def test_deactivated_account_is_rejected(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.account.is_active = False
+            self.account.save()
+        self.assertEqual(self.refresh(self.tokens['refresh']).status_code, 401)
+
+
+class DispatchTests(TestCase):
+    """Aiguillage des tokens Account et simplejwt vers un seul vérificateur"""
+
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        dispatch_stats.clear()
+        self.account = Account.objects.create_user(
+            email='candidat@example.com', password='motdepasse', first_name='Jean', last_name='Dupont',
+        )
+        self.factory = APIRequestFactory()
+
+    def authenticate(self, token):
+        request = self.factory.get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        account, _ = JWTAuthentication().authenticate(request)
+        return request, account
+
+    def test_account_token(self):
+        token = generate_jwt_tokens_for_account(self.account)['access']
+        request, account = self.authenticate(token)
+        self.assertEqual((request.auth_path, account.id), ('account', self.account.id))
+        self.authenticate(token)
+        self.assertEqual(dispatch_stats.stats(), {'account': {'verified': 1, 'cached': 1}})
+
+    def test_simplejwt_token(self):
+        token = str(RefreshToken.for_user(self.account).access_token)
+        request, account = self.authenticate(token)
+        self.assertEqual((request.auth_path, account.id), ('simplejwt', self.account.id))
+        self.assertEqual(dispatch_stats.stats(), {'simplejwt': {'verified': 1}})
+
+    def test_simplejwt_refresh_token_is_rejected(self):
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(str(RefreshToken.for_user(self.account)))
+        self.assertEqual(dispatch_stats.stats(), {'simplejwt': {'rejected': 1}})
+
+    def test_malformed_token(self):
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate('pas-un-jwt')
+        self.assertEqual(dispatch_stats.stats(), {'unknown': {'rejected': 1}})
+
+
+class EmailUniquenessTests(TestCase):
+    """Unicité de l'email sans tenir compte de la casse (index sur LOWER(email))"""
+
+    def setUp(self):
+        cache.clear()
+        self.account = Account.objects.create_user(
+            email='Jean.Dupont@Example.com', password='motdepasse', first_name='Jean', last_name='Dupont',
+        )
+
+    def test_email_is_stored_lowercase(self):
+        self.assertEqual(self.account.email, 'jean.dupont@example.com')
+        self.assertEqual(Account.objects.filter_by_email(' JEAN.DUPONT@example.COM ').get(), self.account)
+
+    def test_registration_with_another_case_is_rejected(self):
+        response = APIClient().post('/api/accounts/', {
+            'email': 'JEAN.DUPONT@EXAMPLE.COM', 'first_name': 'Jean', 'last_name': 'Dupont',
+            'password': 'motdepasse', 'password_confirm': 'motdepasse',
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('email', response.data)
+        self.assertEqual(Account.objects.count(), 1)
+
+    def test_update_to_a_taken_email_is_rejected(self):
+        other = Account.objects.create_user(
+            email='marie@example.com', password='motdepasse', first_name='Marie', last_name='Martin',
+        )
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {generate_jwt_tokens_for_account(other)['access']}")
+        response = client.patch(f'/api/accounts/{other.id}/', {'email': 'Jean.Dupont@example.com'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('email', response.data)
+
+    def test_database_constraint_ignores_case(self):
+        Account.objects.filter(id=self.account.id).update(email='JEAN.DUPONT@EXAMPLE.COM')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Account.objects.create(email='jean.dupont@example.com', first_name='Jean', last_name='Dupont')
+
+
+class ExportTests(TestCase):
+    """Export des comptes en flux CSV ou NDJSON"""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = Account.objects.create_user(
+            email='admin@example.com', password='motdepasse', first_name='Anne', last_name='Admin', role='admin',
+        )
+        for i in range(3):
+            Account.objects.create_user(
+                email=f'candidat{i}@example.com', password='motdepasse', first_name='Jérôme', last_name=f'Dupont{i}',
+            )
+        Account.objects.filter(email='candidat2@example.com').update(is_active=False)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {generate_jwt_tokens_for_account(self.admin)['access']}")
+
+    def export(self, **params):
+        response = self.client.get('/api/accounts/export/', params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response
+
+    def test_csv_lists_active_accounts_by_id(self):
+        response = self.export()
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual([row['email'] for row in rows], [
+            'admin@example.com', 'candidat0@example.com', 'candidat1@example.com',
+        ])
+        self.assertEqual(rows[1]['first_name'], 'Jérôme')
+        self.assertNotIn('password', rows[0])
+
+    def test_ndjson_with_filters(self):
+        response = self.export(file_format='ndjson', role='candidate', is_active='false')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)['email'] for line in lines], ['candidat2@example.com'])
+
+    def test_gzip(self):
+        response = self.client.get('/api/accounts/export/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        content = gzip.decompress(b''.join(response.streaming_content)).decode()
+        self.assertEqual(len(content.splitlines()), 4)
+
+    def test_unknown_format(self):
+        response = self.client.get('/api/accounts/export/', {'file_format': 'xlsx'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_candidates_cannot_export(self):
+        candidate = Account.objects.get(email='candidat0@example.com')
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {generate_jwt_tokens_for_account(candidate)['access']}")
+        self.assertEqual(client.get('/api/accounts/export/').status_code, 403)
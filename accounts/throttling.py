@@ -0,0 +1,88 @@
+"""
+Limitation du débit des tentatives de connexion
+
+Les throttles DRF sont évalués avant la vue: une tentative rejetée ne coûte
+donc aucun hachage de mot de passe. Les fenêtres glissantes sont stockées
+dans le cache `throttle`, partagé par tous les workers du serveur.
+"""
+
+from django.core.cache import caches
+from rest_framework.throttling import SimpleRateThrottle
+import hashlib
+
+
+THROTTLED_KEY = 'login_throttle:throttled'
+
+
+def record_throttled(cache):
+    """
+    Compter une tentative rejetée (sans requête SQL: le chemin rejeté doit
+    rester moins coûteux qu'une connexion)
+    """
+    cache.add(THROTTLED_KEY, 0, None)
+    try:
+        cache.incr(THROTTLED_KEY)
+    except ValueError:
+        # La clé a été évincée entre add() et incr()
+        cache.set(THROTTLED_KEY, 1, None)
+
+
+def normalize_login_email(email):
+    """Normaliser l'email utilisé comme clé de limitation"""
+    if not isinstance(email, str):
+        return ''
+    return email.strip().lower()
+
+
+class LoginRateThrottle(SimpleRateThrottle):
+    """
+    Base des limitations de /api/accounts/login/ (fenêtre glissante)
+    """
+    cache = caches['throttle']
+
+    def allow_request(self, request, view):
+        allowed = super().allow_request(request, view)
+        # Une requête rejetée par plusieurs throttles n'est comptée qu'une fois
+        if not allowed and not getattr(request, '_login_throttled', False):
+            request._login_throttled = True
+            record_throttled(self.cache)
+        return allowed
+
+
+class LoginIPThrottle(LoginRateThrottle):
+    """
+    Limite par adresse IP du client (REMOTE_ADDR, ou X-Forwarded-For selon
+    REST_FRAMEWORK['NUM_PROXIES'])
+    """
+    scope = 'login_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request),
+        }
+
+
+class LoginEmailThrottle(LoginRateThrottle):
+    """Limite par email (normalisé) ciblé par la tentative"""
+    scope = 'login_email'
+
+    def get_cache_key(self, request, view):
+        email = normalize_login_email(request.data.get('email'))
+        if not email:
+            return None
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': hashlib.sha256(email.encode()).hexdigest(),
+        }
+
+
+def login_throttle_stats():
+    """Métriques de la limitation des connexions"""
+    return {
+        'rates': {
+            throttle.scope: throttle.THROTTLE_RATES.get(throttle.scope)
+            for throttle in (LoginIPThrottle, LoginEmailThrottle)
+        },
+        'throttled': LoginRateThrottle.cache.get(THROTTLED_KEY, 0),
+    }
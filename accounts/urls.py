@@ -1,7 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from . import views
-from .authentication import login_with_email
+from .authentication import login_with_email, refresh_access_token, logout
 
 # Router pour les endpoints RESTful
 router = DefaultRouter()
@@ -11,9 +11,18 @@ urlpatterns = [
     # Endpoint de login (custom)
     path('login/', login_with_email, name='login_account'),
 
+    # Rafraîchissement du token d'accès
+    path('refresh/', refresh_access_token, name='refresh_account_token'),
+
+    # Déconnexion (révocation des tokens)
+    path('logout/', logout, name='logout_account'),
+
     # Endpoint de register (rétrocompatibilité - DEPRECATED)
     path('register/', views.register_account, name='register_account'),
 
+    # Métriques d'authentification (admin)
+    path('auth-metrics/', views.auth_metrics, name='auth_metrics'),
+
     # Routes RESTful générées par le router
     # GET    /api/accounts/       -> list
     # POST   /api/accounts/       -> create
@@ -2,11 +2,28 @@ from rest_framework import status
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied
+from django.db import transaction
+from django.utils import timezone
 from .models import Account
-from .serializers import AccountRegistrationSerializer, AccountSerializer, AccountUpdateSerializer
+from .serializers import (
+    AccountRegistrationSerializer, AccountSerializer, AccountUpdateSerializer, AccountBulkStatusSerializer,
+)
+from .pagination import AccountCursorPagination
+from .filters import AccountFilter, FUZZY_GROUPS
+from common.filters import bulk_filter_errors
+from common.fuzzy import fuzzy_filter
+from .principals import invalidate_principals
+from .importer import AccountImporter, FORMATS, iter_rows
+from . import exporter
 from common.permissions import IsAdmin
+import io
+from .jwt_auth import token_cache, dispatch_stats
+from .hashing import hasher_pool
+from .throttling import login_throttle_stats
+from .revocation import revocation_list
 
 
 class AccountViewSet(ModelViewSet):
@@ -14,11 +31,14 @@ class AccountViewSet(ModelViewSet):
     ViewSet pour la gestion des comptes
 
     Endpoints:
-    - GET    /api/accounts/          - Liste tous les comptes
+    - GET    /api/accounts/          - Liste tous les comptes (paginée par curseur)
     - POST   /api/accounts/          - Créer un nouveau compte (public)
     - GET    /api/accounts/<id>/     - Récupérer un compte
     - PATCH  /api/accounts/<id>/     - Mettre à jour un compte
     - DELETE /api/accounts/<id>/     - Supprimer un compte (soft delete)
+    - GET    /api/accounts/export/   - Exporter les comptes en CSV/NDJSON (admin)
+    - POST   /api/accounts/bulk-deactivate/ - Désactiver des comptes en masse (admin)
+    - POST   /api/accounts/bulk-reactivate/ - Réactiver des comptes en masse (admin)
 
     Permissions:
     - Liste/Create: Authentifié (create aussi public via register)
@@ -27,6 +47,7 @@ class AccountViewSet(ModelViewSet):
 
     queryset = Account.objects.filter(is_active=True)
     permission_classes = [IsAuthenticated]
+    pagination_class = AccountCursorPagination
 
     def get_serializer_class(self):
         """Utiliser le bon serializer selon l'action"""
@@ -45,7 +66,7 @@ class AccountViewSet(ModelViewSet):
         """
         if self.action == 'create':
             return [AllowAny()]
-        return [IsAuthenticated()]
+        return super().get_permissions()
 
     def get_queryset(self):
         """
@@ -128,14 +149,147 @@ class AccountViewSet(ModelViewSet):
         }, status=status.HTTP_200_OK)
 
     def list(self, request, *args, **kwargs):
-        """Lister les comptes"""
+        """
+        Lister les comptes (pagination par curseur)
+
+        GET /api/accounts/?page_size=50&cursor=<next>&total=exact|estimate
+
+        Avec ?fuzzy=<nom>, retourne les comptes dont le nom est proche
+        (fautes de frappe, accents), triés par similarité, sans pagination.
+        """
         queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
+
+        text = request.query_params.get('fuzzy', '').strip()
+        if text:
+            accounts = fuzzy_filter(queryset, text, FUZZY_GROUPS, limit=self.paginator.get_page_size(request))
+            serializer = self.get_serializer(accounts, many=True)
+            return Response({"next": None, "accounts": serializer.data})
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=['post'], url_path='import', permission_classes=[IsAdmin],
+            parser_classes=[MultiPartParser, FormParser])
+    def bulk_import(self, request):
+        """
+        Importer des comptes en masse depuis un fichier CSV ou NDJSON (ADMIN)
+
+        POST /api/accounts/import/
+        Form-data:
+        - file: fichier (colonnes first_name, last_name, email, password,
+          phone et role optionnels)
+        - file_format: csv ou ndjson (déduit de l'extension par défaut)
+
+        Réponse: rapport {total, created, failed, errors: [{line, email, errors}], aborted}
+
+        Les lots déjà traités restent enregistrés si l'import s'arrête: le
+        rapport est retourné avec une 400 (fichier illisible) ou une 503 (pool
+        de hachage saturé), `aborted` indiquant la cause.
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"error": "Fichier requis"}, status=status.HTTP_400_BAD_REQUEST)
+
+        file_format = request.data.get('file_format')
+        if not file_format:
+            file_format = 'ndjson' if upload.name.endswith(('.ndjson', '.jsonl')) else 'csv'
+        if file_format not in FORMATS:
+            return Response({"error": "Format non supporté (csv ou ndjson)"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Seul un super admin peut importer des comptes admin
+        allowed_roles = None if request.user.role == 'superadmin' else ['candidate']
+
+        # Pas de pool de processus dans une requête: hachage sur le pool partagé
+        # (les gros fichiers passent par la commande import_accounts)
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+        report = AccountImporter(allowed_roles=allowed_roles, in_process=True).run(iter_rows(stream, file_format))
+        aborted = report['aborted']
+        if aborted is None:
+            return Response(report, status=status.HTTP_200_OK)
+        if aborted['reason'] == 'hashing_unavailable':
+            return Response(report, status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            headers={'Retry-After': '%d' % hasher_pool.queue_timeout})
+        return Response(report, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAdmin])
+    def export(self, request):
+        """
+        Exporter les comptes en flux CSV ou NDJSON (ADMIN)
+
+        GET /api/accounts/export/?file_format=csv|ndjson&role=candidate&is_active=true
+
+        Filtres: ceux de AccountFilter (comptes actifs par défaut). La réponse
+        est compressée en gzip si le client l'accepte.
+        """
+        file_format = request.query_params.get('file_format', 'csv')
+        if file_format not in exporter.FORMATS:
+            return Response({"error": "Format non supporté (csv ou ndjson)"}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = Account.objects.all()
+        if 'is_active' not in request.query_params:
+            queryset = queryset.filter(is_active=True)
+        filterset = AccountFilter(data=request.query_params, queryset=queryset)
+        if not filterset.is_valid():
+            return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        filename = f"accounts-{timezone.now():%Y%m%d}"
+        return exporter.export_response(request, filterset.qs, file_format, filename)
+
+    @action(detail=False, methods=['post'], url_path='bulk-deactivate', permission_classes=[IsAdmin])
+    def bulk_deactivate(self, request):
+        """
+        Désactiver des comptes en masse (ADMIN)
+
+        POST /api/accounts/bulk-deactivate/
+        Body: {"ids": [1, 2, 3]} ou {"filter": {"role": "candidate", "never_logged_in": true}}
+        """
+        return self._bulk_set_active(request, is_active=False)
+
+    @action(detail=False, methods=['post'], url_path='bulk-reactivate', permission_classes=[IsAdmin])
+    def bulk_reactivate(self, request):
+        """
+        Réactiver des comptes en masse (ADMIN)
+
+        POST /api/accounts/bulk-reactivate/
+        Body: {"ids": [1, 2, 3]} ou {"filter": {...}}
+        """
+        return self._bulk_set_active(request, is_active=True)
+
+    def _bulk_set_active(self, request, is_active):
+        """
+        Modifier is_active avec un seul UPDATE ensembliste
+
+        Seuls les comptes dont l'état change sont comptés; le compte de
+        l'admin connecté n'est jamais modifié. update() ne déclenche pas
+        post_save: le cache des principals est invalidé explicitement.
+        """
+        serializer = AccountBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        queryset = Account.objects.filter(is_active=not is_active).exclude(id=request.user.id)
+        if 'ids' in serializer.validated_data:
+            queryset = queryset.filter(id__in=serializer.validated_data['ids'])
+        else:
+            filterset = AccountFilter(data=serializer.validated_data['filter'], queryset=queryset)
+            errors = bulk_filter_errors(filterset)
+            if errors:
+                return Response({"filter": errors}, status=status.HTTP_400_BAD_REQUEST)
+            queryset = filterset.qs
+
+        with transaction.atomic():
+            # Verrouiller les lignes visées pour connaître les ids réellement modifiés
+            ids = list(queryset.select_for_update().values_list('id', flat=True))
+            count = Account.objects.filter(id__in=ids).update(
+                is_active=is_active,
+                updated_at=timezone.now(),
+            )
+            transaction.on_commit(lambda: invalidate_principals(ids))
 
         return Response({
-            "count": queryset.count(),
-            "accounts": serializer.data
-        })
+            "message": f"{count} compte(s) {'réactivé(s)' if is_active else 'désactivé(s)'}",
+            "count": count,
+        }, status=status.HTTP_200_OK)
 
     def _has_permission(self, user, account):
         """Vérifier si l'utilisateur a la permission d'accéder/modifier le compte"""
@@ -166,3 +320,20 @@ def register_account(request):
         }, status=status.HTTP_201_CREATED)
 
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def auth_metrics(request):
+    """
+    Métriques de la pile d'authentification (ADMIN)
+
+    GET /api/accounts/auth-metrics/
+    """
+    return Response({
+        "token_cache": token_cache.stats(),
+        "auth_dispatch": dispatch_stats.stats(),
+        "password_hashing": hasher_pool.stats(),
+        "login_throttle": login_throttle_stats(),
+        "revocation": revocation_list.stats(),
+    })
@@ -0,0 +1,172 @@
+"""
+Compteurs de candidatures maintenus de façon incrémentale
+
+Chaque création, suppression ou modification d'une candidature applique un
+delta (+1/-1) aux compteurs des dimensions concernées, dans la transaction
+de l'écriture. Quand une dimension change, l'ancien état est relu en base
+sous verrou de ligne (Application.lock_saved_values): deux écritures
+concurrentes depuis le même statut ne comptent pas deux fois le même delta. Le dashboard lit alors
+quelques lignes au lieu de parcourir toute la table.
+`manage.py rebuild_application_counters` recalcule les compteurs et détecte
+les écarts.
+"""
+
+from collections import Counter
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import Count, F
+from .models import Application, ApplicationCounter
+
+
+DIMENSIONS = Application.COUNTER_DIMENSIONS
+
+
+def counter_value(value):
+    """Valeur stockée dans le compteur ('' pour NULL, true/false pour un booléen)"""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return str(value).lower()
+    return str(value)
+
+
+def attname(dimension):
+    return Application._meta.get_field(dimension).attname
+
+
+def current_values(instance):
+    """Valeurs des dimensions chargées sur l'instance (les champs différés sont ignorés)"""
+    return {
+        dimension: counter_value(instance.__dict__[attname(dimension)])
+        for dimension in DIMENSIONS
+        if attname(dimension) in instance.__dict__
+    }
+
+
+def loaded_values(instance):
+    """Valeurs des dimensions telles que lues en base (vide pour une nouvelle instance)"""
+    loaded = getattr(instance, '_loaded_values', {})
+    return {
+        dimension: counter_value(loaded[attname(dimension)])
+        for dimension in DIMENSIONS
+        if attname(dimension) in loaded
+    }
+
+
+def record_save(instance, created, update_fields=None):
+    """
+    Appliquer les deltas d'une création ou d'une modification (limitée aux
+    champs de update_fields)
+    """
+    current = current_values(instance)
+    deltas = Counter()
+    if created:
+        for dimension, value in current.items():
+            deltas[(dimension, value)] += 1
+    else:
+        saved = instance.saved_attnames(update_fields)
+        previous = loaded_values(instance)
+        for dimension, old in previous.items():
+            if attname(dimension) not in saved:
+                continue
+            new = current.get(dimension, old)
+            if new != old:
+                deltas[(dimension, old)] -= 1
+                deltas[(dimension, new)] += 1
+
+    apply_deltas(deltas, using=instance._state.db)
+
+
+def record_delete(instance):
+    """Retirer une candidature supprimée des compteurs"""
+    values = {**current_values(instance), **loaded_values(instance)}
+    apply_deltas(Counter({(dimension, value): -1 for dimension, value in values.items()}), using=instance._state.db)
+
+
+def apply_deltas(deltas, using=None):
+    """
+    Appliquer des deltas {(dimension, valeur): n} avec UPDATE count = count + n
+
+    Les lignes sont traitées dans un ordre fixe pour éviter les interblocages
+    entre transactions concurrentes.
+    """
+    using = using or router.db_for_write(ApplicationCounter)
+    for (dimension, value), delta in sorted(deltas.items()):
+        if delta:
+            increment(ApplicationCounter, delta, using, dimension=dimension, value=value)
+
+
+def increment(model, delta, using, **key):
+    """
+    Ajouter delta au champ `count` de la ligne identifiée par key, en la
+    créant si besoin
+    """
+    rows = model.objects.using(using).filter(**key)
+    if rows.update(count=F('count') + delta):
+        return
+    try:
+        with transaction.atomic(using=using):
+            model.objects.using(using).create(count=delta, **key)
+    except IntegrityError:
+        # Ligne créée par une transaction concurrente
+        rows.update(count=F('count') + delta)
+
+
+def read_counters(dimensions=DIMENSIONS, using=None):
+    """Retourner {dimension: {valeur: nombre}} en une requête"""
+    counters = {dimension: {} for dimension in dimensions}
+    rows = ApplicationCounter.objects.using(using or router.db_for_read(ApplicationCounter)).filter(
+        dimension__in=dimensions
+    ).values_list('dimension', 'value', 'count')
+    for dimension, value, count in rows:
+        counters[dimension][value] = count
+    return counters
+
+
+def compute_counters(using=None):
+    """Recalculer les compteurs depuis la table des candidatures"""
+    applications = Application.objects.using(using or router.db_for_read(Application))
+    counters = {}
+    for dimension in DIMENSIONS:
+        name = attname(dimension)
+        counters[dimension] = {
+            counter_value(value): count
+            for value, count in applications.order_by().values_list(name).annotate(count=Count('id'))
+        }
+    return counters
+
+
+def diff_counters(stored, expected):
+    """Écarts [(dimension, valeur, stocké, attendu)], les compteurs à zéro étant ignorés"""
+    drift = []
+    for dimension in DIMENSIONS:
+        stored_values = stored.get(dimension, {})
+        expected_values = expected.get(dimension, {})
+        for value in sorted(set(stored_values) | set(expected_values)):
+            if stored_values.get(value, 0) != expected_values.get(value, 0):
+                drift.append((dimension, value, stored_values.get(value, 0), expected_values.get(value, 0)))
+    return drift
+
+
+def rebuild_counters(using=None):
+    """
+    Remplacer tous les compteurs par les valeurs recalculées
+
+    Sous PostgreSQL, la table des compteurs est verrouillée pendant le calcul:
+    les écritures concurrentes attendent la fin de la reconstruction et leurs
+    deltas s'appliquent ensuite sur des valeurs exactes.
+    """
+    using = using or router.db_for_write(ApplicationCounter)
+    connection = connections[using]
+    with transaction.atomic(using=using):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(f'LOCK TABLE {ApplicationCounter._meta.db_table} IN EXCLUSIVE MODE')
+        expected = compute_counters(using=using)
+        counters = ApplicationCounter.objects.using(using)
+        counters.all().delete()
+        counters.bulk_create([
+            ApplicationCounter(dimension=dimension, value=value, count=count)
+            for dimension, values in expected.items()
+            for value, count in values.items()
+        ])
+    return expected
@@ -1,5 +1,12 @@
 from django_filters import rest_framework as filters
+from rest_framework.filters import BaseFilterBackend
 from .models import Application
+from .search import search_queryset
+from common.fuzzy import fuzzy_filter
+
+
+# Champs de la recherche approximative (?fuzzy=): nom complet, email
+FUZZY_GROUPS = (('first_name', 'last_name'), ('email',))
 
 
 class ApplicationFilter(filters.FilterSet):
@@ -13,12 +20,19 @@ class ApplicationFilter(filters.FilterSet):
     # Filtre par email
     email = filters.CharFilter(field_name='email', lookup_expr='icontains')
 
+    # Recherche approximative (noms mal orthographiés), triée par similarité;
+    # appliquée après les autres filtres (voir filter_queryset)
+    fuzzy = filters.CharFilter(method='filter_fuzzy')
+
     # Filtre par type de contrat
     contract_type_sought = filters.ChoiceFilter(
         field_name='contract_type_sought',
         choices=Application.CONTRACT_TYPE_CHOICES
     )
 
+    # Filtre par offre (id)
+    job = filters.NumberFilter(field_name='job_id')
+
     # Filtre par poste (titre de l'offre)
     job_title = filters.CharFilter(field_name='job__title', lookup_expr='icontains')
 
@@ -41,6 +55,21 @@ class ApplicationFilter(filters.FilterSet):
         ]
     )
 
+    def filter_queryset(self, queryset):
+        """
+        Appliquer les filtres, la recherche approximative en dernier: elle ne
+        garde que les FUZZY_MAX_RESULTS meilleurs résultats, à choisir parmi
+        les candidatures retenues par les autres filtres
+        """
+        filters_last = sorted(self.form.cleaned_data.items(), key=lambda item: item[0] == 'fuzzy')
+        for name, value in filters_last:
+            queryset = self.filters[name].filter(queryset, value)
+        return queryset
+
+    def filter_fuzzy(self, queryset, name, value):
+        """Similarité trigramme avec le nom complet ou l'email (common.fuzzy)"""
+        return fuzzy_filter(queryset, value, FUZZY_GROUPS)
+
     def filter_application_status(self, queryset, name, value):
         """
         Filtre personnalisé pour les candidatures complétées/manquantes
@@ -60,7 +89,23 @@ class ApplicationFilter(filters.FilterSet):
             'last_name',
             'email',
             'contract_type_sought',
+            'job',
             'job_title',
             'is_spontaneous',
             'status',
         ]
+
+
+class ApplicationSearchFilter(BaseFilterBackend):
+    """
+    Recherche plein texte (?search=...) sur les noms, l'email, le niveau
+    d'études, les expériences et le titre de l'offre, triée par pertinence
+    (sauf si ?ordering= est fourni)
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '')
+        if not text.strip():
+            return queryset
+        return search_queryset(queryset, text)
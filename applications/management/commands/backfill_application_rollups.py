@@ -0,0 +1,38 @@
+"""
+Reconstruction des agrégats journaliers des candidatures
+
+Usage:
+    python manage.py backfill_application_rollups
+    python manage.py backfill_application_rollups --start 2026-01-01 --end 2026-01-31
+"""
+
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from applications.rollups import analytics_timezone, backfill
+
+
+def parse_date(value):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f"Date invalide: {value} (format AAAA-MM-JJ)")
+
+
+class Command(BaseCommand):
+    help = "Recalculer les agrégats journaliers des candidatures"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help="Premier jour à recalculer (AAAA-MM-JJ)")
+        parser.add_argument('--end', help="Dernier jour à recalculer (AAAA-MM-JJ)")
+
+    def handle(self, *args, **options):
+        start = parse_date(options['start']) if options['start'] else None
+        end = parse_date(options['end']) if options['end'] else None
+        if start and end and start > end:
+            raise CommandError("--start doit être antérieure à --end")
+
+        buckets, applications = backfill(start, end)
+        self.stdout.write(self.style.SUCCESS(
+            f"[OK] {buckets} agrégat(s) recalculé(s) pour {applications} candidature(s) "
+            f"(fuseau {analytics_timezone()})"
+        ))
@@ -0,0 +1,32 @@
+"""
+Reconstruction et vérification des compteurs de candidatures
+
+Usage:
+    python manage.py rebuild_application_counters
+    python manage.py rebuild_application_counters --check
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from applications.counters import compute_counters, diff_counters, read_counters, rebuild_counters
+
+
+class Command(BaseCommand):
+    help = "Recalculer les compteurs de candidatures (ou vérifier leurs écarts avec --check)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help="Vérifier les écarts sans modifier les compteurs")
+
+    def handle(self, *args, **options):
+        drift = diff_counters(read_counters(), compute_counters())
+
+        for dimension, value, stored, expected in drift:
+            self.stdout.write(f"{dimension}={value or '(vide)'}: {stored} stocké(s), {expected} attendu(s)")
+
+        if options['check']:
+            if drift:
+                raise CommandError(f"{len(drift)} compteur(s) en écart")
+            self.stdout.write(self.style.SUCCESS("[OK] Compteurs à jour"))
+            return
+
+        rebuild_counters()
+        self.stdout.write(self.style.SUCCESS(f"[OK] Compteurs reconstruits ({len(drift)} écart(s) corrigé(s))"))
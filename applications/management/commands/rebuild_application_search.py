@@ -0,0 +1,17 @@
+"""
+Reconstruction de l'index de recherche des candidatures
+
+Usage:
+    python manage.py rebuild_application_search
+"""
+
+from django.core.management.base import BaseCommand
+from applications.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Reconstruire l'index de recherche plein texte des candidatures"
+
+    def handle(self, *args, **options):
+        count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"[OK] {count} candidature(s) indexée(s)"))
@@ -0,0 +1,52 @@
+# Generated by Django 6.0 on 2026-10-18 13:30
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_counters(apps, schema_editor):
+    """Initialiser les compteurs à partir des candidatures existantes"""
+    Application = apps.get_model('applications', 'Application')
+    ApplicationCounter = apps.get_model('applications', 'ApplicationCounter')
+
+    def counter_value(value):
+        if value is None:
+            return ''
+        if isinstance(value, bool):
+            return str(value).lower()
+        return str(value)
+
+    counters = []
+    for dimension, field in (('status', 'status'), ('contract_type_sought', 'contract_type_sought'),
+                             ('is_spontaneous', 'is_spontaneous'), ('job', 'job_id')):
+        rows = Application.objects.order_by().values_list(field).annotate(count=Count('id'))
+        counters.extend(
+            ApplicationCounter(dimension=dimension, value=counter_value(value), count=count)
+            for value, count in rows
+        )
+    ApplicationCounter.objects.bulk_create(counters)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(max_length=50)),
+                ('value', models.CharField(max_length=50)),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Compteur de candidatures',
+                'verbose_name_plural': 'Compteurs de candidatures',
+                'constraints': [models.UniqueConstraint(fields=('dimension', 'value'), name='applications_counter_unique')],
+            },
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
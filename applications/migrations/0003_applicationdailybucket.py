@@ -0,0 +1,46 @@
+# Generated by Django 6.0 on 2026-10-18 13:55
+
+from zoneinfo import ZoneInfo
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def fill_buckets(apps, schema_editor):
+    """Initialiser les agrégats à partir des candidatures existantes"""
+    Application = apps.get_model('applications', 'Application')
+    ApplicationDailyBucket = apps.get_model('applications', 'ApplicationDailyBucket')
+
+    tz = ZoneInfo(getattr(settings, 'ANALYTICS_TIME_ZONE', settings.TIME_ZONE))
+    rows = Application.objects.order_by().annotate(
+        day=TruncDate('created_at', tzinfo=tz),
+    ).values('day', 'status', 'contract_type_sought').annotate(count=Count('id'))
+    ApplicationDailyBucket.objects.bulk_create([ApplicationDailyBucket(**row) for row in rows], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0002_applicationcounter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationDailyBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(choices=[('pending', 'En attente'), ('reviewed', 'Examinée'), ('accepted', 'Acceptée'), ('rejected', 'Rejetée')], max_length=20)),
+                ('contract_type_sought', models.CharField(choices=[('cdi', 'CDI'), ('cdd', 'CDD'), ('stage', 'Stage'), ('alternance', 'Alternance'), ('interim', 'Intérim'), ('freelance', 'Freelance'), ('temps_partiel', 'Temps partiel')], max_length=20)),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Agrégat journalier de candidatures',
+                'verbose_name_plural': 'Agrégats journaliers de candidatures',
+                'ordering': ['day'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'status', 'contract_type_sought'), name='applications_daily_bucket_unique')],
+            },
+        ),
+        migrations.RunPython(fill_buckets, migrations.RunPython.noop),
+    ]
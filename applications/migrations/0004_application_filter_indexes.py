@@ -0,0 +1,44 @@
+# Generated by Django 6.0 on 2026-10-18 14:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0003_applicationdailybucket'),
+        ('jobs', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['status', '-created_at'], name='app_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['candidate', '-created_at'], name='app_candidate_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'status', '-created_at'], name='app_job_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['contract_type_sought', '-created_at'], name='app_contract_created_idx'),
+        ),
+        # Index simples des clés étrangères, couverts par les index composites
+        migrations.AlterField(
+            model_name='application',
+            name='candidate',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='applications', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='application',
+            name='job',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='applications', to='jobs.joboffer'),
+        ),
+    ]
@@ -0,0 +1,110 @@
+# Generated by Django 6.0 on 2026-10-18 14:50
+
+from django.db import migrations
+import re
+import unicodedata
+
+
+# Copie figée de applications.search à la date de la migration: la
+# migration ne dépend pas du code courant
+FTS_TABLE = 'applications_search'
+
+
+def normalize(text):
+    """Minuscules, sans accents"""
+    text = unicodedata.normalize('NFKD', str(text))
+    return ''.join(char for char in text if not unicodedata.combining(char)).lower()
+
+
+def flatten(value):
+    """Textes contenus dans une valeur JSON (listes et dictionnaires imbriqués)"""
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from flatten(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from flatten(item)
+    elif value is not None and not isinstance(value, bool):
+        yield str(value)
+
+
+def build_document(first_name, last_name, email, education_level, experience, job_title):
+    """Document indexé (names, contact, content), textes normalisés"""
+    email = email or ''
+    return (
+        normalize(f"{first_name or ''} {last_name or ''}"),
+        normalize(' '.join([email, re.sub(r'\W+', ' ', email), job_title or ''])),
+        normalize(' '.join([education_level or '', *flatten(experience)])),
+    )
+
+
+def index_sql(vendor, table):
+    """Requête d'indexation d'une candidature (names, contact, content, id)"""
+    if vendor == 'postgresql':
+        return (
+            f"UPDATE {table} SET search_vector = "
+            "setweight(to_tsvector('simple', %s), 'A') || "
+            "setweight(to_tsvector('simple', %s), 'B') || "
+            "setweight(to_tsvector('simple', %s), 'C') "
+            "WHERE id = %s"
+        )
+    return f"INSERT INTO {FTS_TABLE} (names, contact, content, rowid) VALUES (%s, %s, %s, %s)"
+
+
+def create_search_index(apps, schema_editor):
+    """
+    Structures de l'index plein texte selon la base, puis indexation des
+    candidatures existantes
+    """
+    connection = schema_editor.connection
+    Application = apps.get_model('applications', 'Application')
+    table = connection.ops.quote_name(Application._meta.db_table)
+
+    if connection.vendor == 'postgresql':
+        schema_editor.execute(f"ALTER TABLE {table} ADD COLUMN search_vector tsvector")
+        schema_editor.execute(f"CREATE INDEX app_search_vector_idx ON {table} USING GIN (search_vector)")
+    elif connection.vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            "names, contact, content, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+    else:
+        return
+
+    sql = index_sql(connection.vendor, table)
+    rows = Application.objects.using(connection.alias).order_by().values_list(
+        'id', 'first_name', 'last_name', 'email', 'education_level', 'experience', 'job__title',
+    )
+    batch = []
+    with connection.cursor() as cursor:
+        for pk, *values in rows.iterator(chunk_size=1000):
+            batch.append((*build_document(*values), pk))
+            if len(batch) >= 1000:
+                cursor.executemany(sql, batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    Application = apps.get_model('applications', 'Application')
+    table = connection.ops.quote_name(Application._meta.db_table)
+
+    if connection.vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS app_search_vector_idx")
+        schema_editor.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
+    elif connection.vendor == 'sqlite':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0004_application_filter_indexes'),
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 16:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0006_application_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='version',
+            field=models.PositiveIntegerField(default=1, verbose_name='Version'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 6.0 on 2026-10-18 17:10
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0007_application_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewLease',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('claimed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('expires_at', models.DateTimeField()),
+                ('released_at', models.DateTimeField(blank=True, null=True)),
+                ('outcome', models.CharField(blank=True, choices=[('reviewed', 'Examinée'), ('accepted', 'Acceptée'), ('rejected', 'Rejetée'), ('released', 'Libérée'), ('expired', 'Expirée'), ('preempted', 'Traitée par un autre admin')], max_length=20)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_leases', to='applications.application')),
+                ('reviewer', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='review_leases', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Réservation de revue',
+                'verbose_name_plural': 'Réservations de revue',
+                'ordering': ['-claimed_at'],
+                'indexes': [models.Index(fields=['reviewer', '-claimed_at'], name='review_lease_reviewer_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('released_at__isnull', True)), fields=('application',), name='review_lease_open_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 17:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0008_reviewlease'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='application',
+            name='version',
+            field=models.PositiveIntegerField(db_default=1, default=1, verbose_name='Version'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 6.0 on 2026-10-18 17:55
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+from django.utils import timezone
+
+
+def close_duplicate_leases(apps, schema_editor):
+    """
+    Une seule réservation ouverte par admin: fermer les réservations
+    expirées, puis, pour chaque admin, toutes sauf la plus récente
+    """
+    ReviewLease = apps.get_model('applications', 'ReviewLease')
+    leases = ReviewLease.objects.using(schema_editor.connection.alias)
+    now = timezone.now()
+    leases.filter(released_at=None, expires_at__lte=now).update(released_at=F('expires_at'), outcome='expired')
+
+    kept = set()
+    duplicates = []
+    for pk, reviewer_id in leases.filter(released_at=None).order_by('reviewer_id', '-claimed_at', '-id').values_list(
+        'id', 'reviewer_id',
+    ):
+        if reviewer_id in kept:
+            duplicates.append(pk)
+        kept.add(reviewer_id)
+    if duplicates:
+        leases.filter(id__in=duplicates).update(released_at=now, outcome='released')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0009_application_version_db_default'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(close_duplicate_leases, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='reviewlease',
+            constraint=models.UniqueConstraint(condition=models.Q(('released_at__isnull', True)), fields=('reviewer',), name='review_lease_reviewer_open_unique'),
+        ),
+    ]
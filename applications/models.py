@@ -1,8 +1,13 @@
-from django.db import models
+from django.db import DatabaseError, models, router, transaction
 from django.conf import settings
+from django.utils import timezone
 from jobs.models import JobOffer
 
 
+class VersionConflict(DatabaseError):
+    """La candidature a été modifiée depuis sa lecture (version différente en base)"""
+
+
 class Application(models.Model):
     """
     Modèle pour les candidatures
@@ -32,8 +37,13 @@ class Application(models.Model):
     ]
 
     # Relation avec le candidat et l'offre
-    candidate = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="applications")
-    job = models.ForeignKey(JobOffer, on_delete=models.CASCADE, related_name="applications", null=True, blank=True)
+    # Index simples remplacés par les index composites de Meta.indexes
+    candidate = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="applications", db_index=False
+    )
+    job = models.ForeignKey(
+        JobOffer, on_delete=models.CASCADE, related_name="applications", null=True, blank=True, db_index=False
+    )
     is_spontaneous = models.BooleanField(default=False, verbose_name="Candidature spontanée")
 
     # Informations personnelles
@@ -56,8 +66,13 @@ class Application(models.Model):
     current_salary = models.BigIntegerField(null=True, blank=True, verbose_name="Salaire actuel (facultatif)")
     expected_salary = models.BigIntegerField(verbose_name="Prétention salariale")
 
+    # Dimensions suivies par les compteurs (applications.counters)
+    COUNTER_DIMENSIONS = ('status', 'contract_type_sought', 'is_spontaneous', 'job')
+
     # Statut et dates
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending", verbose_name="Statut")
+    # Incrémentée à chaque écriture (verrou optimiste: Application.save, applications.transitions)
+    version = models.PositiveIntegerField(default=1, db_default=1, verbose_name="Version")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Date de candidature")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Dernière modification")
 
@@ -65,7 +80,228 @@ class Application(models.Model):
         ordering = ['-created_at']
         verbose_name = "Candidature"
         verbose_name_plural = "Candidatures"
+        indexes = [
+            # Filtres de ApplicationFilter suivis du tri par défaut (-created_at)
+            models.Index(fields=['status', '-created_at'], name='app_status_created_idx'),
+            models.Index(fields=['candidate', '-created_at'], name='app_candidate_created_idx'),
+            models.Index(fields=['job', 'status', '-created_at'], name='app_job_status_created_idx'),
+            models.Index(fields=['contract_type_sought', '-created_at'], name='app_contract_created_idx'),
+        ]
 
     def __str__(self):
         job_title = self.job.title if self.job else "Candidature spontanée"
         return f"{self.first_name} {self.last_name} - {job_title}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Valeurs lues en base: compteurs et index de recherche sont mis à jour par différence
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def saved_attnames(self, update_fields=None):
+        """Colonnes (attname) écrites par une sauvegarde: toutes, ou celles de update_fields"""
+        fields = self._meta.concrete_fields
+        if update_fields is not None:
+            names = set(update_fields)
+            fields = [field for field in fields if field.name in names or field.attname in names]
+        return {field.attname for field in fields}
+
+    def remember_saved_values(self, update_fields=None):
+        """Mémoriser les valeurs enregistrées, base des différences de la prochaine écriture"""
+        loaded = getattr(self, '_loaded_values', {})
+        for attname in self.saved_attnames(update_fields):
+            if attname in self.__dict__:
+                loaded[attname] = self.__dict__[attname]
+        self._loaded_values = loaded
+
+    def changed_dimensions(self, update_fields=None):
+        """
+        Dimensions des compteurs réécrites par la sauvegarde: celles de
+        update_fields, sinon celles modifiées depuis la lecture
+        """
+        loaded = getattr(self, '_loaded_values', {})
+        saved = self.saved_attnames(update_fields)
+        attnames = [self._meta.get_field(name).attname for name in self.COUNTER_DIMENSIONS]
+        if update_fields is not None:
+            return [attname for attname in attnames if attname in saved]
+        return [
+            attname for attname in attnames
+            if attname in loaded and attname in self.__dict__ and self.__dict__[attname] != loaded[attname]
+        ]
+
+    def lock_saved_values(self, using):
+        """
+        Verrouiller la ligne (SELECT ... FOR UPDATE) et relire les valeurs
+        enregistrées: les différences appliquées aux compteurs, agrégats et
+        index partent de l'état en base et non de celui lu par l'instance,
+        qu'une écriture concurrente a pu modifier depuis
+        """
+        loaded = getattr(self, '_loaded_values', None)
+        if not loaded or self._state.adding or self.pk is None:
+            return
+        row = type(self)._base_manager.using(using).select_for_update().filter(
+            pk=self.pk,
+        ).values(*loaded).first()
+        if row is not None:
+            loaded.update(row)
+
+    def save(self, *args, **kwargs):
+        """
+        Enregistrer la candidature et ses données dérivées (post_save) dans la même transaction
+
+        Une modification incrémente la version dans son propre UPDATE, limité
+        à la version lue: VersionConflict si la candidature a changé depuis.
+        La ligne n'est verrouillée et relue que si une dimension des
+        compteurs est réécrite: les autres modifications n'ont pas de delta
+        à appliquer.
+        """
+        using = kwargs.get('using') or router.db_for_write(Application, instance=self)
+        update_fields = kwargs.get('update_fields')
+        with transaction.atomic(using=using):
+            version = None if self._state.adding or self.pk is None else self.saved_version(using)
+            if version is not None and update_fields is not None:
+                kwargs['update_fields'] = update_fields = {*update_fields, 'version'}
+            if self.changed_dimensions(update_fields):
+                self.lock_saved_values(using)
+                locked_version = getattr(self, '_loaded_values', {}).get('version')
+                if None not in (version, locked_version) and locked_version != version:
+                    raise VersionConflict()
+
+            previous_version = self.version
+            if version is not None:
+                self.version = version + 1
+            self._saving_version = version
+            try:
+                super().save(*args, **kwargs)
+            except Exception:
+                self.version = previous_version
+                raise
+            finally:
+                self._saving_version = None
+
+    def saved_version(self, using):
+        """Version lue avec l'instance (relue en base si l'instance n'a pas été lue)"""
+        loaded = getattr(self, '_loaded_values', {})
+        if 'version' in loaded:
+            return loaded['version']
+        return type(self)._base_manager.using(using).filter(pk=self.pk).values_list('version', flat=True).first()
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update, *args, **kwargs):
+        # UPDATE ... WHERE id = %s AND version = <version lue>
+        version = getattr(self, '_saving_version', None)
+        if version is None:
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update, *args, **kwargs)
+        updated = super()._do_update(
+            base_qs.filter(version=version), using, pk_val, values, update_fields, forced_update, *args, **kwargs
+        )
+        if not updated:
+            raise VersionConflict()
+        return updated
+
+    def delete(self, *args, **kwargs):
+        """Supprimer la candidature et la retirer des données dérivées (post_delete) dans la même transaction"""
+        using = kwargs.get('using') or router.db_for_write(Application, instance=self)
+        with transaction.atomic(using=using):
+            self.lock_saved_values(using)
+            return super().delete(*args, **kwargs)
+
+
+class ApplicationCounter(models.Model):
+    """
+    Nombre de candidatures par valeur d'une dimension (status,
+    contract_type_sought, is_spontaneous, job), maintenu à chaque écriture
+    """
+
+    dimension = models.CharField(max_length=50)
+    value = models.CharField(max_length=50)
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Compteur de candidatures"
+        verbose_name_plural = "Compteurs de candidatures"
+        constraints = [
+            models.UniqueConstraint(fields=['dimension', 'value'], name='applications_counter_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.dimension}={self.value}: {self.count}"
+
+
+class ApplicationDailyBucket(models.Model):
+    """
+    Nombre de candidatures par jour (fuseau ANALYTICS_TIME_ZONE), statut et
+    type de contrat, maintenu à chaque écriture (applications.rollups)
+    """
+
+    day = models.DateField()
+    status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    contract_type_sought = models.CharField(max_length=20, choices=Application.CONTRACT_TYPE_CHOICES)
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        ordering = ['day']
+        verbose_name = "Agrégat journalier de candidatures"
+        verbose_name_plural = "Agrégats journaliers de candidatures"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'status', 'contract_type_sought'],
+                name='applications_daily_bucket_unique',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.status}/{self.contract_type_sought}: {self.count}"
+
+
+class ReviewLease(models.Model):
+    """
+    Réservation d'une candidature en attente par un admin (file de revue,
+    applications.review_queue), valable jusqu'à expires_at
+
+    Une seule réservation ouverte (released_at NULL) par candidature et par
+    admin.
+    """
+
+    OUTCOME_CHOICES = [
+        ("reviewed", "Examinée"),
+        ("accepted", "Acceptée"),
+        ("rejected", "Rejetée"),
+        ("released", "Libérée"),
+        ("expired", "Expirée"),
+        ("preempted", "Traitée par un autre admin"),
+    ]
+
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name="review_leases")
+    # Index simple remplacé par l'index composite de Meta.indexes
+    reviewer = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="review_leases", db_index=False
+    )
+    claimed_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField()
+    released_at = models.DateTimeField(null=True, blank=True)
+    outcome = models.CharField(max_length=20, choices=OUTCOME_CHOICES, blank=True)
+
+    class Meta:
+        ordering = ['-claimed_at']
+        verbose_name = "Réservation de revue"
+        verbose_name_plural = "Réservations de revue"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['application'],
+                condition=models.Q(released_at__isnull=True),
+                name='review_lease_open_unique',
+            ),
+            models.UniqueConstraint(
+                fields=['reviewer'],
+                condition=models.Q(released_at__isnull=True),
+                name='review_lease_reviewer_open_unique',
+            ),
+        ]
+        indexes = [
+            # Réservation en cours d'un admin et statistiques par admin
+            models.Index(fields=['reviewer', '-claimed_at'], name='review_lease_reviewer_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.application_id} -> {self.reviewer_id} ({self.outcome or 'en cours'})"
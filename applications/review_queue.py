@@ -0,0 +1,204 @@
+"""
+File de revue des candidatures en attente
+
+Chaque admin demande la candidature suivante et obtient une réservation
+(ReviewLease) sur la plus ancienne candidature en attente non réservée,
+valable REVIEW_LEASE_SECONDS. Plusieurs admins travaillent ainsi en
+parallèle sans traiter la même candidature.
+
+Moteurs:
+- PostgreSQL (et bases gérant SKIP LOCKED): SELECT ... FOR UPDATE SKIP
+  LOCKED, une candidature en cours de réservation par un autre admin est
+  ignorée sans attente
+- SQLite: sans verrou de ligne; la réservation est insérée directement et,
+  si une réservation ouverte existe déjà (contrainte unique
+  review_lease_open_unique) ou si la base est verrouillée par l'écriture
+  d'un autre admin, la demande est rejouée
+
+Un admin a au plus une réservation ouverte (contrainte unique
+review_lease_reviewer_open_unique): une demande simultanée du même admin
+échoue à l'insertion et, rejouée, retourne la réservation obtenue.
+
+Une réservation se termine par une transition de statut (review, accept,
+reject), une libération explicite ou son expiration (constatée à la
+réservation suivante de la candidature).
+"""
+
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, OperationalError, connections, router, transaction
+from django.db.models import Case, Count, DurationField, ExpressionWrapper, F, Q, Sum, Value, When
+from django.utils import timezone
+from .models import Application, ReviewLease
+import time
+
+
+# Tentatives de réservation par demande (réservations concurrentes)
+MAX_ATTEMPTS = 10
+
+# Issues d'une réservation terminée par une transition de statut
+COMPLETED_OUTCOMES = ('reviewed', 'accepted', 'rejected')
+
+
+def lease_duration():
+    return timedelta(seconds=getattr(settings, 'REVIEW_LEASE_SECONDS', 900))
+
+
+def open_leases(using, now):
+    """Réservations en cours (ouvertes et non expirées)"""
+    return ReviewLease.objects.using(using).filter(released_at=None, expires_at__gt=now)
+
+
+def next_to_review(reviewer, using=None):
+    """
+    Réserver pour `reviewer` la plus ancienne candidature en attente non
+    réservée; retourne la réservation (ReviewLease), ou None si la file est vide
+
+    Si l'admin a déjà une réservation en cours, elle est retournée. Un admin
+    n'a qu'une réservation ouverte (contrainte review_lease_reviewer_open_unique):
+    deux demandes simultanées du même admin obtiennent la même réservation.
+    """
+    using = using or router.db_for_write(ReviewLease)
+    connection = connections[using]
+    skip_locked = connection.features.has_select_for_update_skip_locked
+
+    for attempt in range(MAX_ATTEMPTS):
+        now = timezone.now()
+        try:
+            with transaction.atomic(using=using):
+                # Écriture en tête de transaction: sous SQLite, elle attend le
+                # verrou d'écriture (timeout) au lieu d'échouer aussitôt
+                close_stale_leases(reviewer, using, now)
+                current = open_leases(using, now).filter(reviewer=reviewer).select_related('application').first()
+                if current is not None:
+                    return current
+
+                candidates = Application.objects.using(using).filter(status='pending').exclude(
+                    id__in=open_leases(using, now).values('application_id'),
+                ).order_by('created_at', 'id')
+                if skip_locked:
+                    # Candidatures verrouillées par une réservation concurrente ignorées
+                    candidates = candidates.select_for_update(skip_locked=True)
+                application = candidates.first()
+                if application is None:
+                    return None
+                return claim(application, reviewer, using, now)
+        except IntegrityError:
+            # Candidature réservée entretemps par un autre admin (la requête
+            # suivante l'exclut), ou réservation obtenue par une demande
+            # simultanée du même admin (la requête suivante la retourne)
+            continue
+        except OperationalError:
+            # SQLite: base verrouillée par une écriture concurrente
+            if skip_locked or attempt == MAX_ATTEMPTS - 1:
+                raise
+            time.sleep(0.01 * (attempt + 1))
+    return None
+
+
+def close_stale_leases(reviewer, using, now):
+    """
+    Fermer les réservations ouvertes de `reviewer` qui ne sont plus en cours
+    (expirées, ou candidature traitée hors de la file), avant qu'il en
+    obtienne une nouvelle
+    """
+    expired = Q(expires_at__lte=now)
+    ReviewLease.objects.using(using).filter(
+        expired | ~Q(application__status='pending'), reviewer=reviewer, released_at=None,
+    ).update(
+        released_at=Case(When(expired, then=F('expires_at')), default=Value(now)),
+        outcome=Case(When(expired, then=Value('expired')), default=Value('released')),
+    )
+
+
+def claim(application, reviewer, using, now):
+    """Fermer la réservation expirée éventuelle puis réserver la candidature"""
+    ReviewLease.objects.using(using).filter(
+        application=application, released_at=None, expires_at__lte=now,
+    ).update(released_at=F('expires_at'), outcome='expired')
+    return ReviewLease.objects.using(using).create(
+        application=application,
+        reviewer=reviewer,
+        claimed_at=now,
+        expires_at=now + lease_duration(),
+    )
+
+
+def release(application_id, reviewer, using=None):
+    """Libérer la réservation en cours de `reviewer`; retourne False s'il n'en a pas"""
+    using = using or router.db_for_write(ReviewLease)
+    return bool(ReviewLease.objects.using(using).filter(
+        application_id=application_id, reviewer=reviewer, released_at=None,
+    ).update(released_at=timezone.now(), outcome='released'))
+
+
+def close_leases(application_ids, outcome, reviewer=None, using=None):
+    """
+    Fermer les réservations ouvertes de candidatures dont le statut a changé
+
+    L'issue est `outcome` pour les réservations de `reviewer`, 'preempted'
+    pour celles d'un autre admin.
+    """
+    using = using or router.db_for_write(ReviewLease)
+    reviewer_id = getattr(reviewer, 'pk', None)
+    ReviewLease.objects.using(using).filter(
+        application_id__in=application_ids, released_at=None,
+    ).update(
+        released_at=timezone.now(),
+        outcome=Case(When(reviewer_id=reviewer_id, then=Value(outcome)), default=Value('preempted')),
+    )
+
+
+def queue_stats(since=None, until=None, using=None):
+    """
+    État de la file et débit par admin sur la période [since, until[
+    (réservations obtenues dans la période)
+
+    Pour chaque admin: réservations obtenues, terminées par une transition,
+    libérées, expirées et reprises par un autre admin, durée moyenne de
+    traitement et nombre de candidatures traitées par heure de réservation.
+    """
+    using = using or router.db_for_read(ReviewLease)
+    now = timezone.now()
+
+    pending = Application.objects.using(using).filter(status='pending').count()
+    leased = open_leases(using, now).filter(application__status='pending').count()
+
+    leases = ReviewLease.objects.using(using)
+    if since is not None:
+        leases = leases.filter(claimed_at__gte=since)
+    if until is not None:
+        leases = leases.filter(claimed_at__lt=until)
+
+    completed = Q(outcome__in=COMPLETED_OUTCOMES)
+    duration = ExpressionWrapper(F('released_at') - F('claimed_at'), output_field=DurationField())
+    rows = leases.order_by().values(
+        'reviewer_id', 'reviewer__first_name', 'reviewer__last_name',
+    ).annotate(
+        claimed=Count('id'),
+        completed=Count('id', filter=completed),
+        released=Count('id', filter=Q(outcome='released')),
+        expired=Count('id', filter=Q(outcome='expired') | Q(released_at=None, expires_at__lte=now)),
+        preempted=Count('id', filter=Q(outcome='preempted')),
+        completed_time=Sum(duration, filter=completed),
+    ).order_by('-completed', 'reviewer_id')
+
+    reviewers = []
+    for row in rows:
+        seconds = row['completed_time'].total_seconds() if row['completed_time'] else 0
+        reviewers.append({
+            "reviewer": row['reviewer_id'],
+            "reviewer_name": f"{row['reviewer__first_name']} {row['reviewer__last_name']}",
+            "claimed": row['claimed'],
+            "completed": row['completed'],
+            "released": row['released'],
+            "expired": row['expired'],
+            "preempted": row['preempted'],
+            "avg_review_seconds": round(seconds / row['completed'], 1) if row['completed'] else None,
+            "completed_per_hour": round(row['completed'] * 3600 / seconds, 1) if seconds else None,
+        })
+
+    return {
+        "queue": {"pending": pending, "leased": leased, "available": pending - leased},
+        "reviewers": reviewers,
+    }
@@ -0,0 +1,194 @@
+"""
+Agrégats journaliers des candidatures (rollups)
+
+Chaque candidature compte dans un agrégat (jour, statut, type de contrat), le
+jour étant celui de sa création dans le fuseau ANALYTICS_TIME_ZONE. Les
+agrégats sont maintenus à chaque écriture comme les compteurs
+(`applications.counters`), peuvent être reconstruits avec
+`manage.py backfill_application_rollups`, et sont regroupés par semaine ou
+par mois au moment de la requête.
+"""
+
+from collections import Counter
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate, TruncMonth, TruncWeek
+from django.utils import timezone
+from .counters import increment
+from .models import Application, ApplicationDailyBucket
+
+
+INTERVALS = ('day', 'week', 'month')
+
+# Dimensions des agrégats (filtres et ventilations possibles)
+DIMENSIONS = {
+    'status': [value for value, _ in Application.STATUS_CHOICES],
+    'contract_type_sought': [value for value, _ in Application.CONTRACT_TYPE_CHOICES],
+}
+
+# Nombre de périodes renvoyées par défaut
+DEFAULT_PERIODS = {'day': 30, 'week': 12, 'month': 12}
+
+
+def analytics_timezone():
+    return ZoneInfo(getattr(settings, 'ANALYTICS_TIME_ZONE', settings.TIME_ZONE))
+
+
+def bucket_day(created_at):
+    """Jour de l'agrégat d'une date de création"""
+    return timezone.localtime(created_at, analytics_timezone()).date()
+
+
+def day_start(day):
+    """Début du jour dans le fuseau des statistiques"""
+    return datetime.combine(day, time.min, tzinfo=analytics_timezone())
+
+
+def record_save(instance, created, update_fields=None):
+    """
+    Appliquer les deltas d'une création ou d'un changement de statut/type de
+    contrat (limité aux champs de update_fields)
+    """
+    deltas = Counter()
+    day = bucket_day(instance.created_at)
+    current = {name: instance.__dict__[name] for name in DIMENSIONS if name in instance.__dict__}
+
+    if created:
+        deltas[(day, current['status'], current['contract_type_sought'])] += 1
+    else:
+        loaded = getattr(instance, '_loaded_values', {})
+        saved = instance.saved_attnames(update_fields)
+        old = {name: loaded[name] if name in loaded else getattr(instance, name) for name in DIMENSIONS}
+        new = {name: current.get(name, old[name]) if name in saved else old[name] for name in DIMENSIONS}
+        if new == old:
+            return
+        deltas[(day, old['status'], old['contract_type_sought'])] -= 1
+        deltas[(day, new['status'], new['contract_type_sought'])] += 1
+
+    apply_deltas(deltas, using=instance._state.db)
+
+
+def record_delete(instance):
+    """Retirer une candidature supprimée de son agrégat"""
+    loaded = getattr(instance, '_loaded_values', {})
+    values = {name: loaded.get(name, getattr(instance, name)) for name in DIMENSIONS}
+    apply_deltas(
+        Counter({(bucket_day(instance.created_at), values['status'], values['contract_type_sought']): -1}),
+        using=instance._state.db,
+    )
+
+
+def apply_deltas(deltas, using=None):
+    """Appliquer des deltas {(jour, statut, type de contrat): n}, dans un ordre fixe"""
+    using = using or router.db_for_write(ApplicationDailyBucket)
+    for (day, status, contract_type_sought), delta in sorted(deltas.items()):
+        if delta:
+            increment(
+                ApplicationDailyBucket, delta, using,
+                day=day, status=status, contract_type_sought=contract_type_sought,
+            )
+
+
+def backfill(start=None, end=None, using=None):
+    """
+    Recalculer les agrégats des jours [start, end] (toute la période par
+    défaut) depuis la table des candidatures
+
+    Retourne (nombre d'agrégats, nombre de candidatures).
+    """
+    using = using or router.db_for_write(ApplicationDailyBucket)
+    connection = connections[using]
+    applications = Application.objects.using(using)
+    buckets = ApplicationDailyBucket.objects.using(using)
+    if start is not None:
+        applications = applications.filter(created_at__gte=day_start(start))
+        buckets = buckets.filter(day__gte=start)
+    if end is not None:
+        applications = applications.filter(created_at__lt=day_start(end + timedelta(days=1)))
+        buckets = buckets.filter(day__lte=end)
+
+    with transaction.atomic(using=using):
+        if connection.vendor == 'postgresql':
+            # Les écritures concurrentes attendent la fin du recalcul
+            with connection.cursor() as cursor:
+                cursor.execute(f'LOCK TABLE {ApplicationDailyBucket._meta.db_table} IN EXCLUSIVE MODE')
+        rows = applications.order_by().annotate(
+            day=TruncDate('created_at', tzinfo=analytics_timezone()),
+        ).values('day', 'status', 'contract_type_sought').annotate(count=Count('id'))
+        rebuilt = [ApplicationDailyBucket(**row) for row in rows]
+        buckets.delete()
+        ApplicationDailyBucket.objects.using(using).bulk_create(rebuilt, batch_size=1000)
+
+    return len(rebuilt), sum(bucket.count for bucket in rebuilt)
+
+
+def period_start(day, interval):
+    """Premier jour de la période (semaine ISO commençant le lundi)"""
+    if interval == 'week':
+        return day - timedelta(days=day.weekday())
+    if interval == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def next_period(day, interval):
+    if interval == 'week':
+        return day + timedelta(days=7)
+    if interval == 'month':
+        return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return day + timedelta(days=1)
+
+
+def iter_periods(start, end, interval):
+    period = period_start(start, interval)
+    while period <= end:
+        yield period
+        period = next_period(period, interval)
+
+
+def default_range(interval, end=None):
+    """(début, fin) par défaut: les DEFAULT_PERIODS dernières périodes jusqu'à aujourd'hui"""
+    end = end or timezone.localtime(timezone.now(), analytics_timezone()).date()
+    start = period_start(end, interval)
+    for _ in range(DEFAULT_PERIODS[interval] - 1):
+        start = period_start(start - timedelta(days=1), interval)
+    return start, end
+
+
+def timeseries(start, end, interval='day', filters=None, breakdown=None):
+    """
+    Série dense (périodes sans candidature à zéro) du nombre de candidatures
+    par période, éventuellement ventilée par statut ou type de contrat
+
+    Une seule requête sur les agrégats journaliers.
+    """
+    start = period_start(start, interval)
+    buckets = ApplicationDailyBucket.objects.filter(day__gte=start, day__lte=end, **(filters or {}))
+
+    if interval == 'week':
+        period = TruncWeek('day')
+    elif interval == 'month':
+        period = TruncMonth('day')
+    else:
+        period = F('day')
+
+    group = ['period'] + ([breakdown] if breakdown else [])
+    rows = buckets.order_by().annotate(period=period).values(*group).annotate(total=Sum('count'))
+
+    series = {}
+    for period in iter_periods(start, end, interval):
+        point = {'period': period.isoformat(), 'count': 0}
+        if breakdown:
+            point[breakdown] = {value: 0 for value in DIMENSIONS[breakdown]}
+        series[period] = point
+
+    for row in rows:
+        point = series[row['period']]
+        point['count'] += row['total']
+        if breakdown:
+            point[breakdown][row[breakdown]] = row['total']
+
+    return list(series.values())
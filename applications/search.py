@@ -0,0 +1,279 @@
+"""
+Recherche plein texte dans les candidatures
+
+Chaque candidature est indexée sous forme de trois colonnes pondérées:
+- names (poids fort): prénom et nom
+- contact: email et titre de l'offre
+- content (poids faible): niveau d'études et expériences
+
+Le texte est normalisé côté Python (minuscules, sans accents): "eloise"
+trouve "Éloïse". Chaque mot recherché est un préfixe ("dup" trouve
+"Dupont") et tous les mots doivent être présents.
+
+Moteurs:
+- PostgreSQL: colonne `search_vector` (tsvector) avec index GIN, triée par
+  ts_rank
+- SQLite: table virtuelle FTS5 `applications_search`, triée par bm25
+- autres bases: icontains, sans classement
+
+L'index est mis à jour par les signaux de `applications.signals`, dans la
+transaction de l'écriture. `manage.py rebuild_application_search` le
+reconstruit entièrement.
+"""
+
+from django.db import connections, router, transaction
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+import re
+import unicodedata
+from jobs.models import JobOffer
+from .models import Application
+
+
+# Colonnes de l'index et poids relatifs
+COLUMNS = ('names', 'contact', 'content')
+POSTGRES_WEIGHTS = {'names': 'A', 'contact': 'B', 'content': 'C'}
+BM25_WEIGHTS = {'names': 10.0, 'contact': 4.0, 'content': 1.0}
+
+# Champs de Application dont dépend le document indexé
+INDEXED_FIELDS = ('first_name', 'last_name', 'email', 'education_level', 'experience', 'job_id')
+
+# Table FTS5 (SQLite)
+FTS_TABLE = 'applications_search'
+
+# Nombre maximal de mots pris en compte dans une recherche
+MAX_TERMS = 10
+
+
+def normalize(text):
+    """Minuscules, sans accents"""
+    text = unicodedata.normalize('NFKD', str(text))
+    return ''.join(char for char in text if not unicodedata.combining(char)).lower()
+
+
+def flatten(value):
+    """Textes contenus dans une valeur JSON (listes et dictionnaires imbriqués)"""
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from flatten(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from flatten(item)
+    elif value is not None and not isinstance(value, bool):
+        yield str(value)
+
+
+def build_document(first_name, last_name, email, education_level, experience, job_title):
+    """Retourner le document indexé {colonne: texte normalisé}"""
+    email = email or ''
+    return {
+        # L'email est aussi découpé ("jean.dupont@..." -> "jean dupont ...")
+        'names': normalize(f"{first_name or ''} {last_name or ''}"),
+        'contact': normalize(' '.join([email, re.sub(r'\W+', ' ', email), job_title or ''])),
+        'content': normalize(' '.join([education_level or '', *flatten(experience)])),
+    }
+
+
+def parse_terms(text):
+    """Mots d'une recherche (lettres, chiffres), normalisés"""
+    return re.findall(r'\w+', normalize(text))[:MAX_TERMS]
+
+
+class PostgresSearchBackend:
+    """tsvector pondéré (configuration 'simple', sans racinisation) et index GIN"""
+
+    update_sql = (
+        "UPDATE {table} SET search_vector = "
+        "setweight(to_tsvector('simple', %s), 'A') || "
+        "setweight(to_tsvector('simple', %s), 'B') || "
+        "setweight(to_tsvector('simple', %s), 'C') "
+        "WHERE id = %s"
+    )
+
+    def __init__(self, connection, table):
+        self.connection = connection
+        self.table = connection.ops.quote_name(table)
+
+    def index(self, documents):
+        with self.connection.cursor() as cursor:
+            cursor.executemany(self.update_sql.format(table=self.table), [
+                (document['names'], document['contact'], document['content'], pk)
+                for pk, document in documents
+            ])
+
+    def remove(self, ids):
+        # Le vecteur est stocké sur la ligne de la candidature
+        pass
+
+    def clear(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"UPDATE {self.table} SET search_vector = NULL")
+
+    def search(self, queryset, terms, columns, rank):
+        weights = ''.join(POSTGRES_WEIGHTS[column] for column in columns)
+        query = ' & '.join(f"{term}:*{weights}" for term in terms)
+        vector = f"{self.table}.search_vector"
+        queryset = queryset.filter(RawSQL(
+            f"{vector} @@ to_tsquery('simple', %s)", [query], output_field=BooleanField(),
+        ))
+        if rank:
+            queryset = queryset.annotate(search_rank=RawSQL(
+                f"ts_rank({vector}, to_tsquery('simple', %s))", [query], output_field=FloatField(),
+            )).order_by('-search_rank', '-created_at')
+        return queryset
+
+
+class SQLiteSearchBackend:
+    """Table virtuelle FTS5 (rowid = id de la candidature)"""
+
+    def __init__(self, connection, table):
+        self.connection = connection
+        self.table = connection.ops.quote_name(table)
+
+    def index(self, documents):
+        documents = list(documents)
+        with self.connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(pk,) for pk, _ in documents])
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, names, contact, content) VALUES (%s, %s, %s, %s)",
+                [(pk, document['names'], document['contact'], document['content']) for pk, document in documents],
+            )
+
+    def remove(self, ids):
+        with self.connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(pk,) for pk in ids])
+
+    def clear(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+
+    def search(self, queryset, terms, columns, rank):
+        scope = f"{{{' '.join(columns)}}} : " if set(columns) != set(COLUMNS) else ''
+        query = ' AND '.join(f'{scope}"{term}"*' for term in terms)
+        queryset = queryset.filter(RawSQL(
+            f"{self.table}.id IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s)",
+            [query], output_field=BooleanField(),
+        ))
+        if rank:
+            weights = ', '.join(str(BM25_WEIGHTS[column]) for column in COLUMNS)
+            # bm25: plus petit = plus pertinent
+            queryset = queryset.annotate(search_rank=RawSQL(
+                f"(SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s AND rowid = {self.table}.id)",
+                [query], output_field=FloatField(),
+            )).order_by('-search_rank', '-created_at')
+        return queryset
+
+
+class FallbackSearchBackend:
+    """Bases sans moteur plein texte: icontains sur les champs, sans index"""
+
+    lookups = {
+        'names': ['first_name', 'last_name'],
+        'contact': ['email', 'job__title'],
+        'content': ['education_level', 'experience'],
+    }
+
+    def __init__(self, connection, table):
+        pass
+
+    def index(self, documents):
+        pass
+
+    def remove(self, ids):
+        pass
+
+    def clear(self):
+        pass
+
+    def search(self, queryset, terms, columns, rank):
+        for term in terms:
+            condition = Q()
+            for column in columns:
+                for lookup in self.lookups[column]:
+                    condition |= Q(**{f'{lookup}__icontains': term})
+            queryset = queryset.filter(condition)
+        return queryset
+
+
+BACKENDS = {
+    'postgresql': PostgresSearchBackend,
+    'sqlite': SQLiteSearchBackend,
+}
+
+
+def get_backend(using=None):
+    connection = connections[using or router.db_for_write(Application)]
+    backend_class = BACKENDS.get(connection.vendor, FallbackSearchBackend)
+    return backend_class(connection, Application._meta.db_table)
+
+
+def search_queryset(queryset, text, columns=COLUMNS, rank=True):
+    """
+    Filtrer les candidatures contenant tous les mots de `text` (préfixes)
+    dans les colonnes données, triées par pertinence si rank=True
+    """
+    terms = parse_terms(text)
+    if not terms:
+        return queryset
+    return get_backend(queryset.db).search(queryset, terms, columns, rank)
+
+
+def application_document(application):
+    """Document indexé d'une candidature"""
+    if application.job_id is None:
+        job_title = None
+    elif Application.job.is_cached(application):
+        job_title = application.job.title
+    else:
+        job_title = JobOffer.objects.filter(id=application.job_id).values_list('title', flat=True).first()
+    return build_document(
+        application.first_name, application.last_name, application.email,
+        application.education_level, application.experience, job_title,
+    )
+
+
+def record_save(instance, created, update_fields=None):
+    """Réindexer une candidature créée ou dont un champ indexé a changé (parmi update_fields)"""
+    if not created:
+        loaded = getattr(instance, '_loaded_values', {})
+        saved = instance.saved_attnames(update_fields)
+        changed = [
+            name for name in INDEXED_FIELDS
+            if name in saved and name in loaded and name in instance.__dict__
+            and instance.__dict__[name] != loaded[name]
+        ]
+        if not changed:
+            return
+    get_backend(instance._state.db).index([(instance.pk, application_document(instance))])
+
+
+def record_delete(instance):
+    get_backend(instance._state.db).remove([instance.pk])
+
+
+def index_applications(queryset, batch_size=1000):
+    """Indexer les candidatures d'un QuerySet, par lots; retourne leur nombre"""
+    backend = get_backend(queryset.db)
+    rows = queryset.order_by().values_list(
+        'id', 'first_name', 'last_name', 'email', 'education_level', 'experience', 'job__title',
+    )
+    batch, total = [], 0
+    for pk, *values in rows.iterator(chunk_size=batch_size):
+        batch.append((pk, build_document(*values)))
+        if len(batch) >= batch_size:
+            backend.index(batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        backend.index(batch)
+        total += len(batch)
+    return total
+
+
+def rebuild_index(using=None):
+    """Vider puis reconstruire l'index de recherche"""
+    using = using or router.db_for_write(Application)
+    with transaction.atomic(using=using):
+        get_backend(using).clear()
+        return index_applications(Application.objects.using(using))
@@ -1,5 +1,9 @@
 from rest_framework import serializers
+import itertools
 from .models import Application
+from .stats import BREAKDOWNS
+from .transitions import ALLOWED_SOURCES
+from . import rollups
 
 
 class ApplicationSerializer(serializers.ModelSerializer):
@@ -40,14 +44,21 @@ class ApplicationSerializer(serializers.ModelSerializer):
             # Statut et dates
             'status',
             'status_display',
+            'version',
             'created_at',
             'updated_at',
         ]
-        read_only_fields = ['id', 'candidate', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'candidate', 'version', 'created_at', 'updated_at']
 
     def get_candidate_name(self, obj):
-        """Retourner le nom complet du candidat"""
-        return f"{obj.candidate.first_name} {obj.candidate.last_name}"
+        """
+        Retourner le nom complet du candidat: celui saisi dans la candidature
+        (sans jointure), ou celui de son compte si le contexte le demande
+        (live_candidate, voir ApplicationViewSet)
+        """
+        if self.context.get('live_candidate'):
+            return f"{obj.candidate.first_name} {obj.candidate.last_name}"
+        return f"{obj.first_name} {obj.last_name}"
 
     def validate_experience(self, value):
         """Valider que l'expérience est une liste"""
@@ -66,3 +77,84 @@ class ApplicationSerializer(serializers.ModelSerializer):
         if value is not None and value <= 0:
             raise serializers.ValidationError("Le salaire actuel doit être supérieur à 0")
         return value
+
+
+class DashboardStatsQuerySerializer(serializers.Serializer):
+    """
+    Paramètres de GET /api/applications/dashboard_stats/
+    """
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    job = serializers.IntegerField(required=False, min_value=1)
+    # Ventilations séparées par des virgules (ex: status,contract_type_sought)
+    breakdown = serializers.CharField(required=False, allow_blank=True)
+
+    def validate_breakdown(self, value):
+        dimensions = [dimension.strip() for dimension in value.split(',') if dimension.strip()]
+        unknown = [dimension for dimension in dimensions if dimension not in BREAKDOWNS]
+        if unknown:
+            raise serializers.ValidationError(
+                f"Ventilation inconnue: {', '.join(unknown)} (valeurs possibles: {', '.join(BREAKDOWNS)})"
+            )
+        return list(dict.fromkeys(dimensions))
+
+    def validate(self, attrs):
+        if 'date_from' in attrs and 'date_to' in attrs and attrs['date_from'] > attrs['date_to']:
+            raise serializers.ValidationError("date_from doit être antérieure à date_to")
+        return attrs
+
+
+class ReviewQueueStatsQuerySerializer(serializers.Serializer):
+    """
+    Paramètres de GET /api/applications/review-queue-stats/
+    """
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+
+class TimeseriesQuerySerializer(serializers.Serializer):
+    """
+    Paramètres de GET /api/applications/timeseries/
+    """
+    interval = serializers.ChoiceField(choices=rollups.INTERVALS, default='day')
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    status = serializers.ChoiceField(choices=Application.STATUS_CHOICES, required=False)
+    contract_type_sought = serializers.ChoiceField(choices=Application.CONTRACT_TYPE_CHOICES, required=False)
+    breakdown = serializers.ChoiceField(choices=list(rollups.DIMENSIONS), required=False)
+
+    # Nombre maximal de périodes d'une série
+    max_periods = 1000
+
+    def validate(self, attrs):
+        interval = attrs['interval']
+        default_start, default_end = rollups.default_range(interval, attrs.get('end'))
+        attrs.setdefault('end', default_end)
+        if 'start' not in attrs:
+            attrs['start'] = default_start
+
+        if attrs['start'] > attrs['end']:
+            raise serializers.ValidationError("start doit être antérieure à end")
+        # Les périodes sont complètes: start est ramenée au début de sa période
+        attrs['start'] = rollups.period_start(attrs['start'], interval)
+        periods = len(list(itertools.islice(
+            rollups.iter_periods(attrs['start'], attrs['end'], interval), self.max_periods + 1
+        )))
+        if periods > self.max_periods:
+            raise serializers.ValidationError(f"Période trop longue (au plus {self.max_periods} points)")
+        return attrs
+
+
+class BulkTransitionSerializer(serializers.Serializer):
+    """
+    Corps de POST /api/applications/bulk-transition/: statut cible et liste
+    d'ids ou filtre (voir applications.filters.ApplicationFilter)
+    """
+    status = serializers.ChoiceField(choices=list(ALLOWED_SOURCES))
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, allow_empty=False)
+    filter = serializers.DictField(required=False, allow_empty=False)
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError("Fournir soit 'ids', soit 'filter'.")
+        return attrs
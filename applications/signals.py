@@ -0,0 +1,55 @@
+"""
+Signaux des modèles Application et JobOffer
+"""
+
+from django.db import router
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+from common import fuzzy
+from jobs.models import JobOffer
+from .models import Application
+from . import counters, rollups, search
+
+
+@receiver(post_save, sender=Application)
+def count_saved_application(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """
+    Mettre à jour compteurs, agrégats et index de recherche (création ou
+    modification, limitée aux champs de update_fields)
+    """
+    if raw:
+        return
+    counters.record_save(instance, created, update_fields)
+    rollups.record_save(instance, created, update_fields)
+    search.record_save(instance, created, update_fields)
+    fuzzy.record_save(instance)
+    instance.remember_saved_values(update_fields)
+
+
+@receiver(post_delete, sender=Application)
+def count_deleted_application(sender, instance, **kwargs):
+    """Retirer la candidature des compteurs, agrégats et index (y compris suppression en cascade)"""
+    counters.record_delete(instance)
+    rollups.record_delete(instance)
+    search.record_delete(instance)
+    fuzzy.record_delete(instance)
+
+
+@receiver(pre_save, sender=JobOffer)
+def remember_job_title(sender, instance, raw=False, **kwargs):
+    """Lire le titre enregistré de l'offre, pour détecter son changement"""
+    if raw or instance.pk is None:
+        instance._previous_title = None
+        return
+    using = instance._state.db or router.db_for_write(JobOffer, instance=instance)
+    instance._previous_title = JobOffer.objects.using(using).filter(
+        pk=instance.pk,
+    ).values_list('title', flat=True).first()
+
+
+@receiver(post_save, sender=JobOffer)
+def reindex_job_applications(sender, instance, created, raw=False, **kwargs):
+    """Réindexer les candidatures d'une offre renommée (le titre est indexé)"""
+    if raw or created or instance._previous_title in (None, instance.title):
+        return
+    search.index_applications(Application.objects.using(instance._state.db).filter(job_id=instance.pk))
@@ -0,0 +1,89 @@
+"""
+Statistiques des candidatures pour le dashboard admin
+
+Sans filtre, les valeurs sont lues dans les compteurs maintenus par
+`applications.counters` (quelques lignes, quelle que soit la taille de la
+table). Avec un filtre (période, offre), elles sont calculées en une seule
+requête par agrégation conditionnelle: `COUNT(*) FILTER (WHERE ...)` sous
+PostgreSQL, `SUM(CASE WHEN ...)` sur les autres bases.
+"""
+
+from django.db.models import Count, Q
+from .counters import counter_value, read_counters
+from .models import Application
+
+
+# Indicateurs du dashboard: nom -> (dimension, valeur), None pour le total
+DASHBOARD_METRICS = {
+    'total': None,
+    'spontanees': ('is_spontaneous', True),
+    'sur_offres': ('is_spontaneous', False),
+    'interim': ('contract_type_sought', 'interim'),
+    'evaluations': ('status', 'reviewed'),
+}
+
+# Ventilations disponibles: dimension -> valeurs possibles
+BREAKDOWNS = {
+    'status': [value for value, _ in Application.STATUS_CHOICES],
+    'contract_type_sought': [value for value, _ in Application.CONTRACT_TYPE_CHOICES],
+    'is_spontaneous': [True, False],
+}
+
+
+def breakdown_alias(dimension, value):
+    """Nom de l'agrégat d'une valeur de ventilation"""
+    return f'{dimension}__{counter_value(value)}'
+
+
+def dashboard_stats(queryset, breakdowns=()):
+    """
+    Calculer les indicateurs du dashboard (et les ventilations demandées)
+    en une seule requête
+    """
+    aggregates = {
+        name: Count('id', filter=Q(**{metric[0]: metric[1]})) if metric is not None else Count('id')
+        for name, metric in DASHBOARD_METRICS.items()
+    }
+    for dimension in breakdowns:
+        for value in BREAKDOWNS[dimension]:
+            aggregates[breakdown_alias(dimension, value)] = Count('id', filter=Q(**{dimension: value}))
+
+    row = queryset.aggregate(**aggregates)
+
+    stats = {name: row[name] for name in DASHBOARD_METRICS}
+    if breakdowns:
+        stats['breakdown'] = {
+            dimension: {
+                counter_value(value): row[breakdown_alias(dimension, value)]
+                for value in BREAKDOWNS[dimension]
+            }
+            for dimension in breakdowns
+        }
+    return stats
+
+
+def counter_stats(breakdowns=()):
+    """
+    Indicateurs du dashboard (et ventilations demandées) lus dans les
+    compteurs, pour l'ensemble des candidatures
+    """
+    counters = read_counters(dimensions=list(BREAKDOWNS))
+
+    stats = {}
+    for name, metric in DASHBOARD_METRICS.items():
+        if metric is None:
+            # Chaque candidature a exactement un statut
+            stats[name] = sum(counters['status'].values())
+        else:
+            dimension, value = metric
+            stats[name] = counters[dimension].get(counter_value(value), 0)
+
+    if breakdowns:
+        stats['breakdown'] = {
+            dimension: {
+                counter_value(value): counters[dimension].get(counter_value(value), 0)
+                for value in BREAKDOWNS[dimension]
+            }
+            for dimension in breakdowns
+        }
+    return stats
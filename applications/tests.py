@@ -1,3 +1,562 @@
-from django.test import TestCase
+from datetime import date, datetime, timezone as dt_timezone
+from unittest import mock
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from accounts.authentication import generate_jwt_tokens_for_account
+from accounts.models import Account
+from common import fuzzy
+from jobs.models import JobOffer
+from .counters import compute_counters, diff_counters, read_counters
+from .models import Application, ReviewLease, VersionConflict
+from .stats import BREAKDOWNS, dashboard_stats
 
-# Create your tests here.
+
+class ApplicationTestCase(TestCase):
+    """Admin, candidat et offre communs aux tests; clients API authentifiés"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = Account.objects.create_user(
+            email='admin@example.com', password='motdepasse', first_name='Anne', last_name='Admin', role='admin',
+        )
+        cls.candidate = Account.objects.create_user(
+            email='candidat@example.com', password='motdepasse', first_name='Jean', last_name='Dupont',
+        )
+        cls.job = JobOffer.objects.create(
+            title='Développeur Python', company='ACME', location='Paris', contract_type='cdi',
+            application_deadline=date(2030, 1, 1), description='Django', created_by=cls.admin,
+        )
+
+    def setUp(self):
+        # Comptes en cache invalidés à la validation: jamais dans un TestCase
+        cache.clear()
+        self.admin_client = self.client_for(self.admin)
+        self.candidate_client = self.client_for(self.candidate)
+
+    @staticmethod
+    def client_for(account):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {generate_jwt_tokens_for_account(account)['access']}")
+        return client
+
+    def make_application(self, **fields):
+        values = {
+            'candidate': self.candidate, 'job': self.job, 'civility': 'monsieur',
+            'first_name': 'Jean', 'last_name': 'Dupont', 'email': 'jean.dupont@example.com',
+            'phone': '0600000000', 'country': 'France', 'address': '1 rue de Paris',
+            'contract_type_sought': 'cdi', 'education_level': 'Master', 'expected_salary': 40000,
+        }
+        values.update(fields)
+        return Application.objects.create(**values)
+
+
+class CounterTests(ApplicationTestCase):
+    """Compteurs incrémentaux: les deltas partent de l'état en base"""
+
+    def assertNoDrift(self):
+        self.assertEqual(diff_counters(read_counters(), compute_counters()), [])
+
+    def test_stale_instances(self):
+        application = self.make_application()
+        first = Application.objects.get(id=application.id)
+        second = Application.objects.get(id=application.id)
+
+        first.status = 'accepted'
+        first.save()
+        # Instance lue avant la modification précédente: refusée (version)
+        second.status = 'rejected'
+        with self.assertRaises(VersionConflict), transaction.atomic():
+            second.save()
+        self.assertEqual(second.version, 1)
+        self.assertNoDrift()
+        self.assertEqual(read_counters()['status'].get('accepted', 0), 1)
+
+    def test_delete_stale_instance(self):
+        application = self.make_application()
+        stale = Application.objects.get(id=application.id)
+        application.status = 'reviewed'
+        application.save()
+        stale.delete()
+        self.assertNoDrift()
+
+    def test_row_locked_only_when_a_dimension_changes(self):
+        application = Application.objects.get(id=self.make_application().id)
+        with mock.patch.object(Application, 'lock_saved_values') as lock:
+            application.phone = '0611111111'
+            application.save()
+            lock.assert_not_called()
+            application.status = 'reviewed'
+            application.save()
+            lock.assert_called_once()
+
+    def test_update_fields_without_the_dimension(self):
+        application = Application.objects.get(id=self.make_application().id)
+        application.status = 'accepted'
+        application.phone = '0611111111'
+        # Statut modifié mais non enregistré: aucun delta
+        application.save(update_fields=['phone'])
+        self.assertNoDrift()
+        self.assertEqual(read_counters()['status'].get('accepted', 0), 0)
+        application.save(update_fields=['status'])
+        self.assertNoDrift()
+        self.assertEqual(read_counters()['status'].get('accepted', 0), 1)
+
+
+class FilterTests(ApplicationTestCase):
+    """Filtres par champ de la liste admin"""
+
+    def list_ids(self, **params):
+        response = self.admin_client.get('/api/applications/', params)
+        self.assertEqual(response.status_code, 200)
+        return {row['id'] for row in response.data}
+
+    def test_each_filter_searches_its_own_field(self):
+        martin = self.make_application(first_name='Martin', last_name='Durand')
+        durand = self.make_application(first_name='Paul', last_name='Martin')
+        self.assertEqual(self.list_ids(first_name='martin'), {martin.id})
+        self.assertEqual(self.list_ids(last_name='martin'), {durand.id})
+
+    def test_substring_match(self):
+        application = self.make_application(last_name='Dupont', email='jean.dupont@example.com')
+        self.assertEqual(self.list_ids(last_name='pon'), {application.id})
+        self.assertEqual(self.list_ids(email='dupont@exa'), {application.id})
+
+    def test_job_title_filters_on_the_job_offer(self):
+        other_job = JobOffer.objects.create(
+            title='Comptable', company='ACME', location='Lyon', contract_type='cdi',
+            application_deadline=date(2030, 1, 1), description='Compta', created_by=self.admin,
+        )
+        developer = self.make_application()
+        self.make_application(job=other_job, email='developpeur@example.com')
+        self.assertEqual(self.list_ids(job_title='velop'), {developer.id})
+
+
+class FuzzySearchTests(ApplicationTestCase):
+    """Recherche approximative (?fuzzy=)"""
+
+    def setUp(self):
+        super().setUp()
+        # Index en mémoire partagé: les transactions des tests ne sont jamais validées
+        fuzzy._indexes.clear()
+
+    def search(self, query):
+        response = self.admin_client.get('/api/applications/', query)
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in response.data]
+
+    def test_accents_and_case_are_folded(self):
+        lower = self.make_application(first_name='Éloïse', last_name="N'Diaye")
+        upper = self.make_application(first_name='ÉLOÏSE', last_name='LEFÈVRE')
+        self.make_application(first_name='Marc', last_name='Martin')
+        self.assertEqual(set(self.search({'fuzzy': 'eloise'})), {lower.id, upper.id})
+        self.assertEqual(self.search({'fuzzy': 'ndiay'}), [lower.id])
+        self.assertEqual(self.search({'fuzzy': 'lefevre'}), [upper.id])
+
+    def test_letters_without_decomposition_are_folded(self):
+        # "ł" et "ø" ne sont pas décomposés par NFKD: table de group_sql
+        application = self.make_application(first_name='Łukasz', last_name='Søren')
+        self.assertEqual(fuzzy.normalize('Łukasz Søren'), 'lukasz soren')
+        self.assertEqual(self.search({'fuzzy': 'lukasz soren'}), [application.id])
+
+    def test_group_sql_lowercases_before_stripping_accents(self):
+        from django.db import connection
+        expression = fuzzy.group_sql(connection, ('first_name', 'last_name'))
+        self.assertTrue(expression.startswith('translate(lower('))
+        self.assertIn('É', fuzzy.ACCENTS_FROM)
+
+    @override_settings(FUZZY_MAX_RESULTS=2)
+    def test_limit_applies_after_other_filters(self):
+        for _ in range(3):
+            self.make_application(last_name='Dupont', status='rejected')
+        pending = self.make_application(last_name='Dupont')
+        self.assertEqual(self.search({'fuzzy': 'dupont', 'status': 'pending'}), [pending.id])
+        self.assertEqual(self.search({'fuzzy': 'dupont', 'application_status': 'incomplete'}), [pending.id])
+        self.assertEqual(len(self.search({'fuzzy': 'dupont'})), 2)
+
+
+class BulkTransitionTests(ApplicationTestCase):
+    """Transitions en masse: validation du filtre"""
+
+    def bulk(self, body):
+        return self.admin_client.post('/api/applications/bulk-transition/', body, format='json')
+
+    def statuses(self):
+        return dict(Application.objects.values_list('id', 'status'))
+
+    def test_filter_by_job_and_status(self):
+        other_job = JobOffer.objects.create(
+            title='Comptable', company='ACME', location='Lyon', contract_type='cdi',
+            application_deadline=date(2030, 1, 1), description='Compta', created_by=self.admin,
+        )
+        target = self.make_application()
+        other = self.make_application(job=other_job)
+        reviewed = self.make_application(status='reviewed')
+
+        response = self.bulk({'status': 'rejected', 'filter': {'job': self.job.id, 'status': 'pending'}})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated'], [target.id])
+        self.assertEqual(self.statuses(), {target.id: 'rejected', other.id: 'pending', reviewed.id: 'reviewed'})
+
+    def test_unknown_job_matches_nothing(self):
+        self.make_application()
+        response = self.bulk({'status': 'rejected', 'filter': {'job': 999999, 'status': 'pending'}})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 0)
+
+    def test_unknown_filter_key_is_rejected(self):
+        application = self.make_application()
+        response = self.bulk({'status': 'rejected', 'filter': {'jobs': self.job.id, 'status': 'pending'}})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('jobs', response.data['filter'])
+        self.assertEqual(self.statuses(), {application.id: 'pending'})
+
+    def test_filter_without_value_is_rejected(self):
+        application = self.make_application()
+        response = self.bulk({'status': 'rejected', 'filter': {'first_name': ''}})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.statuses(), {application.id: 'pending'})
+
+    def test_ids_skip_forbidden_transitions(self):
+        pending = self.make_application()
+        accepted = self.make_application(status='accepted')
+        response = self.bulk({'status': 'rejected', 'ids': [pending.id, accepted.id, 999999]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated'], [pending.id])
+        self.assertEqual(response.data['skipped'], [{'id': accepted.id, 'status': 'accepted'}])
+        self.assertEqual(response.data['not_found'], [999999])
+
+
+class VersionConflictTests(ApplicationTestCase):
+    """Verrou optimiste: une version périmée retourne 409"""
+
+    def test_transition_increments_version(self):
+        application = self.make_application()
+        response = self.admin_client.post(f'/api/applications/{application.id}/review/', {'version': 1}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['version'], 2)
+
+    def test_stale_version_on_transition(self):
+        application = self.make_application()
+        self.admin_client.post(f'/api/applications/{application.id}/review/', {'version': 1}, format='json')
+        response = self.admin_client.post(f'/api/applications/{application.id}/reject/', {'version': 1}, format='json')
+        self.assertEqual(response.status_code, 409)
+        application.refresh_from_db()
+        self.assertEqual((application.status, application.version), ('reviewed', 2))
+
+    def test_stale_version_on_update(self):
+        application = self.make_application()
+        self.candidate_client.patch(
+            f'/api/applications/{application.id}/', {'phone': '0611111111', 'version': 1}, format='json',
+        )
+        response = self.admin_client.patch(
+            f'/api/applications/{application.id}/', {'status': 'accepted', 'version': 1}, format='json',
+        )
+        self.assertEqual(response.status_code, 409)
+        application.refresh_from_db()
+        self.assertEqual((application.status, application.phone), ('pending', '0611111111'))
+
+    def test_save_increments_version(self):
+        application = Application.objects.get(id=self.make_application().id)
+        application.phone = '0611111111'
+        application.save()
+        application.save(update_fields=['phone'])
+        self.assertEqual(application.version, 3)
+        application.refresh_from_db()
+        self.assertEqual(application.version, 3)
+
+    def test_update_is_a_single_conditional_update(self):
+        application = self.make_application()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.admin_client.patch(
+                f'/api/applications/{application.id}/', {'phone': '0611111111', 'version': 1}, format='json',
+            )
+        self.assertEqual(response.status_code, 200)
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "applications_application"')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"version" = 1', updates[0])
+        self.assertEqual(response.data['version'], 2)
+
+    def test_stale_candidate_update(self):
+        application = self.make_application()
+        self.admin_client.post(f'/api/applications/{application.id}/review/', {'version': 1}, format='json')
+        response = self.candidate_client.patch(
+            f'/api/applications/{application.id}/', {'phone': '0611111111', 'version': 1}, format='json',
+        )
+        self.assertEqual(response.status_code, 409)
+
+    def test_forbidden_transition(self):
+        application = self.make_application(status='accepted')
+        response = self.admin_client.post(f'/api/applications/{application.id}/reject/')
+        self.assertEqual(response.status_code, 409)
+
+
+class ReviewQueueTests(ApplicationTestCase):
+    """File de revue: réservation, fermeture et expiration"""
+
+    def next_to_review(self, client=None):
+        return (client or self.admin_client).post('/api/applications/next-to-review/')
+
+    def test_claim_oldest_pending(self):
+        first = self.make_application()
+        self.make_application()
+        self.make_application(status='reviewed')
+        response = self.next_to_review()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['application']['id'], first.id)
+        # Même admin: même réservation
+        self.assertEqual(self.next_to_review().data['lease']['id'], response.data['lease']['id'])
+
+    def test_two_reviewers_get_different_applications(self):
+        self.make_application()
+        self.make_application()
+        other = Account.objects.create_user(
+            email='admin2@example.com', password='motdepasse', first_name='Paul', last_name='Admin', role='admin',
+        )
+        first = self.next_to_review().data['application']['id']
+        second = self.next_to_review(self.client_for(other)).data['application']['id']
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.next_to_review(self.client_for(other)).data['application']['id'], second)
+
+    def test_empty_queue(self):
+        self.assertEqual(self.next_to_review().status_code, 204)
+
+    def test_transition_closes_the_lease(self):
+        application = self.make_application()
+        self.next_to_review()
+        self.admin_client.post(f'/api/applications/{application.id}/accept/')
+        lease = ReviewLease.objects.get()
+        self.assertEqual(lease.outcome, 'accepted')
+        self.assertIsNotNone(lease.released_at)
+
+    def test_status_update_closes_the_lease(self):
+        application = self.make_application()
+        self.next_to_review()
+        response = self.admin_client.patch(f'/api/applications/{application.id}/', {'status': 'rejected'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        lease = ReviewLease.objects.get()
+        self.assertEqual(lease.outcome, 'rejected')
+        self.assertIsNotNone(lease.released_at)
+        stats = self.admin_client.get('/api/applications/review-queue-stats/').data
+        self.assertEqual(stats['reviewers'][0]['expired'], 0)
+        self.assertEqual(stats['reviewers'][0]['completed'], 1)
+
+    def test_expired_lease_is_claimed_again(self):
+        application = self.make_application()
+        with override_settings(REVIEW_LEASE_SECONDS=-1):
+            self.next_to_review()
+        other = Account.objects.create_user(
+            email='admin2@example.com', password='motdepasse', first_name='Paul', last_name='Admin', role='admin',
+        )
+        response = self.next_to_review(self.client_for(other))
+        self.assertEqual(response.data['application']['id'], application.id)
+        expired = ReviewLease.objects.get(reviewer=self.admin)
+        self.assertEqual(expired.outcome, 'expired')
+
+    def test_release(self):
+        application = self.make_application()
+        self.next_to_review()
+        response = self.admin_client.post(f'/api/applications/{application.id}/release/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ReviewLease.objects.get().outcome, 'released')
+        # Plus de réservation en cours
+        response = self.admin_client.post(f'/api/applications/{application.id}/release/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_release_unknown_application(self):
+        self.assertEqual(self.admin_client.post('/api/applications/999999/release/').status_code, 404)
+        self.assertEqual(self.admin_client.post('/api/applications/abc/release/').status_code, 404)
+
+    def test_one_open_lease_per_reviewer(self):
+        first = self.make_application()
+        second = self.make_application()
+        self.next_to_review()
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            ReviewLease.objects.create(application=second, reviewer=self.admin, expires_at=timezone.now())
+        self.assertEqual(ReviewLease.objects.get(released_at=None).application_id, first.id)
+
+    def test_expired_lease_of_the_reviewer_is_closed(self):
+        first = self.make_application()
+        second = self.make_application()
+        with override_settings(REVIEW_LEASE_SECONDS=-1):
+            self.next_to_review()
+        # La candidature expirée est de nouveau la plus ancienne disponible
+        response = self.next_to_review()
+        self.assertEqual(response.data['application']['id'], first.id)
+        self.assertEqual(
+            list(ReviewLease.objects.order_by('id').values_list('application_id', 'outcome')),
+            [(first.id, 'expired'), (first.id, '')],
+        )
+        self.assertEqual(Application.objects.get(id=second.id).status, 'pending')
+
+    def test_lease_on_application_changed_outside_the_queue(self):
+        first = self.make_application()
+        second = self.make_application()
+        self.next_to_review()
+        # Modification directe du modèle, sans fermeture de la réservation
+        Application.objects.filter(id=first.id).update(status='accepted')
+        response = self.next_to_review()
+        self.assertEqual(response.data['application']['id'], second.id)
+        self.assertEqual(ReviewLease.objects.get(application=first).outcome, 'released')
+
+
+class DashboardStatsTests(ApplicationTestCase):
+    """Statistiques du dashboard: compteurs identiques à une agrégation en direct"""
+
+    breakdown = ','.join(BREAKDOWNS)
+
+    def setUp(self):
+        super().setUp()
+        self.make_application()
+        self.make_application(contract_type_sought='interim', status='reviewed')
+        self.make_application(job=None, is_spontaneous=True, contract_type_sought='stage')
+        rejected = self.make_application(contract_type_sought='interim')
+        self.admin_client.post(f'/api/applications/{rejected.id}/reject/')
+        self.make_application(job=None, is_spontaneous=True).delete()
+
+    def stats(self, **params):
+        response = self.admin_client.get('/api/applications/dashboard_stats/', {'breakdown': self.breakdown, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_counters_match_a_live_aggregate(self):
+        self.admin_client.post('/api/applications/bulk-transition/', {
+            'status': 'accepted', 'filter': {'status': 'reviewed'},
+        }, format='json')
+        expected = dashboard_stats(Application.objects.all(), list(BREAKDOWNS))
+        self.assertEqual(self.stats(), expected)
+        self.assertEqual(expected['total'], 4)
+        self.assertEqual(expected['spontanees'], 1)
+        self.assertEqual(expected['interim'], 2)
+
+    def test_filtered_stats_use_a_live_aggregate(self):
+        expected = dashboard_stats(Application.objects.filter(job=self.job), list(BREAKDOWNS))
+        self.assertEqual(self.stats(job=self.job.id), expected)
+        self.assertEqual(expected['total'], 3)
+        self.assertEqual(expected['breakdown']['status']['rejected'], 1)
+
+    def test_unknown_breakdown(self):
+        response = self.admin_client.get('/api/applications/dashboard_stats/', {'breakdown': 'statut'})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(ANALYTICS_TIME_ZONE='Europe/Paris')
+class TimeseriesTests(ApplicationTestCase):
+    """Séries temporelles denses lues dans les agrégats journaliers"""
+
+    def make_application_at(self, created_at, **fields):
+        with mock.patch('django.utils.timezone.now', return_value=created_at):
+            return self.make_application(**fields)
+
+    def series(self, **params):
+        response = self.admin_client.get('/api/applications/timeseries/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data['series']
+
+    def test_daily_series_is_dense(self):
+        self.make_application_at(datetime(2026, 3, 2, 9, tzinfo=dt_timezone.utc))
+        self.make_application_at(datetime(2026, 3, 2, 10, tzinfo=dt_timezone.utc), status='reviewed')
+        # 23h30 UTC: 3 mars à Paris
+        self.make_application_at(datetime(2026, 3, 2, 23, 30, tzinfo=dt_timezone.utc))
+        self.make_application_at(datetime(2026, 3, 5, 12, tzinfo=dt_timezone.utc))
+        series = self.series(start='2026-03-01', end='2026-03-06')
+        self.assertEqual([(point['period'], point['count']) for point in series], [
+            ('2026-03-01', 0), ('2026-03-02', 2), ('2026-03-03', 1),
+            ('2026-03-04', 0), ('2026-03-05', 1), ('2026-03-06', 0),
+        ])
+
+    def test_breakdown_follows_transitions(self):
+        application = self.make_application_at(datetime(2026, 3, 2, 9, tzinfo=dt_timezone.utc))
+        self.make_application_at(datetime(2026, 3, 3, 9, tzinfo=dt_timezone.utc))
+        self.admin_client.post(f'/api/applications/{application.id}/reject/')
+        series = self.series(start='2026-03-02', end='2026-03-03', breakdown='status')
+        self.assertEqual(series[0]['status'], {'pending': 0, 'reviewed': 0, 'accepted': 0, 'rejected': 1})
+        self.assertEqual(series[1]['status']['pending'], 1)
+        self.assertEqual(self.series(start='2026-03-02', end='2026-03-03', status='pending')[0]['count'], 0)
+
+    def test_weeks_and_months(self):
+        self.make_application_at(datetime(2026, 3, 2, 9, tzinfo=dt_timezone.utc))
+        self.make_application_at(datetime(2026, 3, 8, 9, tzinfo=dt_timezone.utc))
+        self.make_application_at(datetime(2026, 4, 1, 9, tzinfo=dt_timezone.utc))
+        weeks = self.series(interval='week', start='2026-03-04', end='2026-03-20')
+        self.assertEqual([(point['period'], point['count']) for point in weeks], [
+            ('2026-03-02', 2), ('2026-03-09', 0), ('2026-03-16', 0),
+        ])
+        months = self.series(interval='month', start='2026-02-15', end='2026-04-30')
+        self.assertEqual([point['count'] for point in months], [0, 2, 1])
+
+    def test_start_after_end(self):
+        response = self.admin_client.get('/api/applications/timeseries/', {'start': '2026-03-02', 'end': '2026-03-01'})
+        self.assertEqual(response.status_code, 400)
+
+
+class SearchTests(ApplicationTestCase):
+    """Recherche plein texte (?search=), triée par pertinence"""
+
+    def search(self, text, **params):
+        response = self.admin_client.get('/api/applications/', {'search': text, **params})
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in response.data]
+
+    def test_name_ranks_above_content(self):
+        content = self.make_application(first_name='Paul', last_name='Durand', education_level='Master Martin')
+        name = self.make_application(first_name='Paul', last_name='Martin')
+        self.assertEqual(self.search('martin'), [name.id, content.id])
+
+    def test_prefixes_accents_and_all_terms(self):
+        eloise = self.make_application(first_name='Éloïse', last_name='Dupont', email='eloise.d@example.com')
+        self.make_application(first_name='Éloïse', last_name='Martin', email='eloise.m@example.com')
+        self.assertEqual(self.search('eloi dup'), [eloise.id])
+        self.assertEqual(self.search('ELOÏSE DUPONT'), [eloise.id])
+
+    def test_index_follows_writes(self):
+        application = self.make_application(last_name='Dupont', email='candidat@example.com')
+        application.last_name = 'Durand'
+        application.save()
+        self.assertEqual(self.search('dupont'), [])
+        self.assertEqual(self.search('durand'), [application.id])
+        application.delete()
+        self.assertEqual(self.search('durand'), [])
+
+    def test_job_rename_reindexes_applications(self):
+        application = self.make_application()
+        self.job.title = 'Comptable'
+        self.job.save()
+        self.assertEqual(self.search('comptable'), [application.id])
+
+    def test_ordering_overrides_relevance(self):
+        content = self.make_application(first_name='Paul', last_name='Durand', education_level='Master Martin')
+        name = self.make_application(first_name='Paul', last_name='Martin')
+        self.assertEqual(self.search('martin', ordering='created_at'), [content.id, name.id])
+
+
+class CandidateNameTests(ApplicationTestCase):
+    """candidate_name lu dans la candidature, sans jointure sur les comptes"""
+
+    def setUp(self):
+        super().setUp()
+        self.application = self.make_application(first_name='Jean', last_name='Dupont')
+        Account.objects.filter(id=self.candidate.id).update(first_name='Jean-Marc', last_name='Durand')
+
+    def list(self, client, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/applications/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data, [query['sql'] for query in queries]
+
+    def test_snapshot_without_join(self):
+        rows, queries = self.list(self.admin_client)
+        self.assertEqual(rows[0]['candidate_name'], 'Jean Dupont')
+        self.assertFalse([sql for sql in queries if 'accounts_account' in sql])
+
+    def test_live_candidate_for_admins(self):
+        rows, queries = self.list(self.admin_client, live_candidate=1)
+        self.assertEqual(rows[0]['candidate_name'], 'Jean-Marc Durand')
+        self.assertEqual(len([sql for sql in queries if 'accounts_account' in sql]), 1)
+
+    def test_live_candidate_ignored_for_candidates(self):
+        rows, _ = self.list(self.candidate_client, live_candidate=1)
+        self.assertEqual(rows[0]['candidate_name'], 'Jean Dupont')
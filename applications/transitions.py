@@ -0,0 +1,151 @@
+"""
+Transitions de statut des candidatures
+
+ALLOWED_SOURCES indique, pour chaque statut cible, les statuts à partir
+desquels une candidature peut y passer: pending -> reviewed, et pending ou
+reviewed -> accepted ou rejected (une candidature peut être acceptée ou
+rejetée sans passer par reviewed); accepted et rejected sont finaux.
+
+Verrou optimiste: chaque transition est un seul UPDATE conditionné par le
+statut et la version lus (WHERE id = ... AND status = ... AND version = ...)
+qui incrémente la version. Si la candidature a changé entretemps, aucune
+ligne n'est modifiée et TransitionConflict (409) est levée.
+
+Une transition en masse est un seul UPDATE ... WHERE status IN (sources
+autorisées). update() ne déclenchant pas post_save, les compteurs et
+agrégats journaliers sont mis à jour explicitement, dans la même
+transaction. Les réservations ouvertes de la file de revue
+(applications.review_queue) sont fermées.
+"""
+
+from collections import Counter
+from django.db import router, transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import status as http_status
+from rest_framework.exceptions import APIException
+from .models import Application
+from . import counters, review_queue, rollups
+
+
+# Statut cible -> statuts sources autorisés
+ALLOWED_SOURCES = {
+    'reviewed': ('pending',),
+    'accepted': ('pending', 'reviewed'),
+    'rejected': ('pending', 'reviewed'),
+}
+
+
+class TransitionConflict(APIException):
+    """La candidature a été modifiée entretemps, ou son statut interdit la transition"""
+    status_code = http_status.HTTP_409_CONFLICT
+    default_detail = "La candidature a été modifiée entretemps, veuillez la recharger."
+    default_code = 'conflict'
+
+
+def can_transition(source, target):
+    return source in ALLOWED_SOURCES.get(target, ())
+
+
+def check_transition(source, target):
+    if source != target and not can_transition(source, target):
+        raise TransitionConflict(f"Transition impossible: {source} -> {target}")
+
+
+def transition_deltas(rows, target):
+    """
+    Deltas des compteurs et des agrégats pour des candidatures
+    (id, statut, type de contrat, date de création) passant à `target`
+    """
+    counter_deltas, bucket_deltas = Counter(), Counter()
+    for _, source, contract_type_sought, created_at in rows:
+        counter_deltas[('status', source)] -= 1
+        counter_deltas[('status', target)] += 1
+        day = rollups.bucket_day(created_at)
+        bucket_deltas[(day, source, contract_type_sought)] -= 1
+        bucket_deltas[(day, target, contract_type_sought)] += 1
+    return counter_deltas, bucket_deltas
+
+
+def transition(application, target, version=None, reviewer=None):
+    """
+    Passer une candidature au statut `target` avec un seul UPDATE conditionné
+    par son statut et sa version (celle fournie par le client, sinon celle
+    lue en base)
+
+    L'instance est mise à jour (statut, version, updated_at); lève
+    TransitionConflict si la transition est interdite ou si la candidature a
+    changé depuis sa lecture. La réservation de revue ouverte est fermée
+    (issue `target` si elle appartient à `reviewer`).
+    """
+    source = application.status
+    expected = application.version if version is None else version
+    if expected != application.version:
+        raise TransitionConflict()
+    check_transition(source, target)
+    if source == target:
+        return application
+
+    using = application._state.db or router.db_for_write(Application)
+    now = timezone.now()
+    with transaction.atomic(using=using):
+        updated = Application.objects.using(using).filter(
+            id=application.id, status=source, version=expected,
+        ).update(status=target, version=F('version') + 1, updated_at=now)
+        if not updated:
+            raise TransitionConflict()
+
+        counter_deltas, bucket_deltas = transition_deltas(
+            [(application.id, source, application.contract_type_sought, application.created_at)], target,
+        )
+        counters.apply_deltas(counter_deltas, using=using)
+        rollups.apply_deltas(bucket_deltas, using=using)
+        review_queue.close_leases([application.id], target, reviewer, using=using)
+
+    application.status, application.version, application.updated_at = target, expected + 1, now
+    application.remember_saved_values(['status', 'version', 'updated_at'])
+    return application
+
+
+def bulk_transition(queryset, target, ids=None, reviewer=None):
+    """
+    Passer au statut `target` les candidatures du QuerySet (restreint à `ids`
+    si fourni) dont le statut le permet
+
+    Retourne {"updated": [ids], "skipped": [{"id", "status"}], "not_found": [ids]}:
+    not_found liste les ids demandés absents du QuerySet.
+    """
+    sources = ALLOWED_SOURCES[target]
+    if ids is not None:
+        queryset = queryset.filter(id__in=ids)
+    using = queryset.db or router.db_for_write(Application)
+
+    with transaction.atomic(using=using):
+        # Lignes verrouillées jusqu'à la fin de la transaction: leur statut ne
+        # peut plus changer entre la lecture et l'UPDATE. Seules les
+        # candidatures sont verrouillées, pas les offres jointes par un filtre
+        # (job_title)
+        rows = list(
+            queryset.select_for_update(of=('self',)).order_by('id')
+            .values_list('id', 'status', 'contract_type_sought', 'created_at')
+        )
+        movable = [row for row in rows if row[1] in sources]
+        updated = [row[0] for row in movable]
+
+        if updated:
+            Application.objects.using(using).filter(id__in=updated, status__in=sources).update(
+                status=target,
+                version=F('version') + 1,
+                updated_at=timezone.now(),
+            )
+            counter_deltas, bucket_deltas = transition_deltas(movable, target)
+            counters.apply_deltas(counter_deltas, using=using)
+            rollups.apply_deltas(bucket_deltas, using=using)
+            review_queue.close_leases(updated, target, reviewer, using=using)
+
+    found = {row[0] for row in rows}
+    return {
+        "updated": updated,
+        "skipped": [{"id": pk, "status": status} for pk, status, *_ in rows if status not in sources],
+        "not_found": sorted(set(ids) - found) if ids is not None else [],
+    }
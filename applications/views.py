@@ -1,16 +1,26 @@
+from datetime import datetime, time, timedelta
 from django.shortcuts import render
+from django.db import transaction
 from django.db.models import Q, Count, Case, When, IntegerField
+from django.utils import timezone
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
-from .models import Application
-from .serializers import ApplicationSerializer
-from .filters import ApplicationFilter
+from rest_framework.filters import OrderingFilter
+from accounts.jwt_auth import ClaimsJWTAuthentication
+from .models import Application, VersionConflict
+from .serializers import (
+    ApplicationSerializer, BulkTransitionSerializer, DashboardStatsQuerySerializer, ReviewQueueStatsQuerySerializer,
+    TimeseriesQuerySerializer,
+)
+from .stats import counter_stats, dashboard_stats
+from . import review_queue, rollups, transitions
+from .filters import ApplicationFilter, ApplicationSearchFilter
+from common.filters import bulk_filter_errors
 from common.permissions import IsAdmin, IsOwnerOrAdmin
 
 
@@ -22,33 +32,56 @@ class ApplicationViewSet(ModelViewSet):
     """
 
     serializer_class = ApplicationSerializer
+    # Lecture: compte construit depuis les claims du token, sans requête SQL
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, ApplicationSearchFilter, OrderingFilter]
     filterset_class = ApplicationFilter
-    search_fields = ['first_name', 'last_name', 'email']
     ordering_fields = ['created_at', 'updated_at', 'status']
 
     def get_queryset(self):
         """
         Admins voient toutes les candidatures
         Candidats voient uniquement leurs candidatures
+
+        Le compte du candidat n'est joint que si l'admin demande ses données
+        à jour (?live_candidate=1)
         """
         user = self.request.user
         if user.role in ["admin", "superadmin"]:
-            return Application.objects.all().select_related('candidate', 'job')
+            queryset = Application.objects.all().select_related('job')
+            if self.live_candidate():
+                queryset = queryset.select_related('candidate')
+            return queryset
         return Application.objects.filter(candidate=user).select_related('job')
 
+    def live_candidate(self):
+        """
+        ?live_candidate=1 (admins): nom du candidat lu dans son compte au lieu
+        des champs saisis dans la candidature
+        """
+        request = getattr(self, 'request', None)
+        if request is None or request.user.role not in ["admin", "superadmin"]:
+            return False
+        return request.query_params.get('live_candidate', '').lower() in ('1', 'true')
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['live_candidate'] = self.live_candidate()
+        return context
+
     def get_permissions(self):
         """
         - create: Seulement les candidats
         - update/partial_update: Admins ou propriétaire
         - destroy: Admins ou propriétaire (si status=pending)
+        - actions: permission_classes de l'action (IsAdmin pour les actions admin)
         """
         if self.action == 'create':
             return [IsAuthenticated()]
         elif self.action in ['update', 'partial_update', 'destroy']:
             return [IsAuthenticated(), IsOwnerOrAdmin()]
-        return [IsAuthenticated()]
+        return super().get_permissions()
 
     def perform_create(self, serializer):
         """Associer la candidature au candidat connecté"""
@@ -59,18 +92,37 @@ class ApplicationViewSet(ModelViewSet):
     def perform_update(self, serializer):
         """
         Les candidats ne peuvent modifier que certains champs
-        Les admins peuvent modifier le statut
+        Les admins peuvent modifier le statut (transitions autorisées uniquement)
+
+        L'enregistrement incrémente la version dans son UPDATE, limité à la
+        version lue (Application.save): 409 si la candidature a changé
+        entretemps ou si `version` fournie par le client n'est pas la version
+        lue. Un changement de statut ferme la réservation de revue ouverte,
+        comme les actions review/accept/reject.
         """
         user = self.request.user
-        if user.role in ["admin", "superadmin"]:
-            serializer.save()
-        else:
-            # Les candidats ne peuvent modifier que si status=pending
-            instance = self.get_object()
-            if instance.status != "pending":
-                raise PermissionDenied("Vous ne pouvez plus modifier cette candidature")
-            # Empêcher la modification du statut
-            serializer.save(status=instance.status)
+        instance = serializer.instance
+        version = self._requested_version()
+        if version is not None and version != instance.version:
+            raise transitions.TransitionConflict()
+        try:
+            with transaction.atomic():
+                if user.role in ["admin", "superadmin"]:
+                    previous_status = instance.status
+                    if 'status' in serializer.validated_data:
+                        transitions.check_transition(previous_status, serializer.validated_data['status'])
+                    serializer.save()
+                    if instance.status != previous_status:
+                        review_queue.close_leases([instance.id], instance.status, user)
+                else:
+                    # Les candidats ne peuvent modifier que si status=pending
+                    # (inchangé depuis la lecture: la version est vérifiée)
+                    if instance.status != "pending":
+                        raise PermissionDenied("Vous ne pouvez plus modifier cette candidature")
+                    # Empêcher la modification du statut
+                    serializer.save(status=instance.status)
+        except VersionConflict:
+            raise transitions.TransitionConflict()
 
     def perform_destroy(self, instance):
         """
@@ -82,29 +134,127 @@ class ApplicationViewSet(ModelViewSet):
                 raise PermissionDenied("Vous ne pouvez supprimer que les candidatures en attente")
         instance.delete()
 
+    def _requested_version(self):
+        """Version attendue fournie par le client (champ `version`), sinon None"""
+        value = self.request.data.get('version')
+        if value in (None, ''):
+            return None
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise ValidationError({"version": ["Version invalide"]})
+
+    def _transition(self, target, message):
+        """Transition de statut optimiste (applications.transitions): 409 en cas de conflit"""
+        application = transitions.transition(
+            self.get_object(), target, self._requested_version(), reviewer=self.request.user,
+        )
+        return Response({"status": message, "version": application.version})
+
     @action(detail=True, methods=['post'], permission_classes=[IsAdmin])
     def review(self, request, pk=None):
         """Marquer une candidature comme revue"""
-        application = self.get_object()
-        application.status = "reviewed"
-        application.save()
-        return Response({"status": "Candidature marquée comme revue"})
+        return self._transition("reviewed", "Candidature marquée comme revue")
 
     @action(detail=True, methods=['post'], permission_classes=[IsAdmin])
     def accept(self, request, pk=None):
         """Accepter une candidature"""
-        application = self.get_object()
-        application.status = "accepted"
-        application.save()
-        return Response({"status": "Candidature acceptée"})
+        return self._transition("accepted", "Candidature acceptée")
 
     @action(detail=True, methods=['post'], permission_classes=[IsAdmin])
     def reject(self, request, pk=None):
         """Rejeter une candidature"""
+        return self._transition("rejected", "Candidature rejetée")
+
+    @action(detail=False, methods=['post'], url_path='bulk-transition', permission_classes=[IsAdmin])
+    def bulk_transition(self, request):
+        """
+        Changer le statut de candidatures en masse (ADMIN)
+
+        POST /api/applications/bulk-transition/
+        Body: {"status": "rejected", "ids": [1, 2, 3]}
+           ou {"status": "rejected", "filter": {"job": 4, "status": "pending"}}
+
+        Un seul UPDATE, limité aux candidatures dont le statut autorise la
+        transition (applications.transitions.ALLOWED_SOURCES). Retourne le
+        résultat par id: updated, skipped (statut incompatible) ou not_found.
+        Un filtre avec une clé inconnue ou sans valeur est refusé (400).
+        """
+        serializer = BulkTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        # Sans select_related: FOR UPDATE ne s'applique pas aux jointures externes
+        queryset = Application.objects.all()
+        if 'filter' in data:
+            filterset = ApplicationFilter(data=data['filter'], queryset=queryset)
+            errors = bulk_filter_errors(filterset)
+            if errors:
+                return Response({"filter": errors}, status=status.HTTP_400_BAD_REQUEST)
+            queryset = filterset.qs
+
+        results = transitions.bulk_transition(
+            queryset, data['status'], ids=data.get('ids'), reviewer=request.user,
+        )
+        return Response({
+            "message": f"{len(results['updated'])} candidature(s) mise(s) à jour",
+            "count": len(results['updated']),
+            **results,
+        }, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'], url_path='next-to-review', permission_classes=[IsAdmin])
+    def next_to_review(self, request):
+        """
+        Réserver la prochaine candidature à examiner (ADMIN)
+
+        POST /api/applications/next-to-review/
+
+        Retourne la plus ancienne candidature en attente non réservée par un
+        autre admin, réservée pendant REVIEW_LEASE_SECONDS (la réservation en
+        cours si l'admin en a déjà une), ou 204 si la file est vide. La
+        réservation se termine par review/accept/reject ou release.
+        """
+        lease = review_queue.next_to_review(request.user)
+        if lease is None:
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        return Response({
+            "lease": {"id": lease.id, "expires_at": lease.expires_at},
+            "application": self.get_serializer(lease.application).data,
+        })
+
+    @action(detail=True, methods=['post'], permission_classes=[IsAdmin])
+    def release(self, request, pk=None):
+        """Libérer sa réservation de la candidature (ADMIN), qui retourne dans la file"""
         application = self.get_object()
-        application.status = "rejected"
-        application.save()
-        return Response({"status": "Candidature rejetée"})
+        if not review_queue.release(application.id, request.user):
+            return Response(
+                {"detail": "Aucune réservation en cours pour cette candidature"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response({"status": "Réservation libérée"})
+
+    @action(detail=False, methods=['get'], url_path='review-queue-stats', permission_classes=[IsAdmin])
+    def review_queue_stats(self, request):
+        """
+        État de la file de revue et débit par admin (ADMIN)
+
+        GET /api/applications/review-queue-stats/?date_from=2026-01-01&date_to=2026-01-31
+
+        Par admin: réservations obtenues (claimed), terminées par une
+        transition (completed), libérées, expirées, reprises par un autre
+        admin (preempted), durée moyenne et candidatures traitées par heure.
+        """
+        params = ReviewQueueStatsQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        query = params.validated_data
+
+        tz = timezone.get_current_timezone()
+        since = until = None
+        if 'date_from' in query:
+            since = datetime.combine(query['date_from'], time.min, tzinfo=tz)
+        if 'date_to' in query:
+            until = datetime.combine(query['date_to'] + timedelta(days=1), time.min, tzinfo=tz)
+        return Response(review_queue.queue_stats(since, until))
 
     @action(detail=False, methods=['get'], permission_classes=[IsAdmin])
     def dashboard_stats(self, request):
@@ -115,16 +265,67 @@ class ApplicationViewSet(ModelViewSet):
         - sur_offres: nombre de candidatures sur les offres d'emploi
         - interim: nombre de candidatures pour contrat intérim
         - evaluations: nombre de candidatures en évaluation (status=reviewed)
+
+        Paramètres optionnels:
+        - date_from, date_to: période (dates incluses, fuseau du serveur)
+        - job: id de l'offre
+        - breakdown: ventilations, ex: status,contract_type_sought,is_spontaneous
+
+        Sans filtre, les valeurs viennent des compteurs (applications.counters);
+        sinon, une seule requête SQL, quel que soit le nombre de ventilations.
         """
+        params = DashboardStatsQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        filters = params.validated_data
+        breakdowns = filters.get('breakdown', [])
+
+        if not any(name in filters for name in ('date_from', 'date_to', 'job')):
+            return Response(counter_stats(breakdowns))
+
         queryset = Application.objects.all()
+        tz = timezone.get_current_timezone()
+        if 'date_from' in filters:
+            queryset = queryset.filter(
+                created_at__gte=datetime.combine(filters['date_from'], time.min, tzinfo=tz)
+            )
+        if 'date_to' in filters:
+            queryset = queryset.filter(
+                created_at__lt=datetime.combine(filters['date_to'] + timedelta(days=1), time.min, tzinfo=tz)
+            )
+        if 'job' in filters:
+            queryset = queryset.filter(job_id=filters['job'])
+
+        return Response(dashboard_stats(queryset, breakdowns))
 
-        stats = {
-            'total': queryset.count(),
-            'spontanees': queryset.filter(is_spontaneous=True).count(),
-            'sur_offres': queryset.filter(is_spontaneous=False).count(),
-            'interim': queryset.filter(contract_type_sought='interim').count(),
-            'evaluations': queryset.filter(status='reviewed').count(),
-        }
+    @action(detail=False, methods=['get'], permission_classes=[IsAdmin])
+    def timeseries(self, request):
+        """
+        Nombre de candidatures par jour, semaine ou mois (ADMIN)
+
+        GET /api/applications/timeseries/?interval=week&start=2026-01-01&end=2026-03-31
 
-        return Response(stats)
+        Paramètres optionnels:
+        - interval: day (défaut), week (semaines ISO) ou month
+        - start, end: période (30 jours, 12 semaines ou 12 mois par défaut)
+        - status, contract_type_sought: filtres
+        - breakdown: status ou contract_type_sought
+
+        Les jours sont ceux du fuseau ANALYTICS_TIME_ZONE; la série est dense
+        (périodes sans candidature à 0).
+        """
+        params = TimeseriesQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        query = params.validated_data
 
+        filters = {name: query[name] for name in rollups.DIMENSIONS if name in query}
+        series = rollups.timeseries(
+            query['start'], query['end'], query['interval'],
+            filters=filters, breakdown=query.get('breakdown'),
+        )
+        return Response({
+            "interval": query['interval'],
+            "timezone": str(rollups.analytics_timezone()),
+            "start": query['start'],
+            "end": query['end'],
+            "series": series,
+        })
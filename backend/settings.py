@@ -37,14 +37,57 @@ ALLOWED_HOSTS = ["*"]
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "accounts.jwt_auth.JWTAuthentication",  # Notre authentification JWT personnalisée
-        "rest_framework_simplejwt.authentication.JWTAuthentication",  # Backup pour les Users Django
+        # Tokens Account et simplejwt: aiguillés vers un seul vérificateur
+        "accounts.jwt_auth.JWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    # Limitation des tentatives de connexion (fenêtre glissante, avant hachage)
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": os.environ.get('LOGIN_THROTTLE_IP_RATE', '30/min'),
+        "login_email": os.environ.get('LOGIN_THROTTLE_EMAIL_RATE', '10/min'),
+    },
+    # Nombre de proxys inverses devant l'application: l'IP des throttles est
+    # lue dans X-Forwarded-For à cette position. 0: REMOTE_ADDR, l'en-tête
+    # fourni par le client n'est jamais utilisé
+    "NUM_PROXIES": int(os.environ.get('NUM_PROXIES', 0)),
+    # Pool de hachage saturé (accounts.hashing.HashingUnavailable): 503
+    "EXCEPTION_HANDLER": "accounts.exceptions.exception_handler",
 }
 
+# Pagination par curseur de la liste des comptes
+ACCOUNT_PAGE_SIZE = int(os.environ.get('ACCOUNT_PAGE_SIZE', 50))
+ACCOUNT_MAX_PAGE_SIZE = int(os.environ.get('ACCOUNT_MAX_PAGE_SIZE', 500))
+
+# Import en masse de comptes (taille des lots, processus de hachage de la
+# commande import_accounts; l'API hache sur le pool PASSWORD_HASHING_*)
+ACCOUNT_IMPORT_CHUNK_SIZE = int(os.environ.get('ACCOUNT_IMPORT_CHUNK_SIZE', 500))
+ACCOUNT_IMPORT_PROCESSES = int(os.environ.get('ACCOUNT_IMPORT_PROCESSES', os.cpu_count() or 1))
+
+# Export de comptes (lignes lues par lot depuis la base)
+ACCOUNT_EXPORT_CHUNK_SIZE = int(os.environ.get('ACCOUNT_EXPORT_CHUNK_SIZE', 2000))
+
+# Recherche approximative (trigrammes) des comptes et candidatures
+FUZZY_MAX_RESULTS = int(os.environ.get('FUZZY_MAX_RESULTS', 100))
+FUZZY_SIMILARITY_THRESHOLD = float(os.environ.get('FUZZY_SIMILARITY_THRESHOLD', 0.4))
+# Durée de vie (secondes) de l'index en mémoire (bases autres que PostgreSQL)
+FUZZY_INDEX_TTL = int(os.environ.get('FUZZY_INDEX_TTL', 300))
+
+# Cache LRU (par processus) des tokens JWT déjà vérifiés
+JWT_TOKEN_CACHE_SIZE = int(os.environ.get('JWT_TOKEN_CACHE_SIZE', 1024))
+
+# Reconstruction du filtre de Bloom des tokens révoqués (secondes)
+JWT_REVOCATION_REFRESH_INTERVAL = int(os.environ.get('JWT_REVOCATION_REFRESH_INTERVAL', 30))
+
+# Cache partagé des comptes authentifiés (invalidé par signal post_save)
+ACCOUNT_PRINCIPAL_CACHE_TIMEOUT = int(os.environ.get('ACCOUNT_PRINCIPAL_CACHE_TIMEOUT', 300))  # secondes
+
+# Pool borné pour le hachage des mots de passe (PBKDF2)
+PASSWORD_HASHING_MAX_WORKERS = int(os.environ.get('PASSWORD_HASHING_MAX_WORKERS', os.cpu_count() or 1))
+PASSWORD_HASHING_MAX_QUEUE = int(os.environ.get('PASSWORD_HASHING_MAX_QUEUE', 32))
+PASSWORD_HASHING_QUEUE_TIMEOUT = float(os.environ.get('PASSWORD_HASHING_QUEUE_TIMEOUT', 5))  # secondes
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -106,6 +149,25 @@ DATABASES = {
 AUTH_USER_MODEL = "accounts.Account"
 
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# LocMemCache est propre à chaque processus: en production, utiliser un
+# backend partagé (Redis, Memcached) pour que l'invalidation des comptes
+# soit visible par tous les workers.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    },
+    # Compteurs de limitation des connexions, partagés par les workers du serveur
+    'throttle': {
+        'BACKEND': os.environ.get('THROTTLE_CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.environ.get('THROTTLE_CACHE_LOCATION', '/tmp/din_recruitment_throttle'),
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -132,6 +194,12 @@ LANGUAGE_CODE = 'en-us'
 
 TIME_ZONE = 'UTC'
 
+# Fuseau utilisé pour répartir les candidatures par jour (statistiques)
+ANALYTICS_TIME_ZONE = os.environ.get('ANALYTICS_TIME_ZONE', TIME_ZONE)
+
+# Durée (secondes) de réservation d'une candidature dans la file de revue
+REVIEW_LEASE_SECONDS = int(os.environ.get('REVIEW_LEASE_SECONDS', 900))
+
 USE_I18N = True
 
 USE_TZ = True
@@ -0,0 +1,237 @@
+"""
+Vérification des plans d'exécution des requêtes sur les comptes
+
+Crée une base de test (PostgreSQL ou SQLite selon DATABASE_URL), y insère
+`--rows` comptes (1 000 000 par défaut) puis affiche le plan (EXPLAIN) et la
+durée des requêtes principales:
+- liste admin (première page, page suivante et page profonde, pagination
+  keyset)
+- liste filtrée par rôle
+- lookup d'authentification (get_principal: id + is_active)
+- lookup de connexion (LOWER(email))
+
+Chaque requête doit utiliser l'index attendu, et hormis la première page,
+le parcourir à partir d'une borne (Index Cond sous PostgreSQL, SEARCH sous
+SQLite) plutôt qu'en entier: le script se termine avec un code d'erreur
+sinon. Les résultats sont écrits en JSON.
+
+Usage:
+    python bench_account_indexes.py
+    DATABASE_URL=postgres://... python bench_account_indexes.py --rows 1000000 --output plans.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Plans d'exécution des requêtes sur les comptes")
+    parser.add_argument('--rows', type=int, default=1000000, help="Nombre de comptes insérés")
+    parser.add_argument('--keepdb', action='store_true', help="Conserver la base de test (et ses données)")
+    parser.add_argument('--output', help="Fichier JSON de sortie (stdout par défaut)")
+    return parser.parse_args()
+
+
+def configure_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+    import django
+    django.setup()
+
+
+def seed_accounts(connection, rows):
+    """
+    Insérer les comptes: 2% d'admins, 10% de comptes inactifs, créations
+    réparties sur environ trois ans
+    """
+    from django.contrib.auth.hashers import make_password
+    from accounts.models import Account
+
+    table = Account._meta.db_table
+    encoded = make_password('bench-password')
+    columns = (
+        'password, is_superuser, first_name, last_name, email, phone, role, '
+        'is_active, is_staff, created_at, updated_at'
+    )
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f"""
+                INSERT INTO {table} ({columns})
+                SELECT %s, false, 'Bench', 'User ' || i, 'bench' || i || '@example.com', '',
+                       CASE WHEN i %% 50 = 0 THEN 'admin' ELSE 'candidate' END,
+                       i %% 10 <> 0, false,
+                       now() - make_interval(secs => i * 90), now()
+                FROM generate_series(1, %s) AS i
+            """, [encoded, rows])
+            cursor.execute(f'ANALYZE {table}')
+            return
+
+        now = datetime.now(timezone.utc)
+        placeholders = ', '.join(['%s'] * 11)
+        sql = f'INSERT INTO {table} ({columns}) VALUES ({placeholders})'
+        batch = []
+        for i in range(1, rows + 1):
+            batch.append((
+                encoded, False, 'Bench', f'User {i}', f'bench{i}@example.com', '',
+                'admin' if i % 50 == 0 else 'candidate',
+                i % 10 != 0, False, now - timedelta(seconds=i * 90), now,
+            ))
+            if len(batch) == 10000:
+                cursor.executemany(sql, batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+        cursor.execute('ANALYZE')
+
+
+def get_queries():
+    """
+    (nom, queryset, index attendus, borné): un des index doit apparaître dans
+    le plan; une requête bornée ne doit pas parcourir l'index en entier
+    """
+    from accounts.models import Account
+    from accounts.pagination import AccountCursorPagination
+
+    ordering = AccountCursorPagination.ordering
+    cursor_filter = AccountCursorPagination.cursor_filter
+    page_size = 51
+    active = Account.objects.filter(is_active=True)
+    positions = active.values_list('created_at', 'id')
+    middle = positions.order_by(*ordering)[10000]
+    # Curseur proche de la fin de la liste (lu depuis l'autre extrémité de l'index)
+    deep = positions.order_by('created_at', 'id')[page_size]
+    known = active.order_by('id').values_list('id', 'email').first()
+
+    return [
+        (
+            'list_first_page',
+            active.order_by(*ordering)[:page_size],
+            ['accounts_active_created_idx'],
+            False,
+        ),
+        (
+            'list_next_page',
+            active.filter(cursor_filter(*middle)).order_by(*ordering)[:page_size],
+            ['accounts_active_created_idx'],
+            True,
+        ),
+        (
+            'list_deep_page',
+            active.filter(cursor_filter(*deep)).order_by(*ordering)[:page_size],
+            ['accounts_active_created_idx'],
+            True,
+        ),
+        (
+            'role_listing',
+            active.filter(role='admin').order_by(*ordering)[:page_size],
+            ['accounts_active_role_idx'],
+            True,
+        ),
+        (
+            # get_principal: le lookup par clé primaire reste le plus sélectif,
+            # is_active est vérifié sur la ligne trouvée
+            'auth_lookup',
+            Account.objects.filter(id=known[0], is_active=True)[:1],
+            ['accounts_account_pkey', 'INTEGER PRIMARY KEY'],
+            True,
+        ),
+        (
+            'login_lookup',
+            Account.objects.filter_by_email(known[1]).filter(is_active=True)[:21],
+            ['accounts_account_email_ci_unique'],
+            True,
+        ),
+    ]
+
+
+def is_range_scan(plan, vendor):
+    """
+    L'index est-il parcouru à partir d'une borne ? (PostgreSQL: condition
+    d'index, SQLite: SEARCH; un SCAN ou un simple Filter lit l'index en entier)
+    """
+    if vendor == 'postgresql':
+        return 'Index Cond' in plan
+    return 'SEARCH' in plan and 'SCAN' not in plan
+
+
+def measure(queryset, iterations=20):
+    """Durée médiane d'exécution (ms)"""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        list(queryset._chain())
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return round(timings[len(timings) // 2] * 1000, 3)
+
+
+def run(args):
+    import django
+    from django.db import connection
+
+    old_name = connection.creation.create_test_db(verbosity=0, keepdb=args.keepdb)
+    try:
+        from accounts.models import Account
+
+        if not Account.objects.exists():
+            start = time.perf_counter()
+            seed_accounts(connection, args.rows)
+            seed_seconds = round(time.perf_counter() - start, 1)
+        else:
+            seed_seconds = None
+
+        results = {}
+        for name, queryset, expected, bounded in get_queries():
+            plan = queryset.explain()
+            results[name] = {
+                'expected_index': expected,
+                'uses_index': any(index in plan for index in expected),
+                'range_scan': is_range_scan(plan, connection.vendor) if bounded else None,
+                'median_ms': measure(queryset),
+                'plan': plan.splitlines(),
+            }
+
+        return {
+            'meta': {
+                'date': datetime.now(timezone.utc).isoformat(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'rows': Account.objects.count(),
+                'seed_seconds': seed_seconds,
+            },
+            'results': results,
+        }
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=args.keepdb)
+
+
+def main():
+    args = parse_args()
+    configure_django()
+    report = run(args)
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+        print(f"[OK] Résultats écrits dans {args.output}")
+    else:
+        sys.stdout.write(output + '\n')
+
+    missing = [name for name, result in report['results'].items() if not result['uses_index']]
+    if missing:
+        print(f"[ERREUR] Index non utilisé: {', '.join(missing)}", file=sys.stderr)
+    full_scans = [name for name, result in report['results'].items() if result['range_scan'] is False]
+    if full_scans:
+        print(f"[ERREUR] Index parcouru en entier: {', '.join(full_scans)}", file=sys.stderr)
+    if missing or full_scans:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,241 @@
+"""
+Vérification des plans d'exécution des requêtes sur les candidatures
+
+Crée une base de test (PostgreSQL ou SQLite selon DATABASE_URL), y insère
+`--rows` candidatures (1 000 000 par défaut) puis affiche le plan (EXPLAIN) et
+la durée des combinaisons de filtres courantes de la liste et du dashboard
+(ApplicationFilter + tri par date).
+
+Aucune requête ne doit parcourir toute la table (Seq Scan / SCAN sans index):
+le script se termine avec un code d'erreur sinon. Les résultats sont écrits
+en JSON.
+
+Usage:
+    python bench_application_indexes.py
+    DATABASE_URL=postgres://... python bench_application_indexes.py --rows 1000000 --output plans.json
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Plans d'exécution des requêtes sur les candidatures")
+    parser.add_argument('--rows', type=int, default=1000000, help="Nombre de candidatures insérées")
+    parser.add_argument('--candidates', type=int, default=10000, help="Nombre de comptes candidats")
+    parser.add_argument('--jobs', type=int, default=200, help="Nombre d'offres")
+    parser.add_argument('--keepdb', action='store_true', help="Conserver la base de test (et ses données)")
+    parser.add_argument('--output', help="Fichier JSON de sortie (stdout par défaut)")
+    return parser.parse_args()
+
+
+def configure_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+    import django
+    django.setup()
+
+
+STATUSES = ['pending', 'reviewed', 'accepted', 'rejected']
+CONTRACTS = ['cdi', 'cdd', 'stage', 'alternance', 'interim', 'freelance', 'temps_partiel']
+
+
+def seed(connection, args):
+    """
+    Insérer candidats, offres et candidatures: 30% de candidatures
+    spontanées, statuts et types de contrat répartis uniformément
+    """
+    from datetime import date
+    from accounts.models import Account
+    from applications.models import Application
+    from jobs.models import JobOffer
+
+    admin = Account.objects.create_user(email='bench-admin@example.com', first_name='Bench', last_name='Admin', role='admin')
+    Account.objects.bulk_create([
+        Account(email=f'bench{i}@example.com', first_name='Bench', last_name=f'Candidate {i}', password='!')
+        for i in range(args.candidates)
+    ], batch_size=5000)
+    JobOffer.objects.bulk_create([
+        JobOffer(title=f'Offre {i}', company='Bench', location='Paris', contract_type='cdi',
+                 application_deadline=date(2030, 1, 1), description='Bench', created_by=admin)
+        for i in range(args.jobs)
+    ])
+    candidate_ids = list(Account.objects.filter(role='candidate').values_list('id', flat=True))
+    job_ids = list(JobOffer.objects.values_list('id', flat=True))
+
+    table = Application._meta.db_table
+    columns = (
+        'candidate_id, job_id, is_spontaneous, civility, first_name, last_name, email, phone, country, '
+        'address, contract_type_sought, experience, education_level, expected_salary, status, '
+        'created_at, updated_at'
+    )
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f"""
+                INSERT INTO {table} ({columns})
+                SELECT (%(candidates)s)[1 + i %% cardinality(%(candidates)s)],
+                       CASE WHEN i %% 10 < 3 THEN NULL ELSE (%(jobs)s)[1 + i %% cardinality(%(jobs)s)] END,
+                       i %% 10 < 3, 'madame', 'Prénom ' || i, 'Nom ' || i, 'c' || i || '@example.com',
+                       '0600000000', 'France', 'Adresse', (%(contracts)s)[1 + i %% 7], '[]'::jsonb, 'Bac+5', 30000,
+                       (%(statuses)s)[1 + (i / 7) %% 4],
+                       now() - make_interval(secs => i * 60), now()
+                FROM generate_series(1, %(rows)s) AS i
+            """, {
+                'candidates': candidate_ids, 'jobs': job_ids, 'rows': args.rows,
+                'contracts': CONTRACTS, 'statuses': STATUSES,
+            })
+            cursor.execute(f'ANALYZE {table}')
+            return
+
+        now = datetime.now(timezone.utc)
+        placeholders = ', '.join(['%s'] * 17)
+        sql = f'INSERT INTO {table} ({columns}) VALUES ({placeholders})'
+        batch = []
+        for i in range(1, args.rows + 1):
+            spontaneous = i % 10 < 3
+            batch.append((
+                candidate_ids[i % len(candidate_ids)],
+                None if spontaneous else job_ids[i % len(job_ids)],
+                spontaneous, 'madame', f'Prénom {i}', f'Nom {i}', f'c{i}@example.com',
+                '0600000000', 'France', 'Adresse', CONTRACTS[i % 7], '[]', 'Bac+5', 30000,
+                STATUSES[(i // 7) % 4], now - timedelta(seconds=i * 60), now,
+            ))
+            if len(batch) == 10000:
+                cursor.executemany(sql, batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+        cursor.execute('ANALYZE')
+
+
+def get_queries():
+    """(nom, queryset ou fonction exécutant la requête, index attendu)"""
+    from applications.models import Application
+    from applications.stats import dashboard_stats
+
+    page_size = 20
+    applications = Application.objects.all()
+    job_id = applications.exclude(job=None).values_list('job_id', flat=True).first()
+    candidate_id = applications.values_list('candidate_id', flat=True).first()
+    since = datetime.now(timezone.utc) - timedelta(days=30)
+
+    def dashboard(queryset):
+        # Requête de la vue dashboard_stats avec filtres
+        return lambda: dashboard_stats(queryset, ['status', 'contract_type_sought'])
+
+    return [
+        ('list_by_status', applications.filter(status='reviewed')[:page_size], 'app_status_created_idx'),
+        ('list_by_contract', applications.filter(contract_type_sought='interim')[:page_size], 'app_contract_created_idx'),
+        ('list_by_job', applications.filter(job_id=job_id)[:page_size], 'app_job_status_created_idx'),
+        ('list_by_job_and_status', applications.filter(job_id=job_id, status='pending')[:page_size],
+         'app_job_status_created_idx'),
+        ('candidate_own_list', applications.filter(candidate_id=candidate_id)[:page_size], 'app_candidate_created_idx'),
+        ('dashboard_job', dashboard(applications.filter(job_id=job_id)), 'app_job_status_created_idx'),
+        ('dashboard_job_period', dashboard(applications.filter(job_id=job_id, created_at__gte=since)),
+         'app_job_status_created_idx'),
+        ('status_period', applications.filter(status='accepted', created_at__gte=since)[:page_size],
+         'app_status_created_idx'),
+    ]
+
+
+def full_scan(plan, table):
+    """Le plan contient-il un parcours complet de la table ?"""
+    if f'Seq Scan on {table}' in plan:
+        return True
+    return re.search(rf'\bSCAN {table}\b(?! USING)', plan) is not None
+
+
+def explain(connection, target):
+    """Plan d'exécution d'un QuerySet, ou de la requête exécutée par une fonction"""
+    if not callable(target):
+        return target.explain()
+
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as queries:
+        target()
+    prefix = 'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+    with connection.cursor() as cursor:
+        cursor.execute(prefix + queries[-1]['sql'])
+        return '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+
+
+def measure(target, iterations=10):
+    """Durée médiane d'exécution (ms)"""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        target() if callable(target) else list(target._chain())
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return round(timings[len(timings) // 2] * 1000, 3)
+
+
+def run(args):
+    import django
+    from django.db import connection
+
+    old_name = connection.creation.create_test_db(verbosity=0, keepdb=args.keepdb)
+    try:
+        from applications.models import Application
+
+        table = Application._meta.db_table
+        if not Application.objects.exists():
+            start = time.perf_counter()
+            seed(connection, args)
+            seed_seconds = round(time.perf_counter() - start, 1)
+        else:
+            seed_seconds = None
+
+        results = {}
+        for name, target, expected in get_queries():
+            plan = explain(connection, target)
+            results[name] = {
+                'expected_index': expected,
+                'uses_index': expected in plan,
+                'full_scan': full_scan(plan, table),
+                'median_ms': measure(target),
+                'plan': plan.splitlines(),
+            }
+
+        return {
+            'meta': {
+                'date': datetime.now(timezone.utc).isoformat(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'rows': Application.objects.count(),
+                'seed_seconds': seed_seconds,
+            },
+            'results': results,
+        }
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=args.keepdb)
+
+
+def main():
+    args = parse_args()
+    configure_django()
+    report = run(args)
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+        print(f"[OK] Résultats écrits dans {args.output}")
+    else:
+        sys.stdout.write(output + '\n')
+
+    failed = [name for name, result in report['results'].items() if result['full_scan']]
+    if failed:
+        print(f"[ERREUR] Parcours complet de la table: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
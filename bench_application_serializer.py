@@ -0,0 +1,160 @@
+"""
+Coût de la liste admin des candidatures avec et sans jointure du candidat
+
+Crée une base de test (PostgreSQL ou SQLite selon DATABASE_URL), y insère
+`--rows` candidatures (100 000 par défaut, voir bench_application_indexes)
+puis compare les deux chemins de GET /api/applications/:
+- snapshot: nom du candidat lu dans les champs de la candidature (par défaut)
+- live: compte du candidat joint (?live_candidate=1)
+
+Pour chacun: requête SQL seule (plan et durée) et appel complet de la vue
+(requête, sérialisation et rendu JSON), nombre de requêtes et taille de la
+réponse. Les résultats sont écrits en JSON.
+
+Usage:
+    python bench_application_serializer.py
+    DATABASE_URL=postgres://... python bench_application_serializer.py --rows 100000 --output serializer.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Liste admin des candidatures: avec ou sans jointure du candidat")
+    parser.add_argument('--rows', type=int, default=100000, help="Nombre de candidatures insérées")
+    parser.add_argument('--candidates', type=int, default=10000, help="Nombre de comptes candidats")
+    parser.add_argument('--jobs', type=int, default=200, help="Nombre d'offres")
+    parser.add_argument('--iterations', type=int, default=3, help="Nombre de mesures par chemin")
+    parser.add_argument('--keepdb', action='store_true', help="Conserver la base de test (et ses données)")
+    parser.add_argument('--output', help="Fichier JSON de sortie (stdout par défaut)")
+    return parser.parse_args()
+
+
+def configure_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+    import django
+    django.setup()
+
+
+# Chemins comparés: nom -> paramètres de la requête
+MODES = {
+    'snapshot': {},
+    'live': {'live_candidate': '1'},
+}
+
+
+def median_ms(target, iterations):
+    """Durée médiane d'exécution (ms)"""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        target()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return round(timings[len(timings) // 2] * 1000, 3)
+
+
+def call_view(admin, params):
+    """Appeler la liste admin comme le ferait le routeur; retourne la réponse rendue"""
+    from rest_framework.test import APIRequestFactory, force_authenticate
+    from applications.views import ApplicationViewSet
+
+    request = APIRequestFactory().get('/api/applications/', params)
+    force_authenticate(request, user=admin)
+    response = ApplicationViewSet.as_view({'get': 'list'})(request)
+    return response.render()
+
+
+def view_queryset(admin, params):
+    """QuerySet construit par la vue pour ces paramètres"""
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from applications.views import ApplicationViewSet
+
+    view = ApplicationViewSet(action='list', format_kwarg=None)
+    view.request = Request(APIRequestFactory().get('/api/applications/', params))
+    view.request.user = admin
+    return view.get_queryset()
+
+
+def run(args):
+    import django
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from bench_application_indexes import seed
+
+    old_name = connection.creation.create_test_db(verbosity=0, keepdb=args.keepdb)
+    try:
+        from accounts.models import Account
+        from applications.models import Application
+
+        if not Application.objects.exists():
+            start = time.perf_counter()
+            seed(connection, args)
+            seed_seconds = round(time.perf_counter() - start, 1)
+        else:
+            seed_seconds = None
+        admin = Account.objects.get(email='bench-admin@example.com')
+        accounts_table = Account._meta.db_table
+
+        results = {}
+        for name, params in MODES.items():
+            queryset = view_queryset(admin, params)
+            with CaptureQueriesContext(connection) as queries:
+                response = call_view(admin, params)
+            results[name] = {
+                'params': params,
+                'joins_candidate': accounts_table in str(queryset.query),
+                'query_ms': median_ms(lambda: list(queryset._chain()), args.iterations),
+                'endpoint_ms': median_ms(lambda: call_view(admin, params), args.iterations),
+                'queries': len(queries),
+                'response_bytes': len(response.content),
+                'plan': queryset.explain().splitlines(),
+            }
+
+        snapshot, live = results['snapshot'], results['live']
+        return {
+            'meta': {
+                'date': datetime.now(timezone.utc).isoformat(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'rows': Application.objects.count(),
+                'seed_seconds': seed_seconds,
+                'iterations': args.iterations,
+            },
+            'results': results,
+            'speedup': {
+                'query': round(live['query_ms'] / snapshot['query_ms'], 2) if snapshot['query_ms'] else None,
+                'endpoint': round(live['endpoint_ms'] / snapshot['endpoint_ms'], 2) if snapshot['endpoint_ms'] else None,
+            },
+        }
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=args.keepdb)
+
+
+def main():
+    args = parse_args()
+    configure_django()
+    report = run(args)
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+        print(f"[OK] Résultats écrits dans {args.output}")
+    else:
+        sys.stdout.write(output + '\n')
+
+    if report['results']['snapshot']['joins_candidate']:
+        print("[ERREUR] La liste par défaut joint encore le compte du candidat", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
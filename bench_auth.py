@@ -0,0 +1,194 @@
+"""
+Benchmarks de la pile d'authentification (in-process, SQLite en mémoire)
+
+Mesure le débit (ops/s) et les latences p50/p99 de:
+- generate_jwt_tokens_for_account
+- JWTAuthentication.authenticate (token valide en cache / à froid, expiré,
+  mauvais type, compte inconnu)
+- login_with_email de bout en bout (hachage PBKDF2 réel)
+
+Les résultats sont écrits en JSON pour comparer les versions.
+
+Usage:
+    python bench_auth.py
+    python bench_auth.py --accounts 500 --iterations 5000 --output bench_auth.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmarks de l'authentification")
+    parser.add_argument('--accounts', type=int, default=1000, help="Nombre de comptes créés")
+    parser.add_argument('--iterations', type=int, default=2000, help="Itérations par benchmark")
+    parser.add_argument('--login-iterations', type=int, default=20, help="Itérations pour le login (PBKDF2)")
+    parser.add_argument('--output', help="Fichier JSON de sortie (stdout par défaut)")
+    return parser.parse_args()
+
+
+def configure_django():
+    """SQLite en mémoire, pas de limitation des connexions"""
+    os.environ['DATABASE_URL'] = 'sqlite://:memory:'
+    os.environ['THROTTLE_CACHE_BACKEND'] = 'django.core.cache.backends.dummy.DummyCache'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def measure(func, iterations, setup=None):
+    """Exécuter func `iterations` fois et retourner débit et latences"""
+    timings = []
+    for i in range(iterations):
+        if setup is not None:
+            setup(i)
+        start = time.perf_counter()
+        func(i)
+        timings.append(time.perf_counter() - start)
+
+    timings.sort()
+    total = sum(timings)
+    return {
+        'iterations': iterations,
+        'ops_per_sec': round(iterations / total, 1) if total else None,
+        'p50_ms': round(statistics.median(timings) * 1000, 4),
+        'p99_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1000, 4),
+    }
+
+
+def seed_accounts(count, password):
+    """Créer les comptes avec un seul hachage partagé"""
+    from django.contrib.auth.hashers import make_password
+    from accounts.models import Account
+
+    encoded = make_password(password)
+    Account.objects.bulk_create([
+        Account(
+            email=f'bench{i}@example.com',
+            first_name='Bench',
+            last_name=f'User {i}',
+            role='candidate',
+            password=encoded,
+        )
+        for i in range(count)
+    ], batch_size=1000)
+    return list(Account.objects.order_by('id'))
+
+
+def run(args):
+    import django
+    import jwt
+    from django.conf import settings
+    from django.core.cache import cache
+    from rest_framework.exceptions import AuthenticationFailed
+    from rest_framework.test import APIClient, APIRequestFactory
+    from accounts.authentication import generate_jwt_tokens_for_account
+    from accounts.jwt_auth import JWTAuthentication, token_cache
+
+    password = 'bench-password'
+    accounts = seed_accounts(args.accounts, password)
+    tokens = [generate_jwt_tokens_for_account(account) for account in accounts]
+    factory = APIRequestFactory()
+    authenticator = JWTAuthentication()
+
+    def signed(payload):
+        return jwt.encode(payload, settings.SECRET_KEY, algorithm='HS256')
+
+    now = datetime.now(timezone.utc)
+    expired = signed({
+        'account_id': accounts[0].id, 'role': 'candidate', 'type': 'access',
+        'exp': now - timedelta(minutes=1), 'iat': now - timedelta(hours=1),
+    })
+    unknown = signed({
+        'account_id': 10 ** 9, 'role': 'candidate', 'type': 'access',
+        'exp': now + timedelta(hours=1), 'iat': now,
+    })
+
+    def authenticate(token, expect_failure=False):
+        request = factory.get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        try:
+            authenticator.authenticate(request)
+        except AuthenticationFailed:
+            if not expect_failure:
+                raise
+        else:
+            if expect_failure:
+                raise AssertionError("L'authentification aurait dû échouer")
+
+    def cold(i):
+        token_cache.clear()
+        cache.clear()
+
+    n = args.iterations
+    results = {
+        'generate_jwt_tokens_for_account': measure(
+            lambda i: generate_jwt_tokens_for_account(accounts[i % len(accounts)]), n),
+    }
+
+    # Cache chaud: chaque token est authentifié une fois hors mesure
+    for token in tokens:
+        authenticate(token['access'])
+
+    results.update({
+        'authenticate_valid_cached': measure(
+            lambda i: authenticate(tokens[i % len(tokens)]['access']), n),
+        'authenticate_valid_cold': measure(
+            lambda i: authenticate(tokens[i % len(tokens)]['access']), n, setup=cold),
+        'authenticate_expired': measure(
+            lambda i: authenticate(expired, expect_failure=True), n),
+        'authenticate_wrong_type': measure(
+            lambda i: authenticate(tokens[i % len(tokens)]['refresh'], expect_failure=True), n, setup=cold),
+        'authenticate_unknown_account': measure(
+            lambda i: authenticate(unknown, expect_failure=True), n, setup=cold),
+    })
+
+    client = APIClient()
+
+    def login(i):
+        response = client.post('/api/accounts/login/', {
+            'email': accounts[i % len(accounts)].email,
+            'password': password,
+        }, format='json', REMOTE_ADDR=f'10.0.{i // 256 % 256}.{i % 256}')
+        if response.status_code != 200:
+            raise AssertionError(f"Login échoué: {response.status_code}")
+
+    results['login_with_email'] = measure(login, args.login_iterations)
+
+    return {
+        'meta': {
+            'date': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': 'sqlite (mémoire)',
+            'accounts': args.accounts,
+            'password_hasher': settings.PASSWORD_HASHERS[0],
+        },
+        'results': results,
+    }
+
+
+def main():
+    args = parse_args()
+    configure_django()
+    report = json.dumps(run(args), indent=2)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report + '\n')
+        print(f"[OK] Résultats écrits dans {args.output}")
+    else:
+        sys.stdout.write(report + '\n')
+
+
+if __name__ == '__main__':
+    main()
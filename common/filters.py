@@ -0,0 +1,20 @@
+from django_filters.constants import EMPTY_VALUES
+
+
+def bulk_filter_errors(filterset):
+    """
+    Valider le filtre d'une modification en masse; retourne les erreurs
+    (dictionnaire vide si le filtre est valide)
+
+    django-filter ignore les clés inconnues et les valeurs vides: un filtre
+    mal orthographié viserait toutes les lignes. Chaque clé doit donc être
+    un filtre du FilterSet et au moins un filtre doit avoir une valeur.
+    """
+    unknown = sorted(set(filterset.data) - set(filterset.filters))
+    if unknown:
+        return {key: ["Filtre inconnu."] for key in unknown}
+    if not filterset.is_valid():
+        return filterset.errors
+    if all(value in EMPTY_VALUES for value in filterset.form.cleaned_data.values()):
+        return {"non_field_errors": ["Au moins un filtre est requis."]}
+    return {}
@@ -0,0 +1,274 @@
+"""
+Recherche approximative (trigrammes) sur des champs texte
+
+Utilisée pour retrouver un candidat dont le nom est mal orthographié
+("Ndiaye" / "N'Diaye", "Eloise" / "Éloïse", "Mohamed" / "Mohammed").
+
+Les champs sont regroupés (ex: prénom + nom) et comparés, sans casse ni
+accents, au texte recherché. Les résultats sont annotés par `fuzzy_rank`
+(similarité entre 0 et 1) et triés par similarité décroissante.
+
+Moteurs:
+- PostgreSQL: extension pg_trgm, opérateur `<%` (word_similarity) servi par
+  des index GIN gin_trgm_ops sur les expressions de `group_sql` (voir les
+  migrations).
+- autres bases (SQLite): index de trigrammes en mémoire, construit à la
+  première recherche, mis à jour par les signaux des modèles et reconstruit
+  toutes les FUZZY_INDEX_TTL secondes (écritures des autres processus).
+
+Le seuil de similarité est FUZZY_SIMILARITY_THRESHOLD (pour PostgreSQL,
+appliqué à `pg_trgm.word_similarity_threshold` sur la connexion).
+"""
+
+from collections import Counter, defaultdict
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import BooleanField, Case, FloatField, IntegerField, Value, When
+from django.db.models.expressions import RawSQL
+import re
+import threading
+import time
+
+
+# Caractères accentués remplacés dans l'expression SQL (translate() est
+# IMMUTABLE, contrairement à unaccent(): l'expression peut être indexée).
+# translate() s'applique après lower(); les majuscules sont tout de même
+# listées, lower() ne les convertissant pas sous une collation "C".
+# Les apostrophes, sans équivalent, sont supprimées ("N'Diaye" -> "ndiaye").
+ACCENTS_FROM = (
+    "àáâãäåāăąçćčďèéêëēėęěìíîïīįłñńňòóôõöøōőŕřśšşťţùúûüūůűųýÿźżž"
+    "ÀÁÂÃÄÅĀĂĄÇĆČĎÈÉÊËĒĖĘĚÌÍÎÏĪĮŁÑŃŇÒÓÔÕÖØŌŐŔŘŚŠŞŤŢÙÚÛÜŪŮŰŲÝŸŹŻŽ"
+    "'’"
+)
+ACCENTS_TO = 'aaaaaaaaacccdeeeeeeeeiiiiiilnnnoooooooorrsssttuuuuuuuuyyzzz' * 2
+# Même table en Python: index en mémoire et PostgreSQL comparent les mêmes
+# textes ("ł" et "ø" ne sont pas décomposés par NFKD)
+ACCENTS_TABLE = str.maketrans(
+    ACCENTS_FROM[:len(ACCENTS_TO)], ACCENTS_TO, ACCENTS_FROM[len(ACCENTS_TO):],
+)
+
+
+def normalize(text):
+    """Minuscules, sans accents ni ponctuation (comme l'expression de group_sql)"""
+    text = str(text or '').lower().translate(ACCENTS_TABLE)
+    return ' '.join(re.findall(r'[^\W_]+', text))
+
+
+def trigrams(text):
+    """Trigrammes des mots d'un texte, à la manière de pg_trgm ("  mot ")"""
+    grams = set()
+    for word in text.split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(query_grams, text):
+    """
+    Plus grande similarité (Jaccard) entre les trigrammes de la recherche et
+    ceux d'une suite de mots consécutifs du texte
+    """
+    if not query_grams:
+        return 0.0
+    words = text.split()
+    best = 0.0
+    for start in range(len(words)):
+        grams = set()
+        for end in range(start, len(words)):
+            grams |= trigrams(words[end])
+            score = len(query_grams & grams) / len(query_grams | grams)
+            best = max(best, score)
+            if len(grams) > 2 * len(query_grams):
+                break
+    return best
+
+
+def group_sql(connection, fields, table=None):
+    """
+    Expression SQL normalisée d'un groupe de champs (NOT NULL), identique
+    dans les requêtes et dans les index des migrations 0006 (qui en gardent
+    une copie: toute modification demande une nouvelle migration)
+    """
+    quote = connection.ops.quote_name
+    columns = [f'{quote(table)}.{quote(field)}' if table else quote(field) for field in fields]
+    concatenated = " || ' ' || ".join(columns)
+    accents = ACCENTS_FROM.replace("'", "''")
+    return f"translate(lower({concatenated}), '{accents}', '{ACCENTS_TO}')"
+
+
+class TrigramIndex:
+    """Index inversé trigramme -> ids, pour un modèle et des groupes de champs"""
+
+    def __init__(self, model, groups, using):
+        self.model = model
+        self.groups = groups
+        self.using = using
+        self.lock = threading.Lock()
+        self.built_at = None
+        self.texts = {}
+        self.postings = defaultdict(set)
+
+    def document(self, values):
+        """Textes normalisés des groupes à partir des valeurs {champ: valeur}"""
+        return tuple(normalize(' '.join(str(values[field] or '') for field in group)) for group in self.groups)
+
+    def ensure_built(self):
+        ttl = getattr(settings, 'FUZZY_INDEX_TTL', 300)
+        if self.built_at is not None and time.monotonic() - self.built_at < ttl:
+            return
+        fields = sorted({field for group in self.groups for field in group})
+        texts, postings = {}, defaultdict(set)
+        rows = self.model._default_manager.using(self.using).order_by().values('pk', *fields)
+        for row in rows.iterator(chunk_size=2000):
+            texts[row['pk']] = self.document(row)
+            for gram in trigrams(' '.join(texts[row['pk']])):
+                postings[gram].add(row['pk'])
+        with self.lock:
+            self.texts, self.postings = texts, postings
+            self.built_at = time.monotonic()
+
+    def update(self, pk, values):
+        with self.lock:
+            self._remove(pk)
+            if values is not None:
+                self.texts[pk] = self.document(values)
+                for gram in trigrams(' '.join(self.texts[pk])):
+                    self.postings[gram].add(pk)
+
+    def _remove(self, pk):
+        text = self.texts.pop(pk, None)
+        if text is not None:
+            for gram in trigrams(' '.join(text)):
+                self.postings[gram].discard(pk)
+
+    def search(self, text, threshold):
+        """[(pk, similarité)] triés par similarité décroissante"""
+        self.ensure_built()
+        query_grams = trigrams(normalize(text))
+        if not query_grams:
+            return []
+
+        with self.lock:
+            # Candidats: ids partageant assez de trigrammes avec la recherche
+            shared = Counter()
+            for gram in query_grams:
+                shared.update(self.postings.get(gram, ()))
+            minimum = max(1, int(threshold * len(query_grams)))
+            candidates = [(pk, self.texts[pk]) for pk, count in shared.items() if count >= minimum]
+
+        scored = []
+        for pk, texts in candidates:
+            score = max(similarity(query_grams, group_text) for group_text in texts)
+            if score >= threshold:
+                scored.append((pk, score))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(model, groups, using):
+    key = (using, model._meta.label, groups)
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = TrigramIndex(model, groups, using)
+        return _indexes[key]
+
+
+def record_save(instance):
+    """Mettre à jour les index en mémoire du modèle (à la validation de la transaction)"""
+    _on_commit(instance, deleted=False)
+
+
+def record_delete(instance):
+    """Retirer l'instance des index en mémoire (à la validation de la transaction)"""
+    _on_commit(instance, deleted=True)
+
+
+def _on_commit(instance, deleted):
+    using = instance._state.db or router.db_for_write(type(instance))
+    with _indexes_lock:
+        indexes = [
+            index for (alias, label, _), index in _indexes.items()
+            if alias == using and label == instance._meta.label and index.built_at is not None
+        ]
+    if not indexes:
+        return
+
+    updates = [
+        (index, None if deleted else {
+            field: getattr(instance, field) for group in index.groups for field in group
+        })
+        for index in indexes
+    ]
+    pk = instance.pk
+
+    def update():
+        for index, values in updates:
+            index.update(pk, values)
+
+    transaction.on_commit(update, using=using)
+
+
+def fuzzy_filter(queryset, text, groups, limit=None):
+    """
+    Filtrer queryset sur la similarité de `text` avec l'un des groupes de
+    champs, annoté par `fuzzy_rank` et trié par similarité décroissante
+
+    groups: tuple de tuples de champs, ex: (('first_name', 'last_name'), ('email',))
+    """
+    query = normalize(text)
+    if not query:
+        return queryset.none()
+    limit = limit or getattr(settings, 'FUZZY_MAX_RESULTS', 100)
+    threshold = getattr(settings, 'FUZZY_SIMILARITY_THRESHOLD', 0.4)
+    connection = connections[queryset.db]
+    model = queryset.model
+
+    if connection.vendor == 'postgresql':
+        # Seuil de l'opérateur <% (paramètre de session, sans effet ailleurs)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT set_config('pg_trgm.word_similarity_threshold', %s, false)", [str(threshold)])
+
+        table = model._meta.db_table
+        expressions = [group_sql(connection, group, table) for group in groups]
+        condition = RawSQL(
+            '({})'.format(' OR '.join(f'%s <%% {expression}' for expression in expressions)),
+            [query] * len(expressions), output_field=BooleanField(),
+        )
+        rank = RawSQL(
+            'GREATEST({})'.format(', '.join(f'word_similarity(%s, {expression})' for expression in expressions)),
+            [query] * len(expressions), output_field=FloatField(),
+        )
+        # Les `limit` meilleurs ids en sous-requête: le QuerySet reste filtrable
+        best = queryset.filter(condition).annotate(fuzzy_rank=rank).order_by('-fuzzy_rank', 'pk')
+        return queryset.filter(pk__in=best.values('pk')[:limit]).annotate(
+            fuzzy_rank=rank,
+        ).order_by('-fuzzy_rank', 'pk')
+
+    scored = get_index(model, groups, queryset.db).search(query, threshold)
+
+    # L'index couvre tout le modèle: ne garder que les ids du QuerySet filtré
+    results = []
+    for start in range(0, len(scored), 500):
+        chunk = scored[start:start + 500]
+        allowed = set(queryset.filter(pk__in=[pk for pk, _ in chunk]).values_list('pk', flat=True))
+        results.extend((pk, score) for pk, score in chunk if pk in allowed)
+        if len(results) >= limit:
+            break
+    results = results[:limit]
+    if not results:
+        return queryset.none()
+
+    return queryset.filter(pk__in=[pk for pk, _ in results]).annotate(
+        fuzzy_rank=Case(
+            *[When(pk=pk, then=Value(score)) for pk, score in results],
+            output_field=FloatField(),
+        ),
+        fuzzy_position=Case(
+            *[When(pk=pk, then=Value(position)) for position, (pk, _) in enumerate(results)],
+            output_field=IntegerField(),
+        ),
+    ).order_by('fuzzy_position')
@@ -2,6 +2,7 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from accounts.jwt_auth import ClaimsJWTAuthentication
 from .models import JobOffer
 from .serializers import JobOfferSerializer
 from common.permissions import IsAdminOrReadOnly, IsAdmin
@@ -15,6 +16,8 @@ class JobOfferViewSet(viewsets.ModelViewSet):
     """
 
     serializer_class = JobOfferSerializer
+    # Lecture: compte construit depuis les claims du token, sans requête SQL
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [IsAuthenticatedOrReadOnly, IsAdminOrReadOnly]
 
     def get_queryset(self):